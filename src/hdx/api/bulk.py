@@ -0,0 +1,193 @@
+"""Runner for creating or updating many datasets in HDX"""
+
+import json
+import logging
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from hdx.utilities.uuid import is_valid_uuid
+
+from hdx.data.dataset import Dataset
+from hdx.data.hdxobject import HDXError
+
+logger = logging.getLogger(__name__)
+
+
+class BulkRunner:
+    """Creates or updates many datasets in HDX using a bounded pool of worker
+    threads. All the datasets are given the same batch UUID so that they are
+    grouped as one batch in HDX. The outcome for each dataset is appended to a
+    checkpoint file as it completes. If the checkpoint file exists when run is
+    called, its batch UUID is reused and datasets that it records as done are
+    skipped so that a run that crashed can be resumed. Datasets that failed are
+    tried again.
+
+    Args:
+        checkpoint_path: Path to checkpoint file
+        operation: "create" (create_in_hdx) or "update" (update_in_hdx). Defaults to "create".
+        max_workers: Maximum number of worker threads. Defaults to 4.
+        batch: Batch UUID. Defaults to None (from checkpoint file or new UUID).
+        **kwargs: Arguments to pass to create_in_hdx or update_in_hdx
+    """
+
+    operations = ("create", "update")
+
+    def __init__(
+        self,
+        checkpoint_path: Path | str,
+        operation: str = "create",
+        max_workers: int = 4,
+        batch: str | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if operation not in self.operations:
+            raise HDXError(f"Operation {operation} is not one of {self.operations}!")
+        if batch and not is_valid_uuid(batch):
+            raise HDXError(f"{batch} is not a valid UUID!")
+        self.checkpoint_path = Path(checkpoint_path)
+        self.operation = operation
+        self.max_workers = max_workers
+        self.batch = batch
+        self.kwargs = kwargs
+
+    def read_checkpoint(self) -> tuple[str | None, set[str]]:
+        """Read batch UUID and names of datasets that are done from checkpoint
+        file. A partly written last line (eg. from a crash) is ignored.
+
+        Returns:
+            (Batch UUID or None, set of names of datasets that are done)
+        """
+        batch = None
+        done = set()
+        if not self.checkpoint_path.exists():
+            return batch, done
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "name" not in entry:
+                    batch = entry.get("batch", batch)
+                    continue
+                if entry["outcome"] == "success":
+                    done.add(entry["name"])
+                else:
+                    done.discard(entry["name"])
+        return batch, done
+
+    def _run_one(
+        self, dataset: Dataset | Callable[[], Dataset], batch: str
+    ) -> dict[str, int]:
+        """Create or update one dataset in HDX
+
+        Args:
+            dataset: Dataset or function returning Dataset
+            batch: Batch UUID
+
+        Returns:
+            Dictionary of resource name to status code
+        """
+        if not isinstance(dataset, Dataset):
+            dataset = dataset()
+        kwargs = dict(self.kwargs)
+        kwargs["batch"] = batch
+        if self.operation == "create":
+            return dataset.create_in_hdx(**kwargs)
+        return dataset.update_in_hdx(**kwargs)
+
+    def run(
+        self,
+        datasets: Iterable[Dataset | tuple[str, Callable[[], Dataset]]],
+    ) -> dict[str, Any]:
+        """Create or update datasets in HDX. datasets can contain Dataset objects
+        or (dataset name, function returning Dataset) tuples, the latter allowing
+        datasets to be generated only when needed. datasets is consumed lazily
+        with at most twice max_workers datasets in progress at any time.
+
+        Returns a summary dictionary with keys: batch (batch UUID), succeeded
+        (dictionary of dataset name to resource status codes), failed
+        (dictionary of dataset name to error message) and skipped (list of names
+        of datasets recorded as done in the checkpoint file). A dataset without a
+        name is recorded as failed under "unnamed dataset N" where N is its
+        position in datasets.
+
+        Args:
+            datasets: Datasets or (dataset name, function returning Dataset) tuples
+
+        Returns:
+            Summary dictionary
+        """
+        batch, done = self.read_checkpoint()
+        if self.batch:
+            batch = self.batch
+        elif not batch:
+            batch = str(uuid4())
+        summary = {"batch": batch, "succeeded": {}, "failed": {}, "skipped": []}
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        # Start on a new line if the checkpoint file ends in a partly written line
+        newline = False
+        if self.checkpoint_path.exists():
+            with open(self.checkpoint_path, "rb") as f:
+                if f.seek(0, 2):
+                    f.seek(-1, 2)
+                    newline = f.read(1) != b"\n"
+        with (
+            open(self.checkpoint_path, "a", encoding="utf-8") as checkpoint,
+            ThreadPoolExecutor(max_workers=self.max_workers) as executor,
+        ):
+            if newline:
+                checkpoint.write("\n")
+            checkpoint.write(f"{json.dumps({'batch': batch})}\n")
+            checkpoint.flush()
+            pending: dict[Future, str] = {}
+
+            def write_entry(entry: dict) -> None:
+                checkpoint.write(f"{json.dumps(entry)}\n")
+                checkpoint.flush()
+
+            def record(futures: Iterable[Future]) -> None:
+                for future in futures:
+                    name = pending.pop(future)
+                    entry = {"name": name}
+                    try:
+                        statuses = future.result()
+                        entry["outcome"] = "success"
+                        entry["statuses"] = statuses
+                        summary["succeeded"][name] = statuses
+                        logger.info(f"{self.operation.capitalize()}d {name}")
+                    except Exception as e:
+                        entry["outcome"] = "failure"
+                        entry["error"] = str(e)
+                        summary["failed"][name] = str(e)
+                        logger.exception(f"Failed to {self.operation} {name}!")
+                    write_entry(entry)
+
+            for i, dataset in enumerate(datasets):
+                if isinstance(dataset, Dataset):
+                    name = dataset.get("name")
+                else:
+                    name, dataset = dataset
+                if not name:
+                    name = f"unnamed dataset {i}"
+                    error = "Dataset has no name!"
+                    summary["failed"][name] = error
+                    logger.error(f"Failed to {self.operation} {name}: {error}")
+                    write_entry({"name": name, "outcome": "failure", "error": error})
+                    continue
+                if name in done:
+                    summary["skipped"].append(name)
+                    continue
+                if len(pending) >= 2 * self.max_workers:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    record(finished)
+                pending[executor.submit(self._run_one, dataset, batch)] = name
+            record(list(pending))
+        logger.info(
+            f"Batch {batch}: {len(summary['succeeded'])} succeeded, "
+            f"{len(summary['failed'])} failed, {len(summary['skipped'])} skipped"
+        )
+        return summary
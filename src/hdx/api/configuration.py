@@ -1,23 +1,35 @@
 """Configuration for HDX"""
 
+import json
 import logging
 import os
 from base64 import b64decode
 from collections import UserDict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from os.path import expanduser
 from pathlib import Path
+from threading import Lock
 from typing import Any, Optional
+from urllib.parse import urlsplit
 
 import ckanapi
 import requests
+from ckanapi.common import prepare_action
 from hdx.utilities.dictandlist import merge_two_dictionaries
+from hdx.utilities.downloader import Download
 from hdx.utilities.email import Email
 from hdx.utilities.loader import load_json, load_yaml
 from hdx.utilities.path import script_dir_plus_file
 from hdx.utilities.session import get_session
 from hdx.utilities.useragent import UserAgent, UserAgentError
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
 
 from hdx.api import __version__
+from hdx.api.utilities.object_cache import ObjectCache
+from hdx.api.utilities.response_cache import ResponseCache
+from hdx.api.utilities.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +38,26 @@ class ConfigurationError(Exception):
     pass
 
 
+class HDXSiteAuth(AuthBase):
+    """Authorization for requests that adds the HDX API key only to requests to
+    the HDX site so that it is not sent to other hosts.
+
+    Args:
+        configuration: HDX configuration
+    """
+
+    def __init__(self, configuration: "Configuration") -> None:
+        self.configuration = configuration
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        apikey = self.configuration.get_api_key()
+        if apikey:
+            hdx_netloc = urlsplit(self.configuration.get_hdx_site_url()).netloc
+            if urlsplit(request.url).netloc == hdx_netloc:
+                request.headers["Authorization"] = apikey
+        return request
+
+
 class Configuration(UserDict):
     """Configuration for HDX
 
@@ -57,6 +89,7 @@ class Configuration(UserDict):
     default_hdx_config_yaml = Path(home_folder, ".hdx_configuration.yaml")
 
     prefix = f"HDXPythonLibrary/{__version__}"
+    read_action_suffixes = ("_show", "_list", "_search", "_autocomplete")
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__()
@@ -64,6 +97,12 @@ class Configuration(UserDict):
         self._session = None
         self._remoteckan = None
         self._emailer = None
+        self._download_session = None
+        self._download_session_lock = Lock()
+        self._object_cache = None
+        self._single_flight = SingleFlight()
+        self._response_cache = None
+        self._json_streaming = False
 
         hdx_base_config_found = False
         hdx_base_config_dict = kwargs.get("hdx_base_config_dict")
@@ -325,6 +364,242 @@ class Configuration(UserDict):
             )
         return self._session
 
+    def get_download_session(self) -> requests.Session:
+        """
+        Return the session shared by HTTP requests that are not calls to the CKAN
+        API eg. downloading resources. It is created on first use and can be used
+        from multiple threads. The HDX API key is sent only with requests to the HDX
+        site. The sizes of the connection pools can be set with the configuration
+        parameters download_pool_connections and download_pool_maxsize (both
+        defaulting to 100).
+
+        Returns:
+            The shared download session
+
+        """
+        with self._download_session_lock:
+            if self._download_session is None:
+                session = get_session(full_agent=self.get_user_agent(), use_env=False)
+                retries = session.get_adapter("https://").max_retries
+                httpadapter = HTTPAdapter(
+                    max_retries=retries,
+                    pool_connections=self.data.get("download_pool_connections", 100),
+                    pool_maxsize=self.data.get("download_pool_maxsize", 100),
+                )
+                session.mount("http://", httpadapter)
+                session.mount("https://", httpadapter)
+                session.auth = HDXSiteAuth(self)
+                self._download_session = session
+            return self._download_session
+
+    @contextmanager
+    def get_downloader(self) -> Iterator[Download]:
+        """
+        Context manager returning a Download object that uses the shared download
+        session. Unlike using Download directly, the session is not closed on exit.
+
+        Returns:
+            Download object
+
+        """
+        downloader = Download(session=self.get_download_session())
+        try:
+            yield downloader
+        finally:
+            downloader.close_response()
+
+    def close_download_session(self) -> None:
+        """
+        Close the shared download session if it has been created
+
+        Returns:
+            None
+
+        """
+        with self._download_session_lock:
+            if self._download_session is not None:
+                self._download_session.close()
+                self._download_session = None
+
+    def enable_object_cache(self, maxsize: int = 1024, ttl: float = 300) -> None:
+        """
+        Enable a cache of the results of reading HDX objects (CKAN show actions)
+        so that reading the same object again within ttl seconds does not call
+        HDX. Entries for an object are removed when it is written to HDX. Hit and
+        miss counts are available from the cache returned by get_object_cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep. Defaults to 1024.
+            ttl: Seconds to keep entries. Defaults to 300.
+
+        Returns:
+            None
+
+        """
+        self._object_cache = ObjectCache(maxsize=maxsize, ttl=ttl)
+
+    def disable_object_cache(self) -> None:
+        """
+        Disable the cache of the results of reading HDX objects
+
+        Returns:
+            None
+
+        """
+        self._object_cache = None
+
+    def get_object_cache(self) -> ObjectCache | None:
+        """
+        Return the cache of the results of reading HDX objects if enabled
+
+        Returns:
+            The object cache or None if not enabled
+
+        """
+        return self._object_cache
+
+    def enable_response_cache(
+        self,
+        path: Path | str,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = 3600,
+        max_entries: int = 10000,
+    ) -> ResponseCache:
+        """
+        Enable a persistent cache of responses to read only CKAN actions (eg.
+        package_show, package_search, group_list) stored in an SQLite database at
+        path. The cache is only used when accessing HDX in read only mode
+        (hdx_read_only is True) so that repeated runs can be served locally. See
+        ResponseCache for the meaning of the other arguments.
+
+        Args:
+            path: Path to SQLite database file
+            ttls: Dictionary of action to seconds to keep entries. Defaults to None (ResponseCache.default_ttls).
+            default_ttl: Seconds to keep entries for actions not in ttls. Defaults to 3600.
+            max_entries: Maximum number of entries to keep. Defaults to 10000.
+
+        Returns:
+            The response cache
+
+        """
+        self.disable_response_cache()
+        self._response_cache = ResponseCache(
+            path, ttls=ttls, default_ttl=default_ttl, max_entries=max_entries
+        )
+        return self._response_cache
+
+    def disable_response_cache(self) -> None:
+        """
+        Disable and close the persistent cache of responses to read only CKAN
+        actions if enabled
+
+        Returns:
+            None
+
+        """
+        if self._response_cache is not None:
+            self._response_cache.close()
+            self._response_cache = None
+
+    def enable_json_streaming(self) -> None:
+        """
+        Enable incremental parsing of large responses (eg. from package_search
+        and package_list) so that the items they contain are parsed one by one
+        as they are used rather than the whole response being read into memory
+        and decoded at once. Requires ijson. Streamed responses are not
+        coalesced with concurrent calls or cached.
+
+        Returns:
+            None
+
+        """
+        try:
+            import ijson  # noqa: F401
+        except ImportError as e:
+            raise ConfigurationError(
+                "ijson must be installed to stream JSON responses!"
+            ) from e
+        self._json_streaming = True
+
+    def disable_json_streaming(self) -> None:
+        """
+        Disable incremental parsing of large responses
+
+        Returns:
+            None
+
+        """
+        self._json_streaming = False
+
+    def is_json_streaming(self) -> bool:
+        """
+        Return whether incremental parsing of large responses is enabled
+
+        Returns:
+            True if enabled, False if not
+
+        """
+        return self._json_streaming
+
+    def call_remoteckan_streaming(
+        self, action: str, data_dict: dict, items_path: str
+    ) -> Any:
+        """
+        Calls the remote CKAN parsing the response incrementally. The list at
+        items_path within the result (eg. "results" for package_search or ""
+        for package_list where the result is the list) is replaced by an
+        iterator that parses its items as they are consumed. The connection is
+        released once the iterator is exhausted or closed, so callers that may
+        not consume all the items should call its close method. Requires ijson.
+
+        Args:
+            action: CKAN action eg. package_search
+            data_dict: Parameters for action
+            items_path: Path of list within result eg. "results"
+
+        Returns:
+            Result with the list at items_path replaced by an iterator
+
+        """
+        from hdx.api.utilities.json_stream import ClosingIterator, parse_ckan_response
+
+        remoteckan = self.remoteckan()
+        requests_kwargs = {}
+        credentials = self._get_credentials()
+        if credentials:
+            requests_kwargs["auth"] = credentials
+        url, data, headers = prepare_action(
+            action, data_dict, self.get_api_key(), base_url=remoteckan.base_url
+        )
+        headers["User-Agent"] = remoteckan.user_agent
+        url = f"{remoteckan.address.rstrip('/')}/{url}"
+        response = remoteckan.session.post(
+            url,
+            data=data,
+            headers=headers,
+            files=None,
+            allow_redirects=False,
+            stream=True,
+            **requests_kwargs,
+        )
+        try:
+            response.raw.decode_content = True
+            result = parse_ckan_response(
+                url, response.status_code, response.raw, items_path
+            )
+        except BaseException:
+            response.close()
+            raise
+
+        if not items_path:
+            if isinstance(result, Iterator):
+                return ClosingIterator(result, response)
+        elif isinstance(result, dict) and isinstance(result.get(items_path), Iterator):
+            result[items_path] = ClosingIterator(result[items_path], response)
+            return result
+        response.close()
+        return result
+
     def remoteckan(self) -> ckanapi.RemoteCKAN:
         """
         Return the remote CKAN object (see ckanapi library)
@@ -341,7 +616,10 @@ class Configuration(UserDict):
 
     def call_remoteckan(self, *args: Any, **kwargs: Any) -> dict:
         """
-        Calls the remote CKAN
+        Calls the remote CKAN. Concurrent calls of the same read action (see
+        is_read_action) with the same parameters are coalesced into one request
+        whose result is shared. In read only mode, responses to read actions are
+        served from the response cache if enabled (see enable_response_cache).
 
         Args:
             *args: Arguments to pass to remote CKAN call_action method
@@ -358,7 +636,42 @@ class Configuration(UserDict):
         kwargs["requests_kwargs"] = requests_kwargs
         apikey = kwargs.get("apikey", self.get_api_key())
         kwargs["apikey"] = apikey
-        return self.remoteckan().call_action(*args, **kwargs)
+        remoteckan = self.remoteckan()
+        action = args[0] if args else kwargs.get("action")
+        if kwargs.get("files") or not self.is_read_action(action):
+            return remoteckan.call_action(*args, **kwargs)
+        data_dict = args[1] if len(args) > 1 else kwargs.get("data_dict")
+        response_cache = self._response_cache
+        if response_cache is None or not self.hdx_read_only:
+            key = (action, json.dumps(data_dict, sort_keys=True, default=str), apikey)
+            return self._single_flight.do(
+                key, lambda: remoteckan.call_action(*args, **kwargs)
+            )
+        key = response_cache.get_key(self.get_hdx_site_url(), action, data_dict, apikey)
+        found, result = response_cache.get(key)
+        if found:
+            return result
+        result = self._single_flight.do(
+            key, lambda: remoteckan.call_action(*args, **kwargs)
+        )
+        response_cache.set(key, action, result)
+        return result
+
+    @staticmethod
+    def is_read_action(action: str | None) -> bool:
+        """
+        Whether a CKAN action only reads from HDX eg. package_show, group_list
+
+        Args:
+            action: CKAN action
+
+        Returns:
+            True if action only reads, False if not
+
+        """
+        if not action:
+            return False
+        return action.endswith(Configuration.read_action_suffixes)
 
     @classmethod
     def create_session_user_agent(
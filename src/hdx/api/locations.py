@@ -1,14 +1,21 @@
 """Locations in HDX"""
 
 from collections.abc import Sequence
+from threading import Lock
 
 from hdx.api.configuration import Configuration
+from hdx.api.utilities.location_matcher import LocationMatcher
 
 
 class Locations:
     """Methods to help with countries and continents"""
 
     _validlocations = None
+    _validlocations_lock = Lock()
+    # Matchers by id of the locations list they were built for. Each matcher
+    # holds its list so the id cannot be reused while the entry exists.
+    _matchers: dict[int, LocationMatcher] = {}
+    _max_matchers = 16
 
     @classmethod
     def validlocations(cls, configuration=None) -> list[dict]:
@@ -22,11 +29,13 @@ class Locations:
             A list of valid locations
         """
         if cls._validlocations is None:
-            if configuration is None:
-                configuration = Configuration.read()
-            cls._validlocations = configuration.call_remoteckan(
-                "group_list", {"all_fields": True}
-            )
+            with cls._validlocations_lock:
+                if cls._validlocations is None:
+                    if configuration is None:
+                        configuration = Configuration.read()
+                    cls._validlocations = configuration.call_remoteckan(
+                        "group_list", {"all_fields": True}
+                    )
         return cls._validlocations
 
     @classmethod
@@ -121,10 +130,26 @@ class Locations:
 
         if locations is None:
             locations = cls.validlocations(configuration)
-        locationupper = location.upper()
-        for locdict in locations:
-            locationname = locdict["title"].upper()
-            if locationupper in locationname or locationname in locationupper:
-                return locdict["name"].upper(), False
+        return cls._get_matcher(locations).match(location), False
+
+    @classmethod
+    def _get_matcher(cls, locations: Sequence[dict]) -> LocationMatcher:
+        """Get the matcher for a locations list, building it the first time the
+        list is seen so that alternating between lists does not rebuild them.
 
-        return None, False
+        Args:
+            locations: Valid locations list
+
+        Returns:
+            Matcher for locations
+        """
+        key = id(locations)
+        matcher = cls._matchers.get(key)
+        if matcher is None or not matcher.is_for(locations):
+            matcher = LocationMatcher(locations)
+            cls._matchers.pop(key, None)
+            if len(cls._matchers) >= cls._max_matchers:
+                # Drop the matcher that was built first
+                del cls._matchers[next(iter(cls._matchers))]
+            cls._matchers[key] = matcher
+        return matcher
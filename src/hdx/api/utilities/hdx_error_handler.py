@@ -1,5 +1,6 @@
 import logging
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from os import getenv
 from typing import Any
 
@@ -185,17 +186,46 @@ class HDXErrorHandler(ErrorHandler):
         )
         return True
 
-    def write_errors_to_hdx(self) -> None:
+    def get_errors_by_dataset(self) -> dict[str, dict[str, set[str]]]:
+        """
+        Get errors that have been flagged by setting err_to_hdx True when adding
+        messages grouped by dataset name and then resource name. Errors for the
+        same resource from different pipelines are combined.
+
+        Returns:
+            Dictionary of dataset name to dictionary of resource name to errors
+        """
+        errors_by_dataset = {}
+        for identifier, errors in self.shared_errors["hdx_error"].items():
+            _, dataset_name, resource_name = identifier
+            resource_errors = errors_by_dataset.setdefault(dataset_name, {})
+            resource_errors.setdefault(resource_name, set()).update(errors)
+        return errors_by_dataset
+
+    def write_errors_to_hdx(self, max_workers: int | None = None) -> None:
         """
         Write to HDX resources corresponding errors that have been flagged by
-        setting err_to_hdx True when adding messages
+        setting err_to_hdx True when adding messages. Each dataset is read once
+        and all of its resources are updated in one call. Datasets are
+        processed concurrently.
+
+        Args:
+            max_workers: Maximum number of datasets to process at once. Defaults to None (ThreadPoolExecutor default).
 
         Returns:
             None
         """
         logger.info("Writing errors to HDX")
-        for identifier, errors in self.shared_errors["hdx_error"].items():
-            write_errors_to_resource(identifier, errors)
+        errors_by_dataset = self.get_errors_by_dataset()
+        if not errors_by_dataset:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(
+                write_errors_to_dataset,
+                errors_by_dataset.keys(),
+                errors_by_dataset.values(),
+            ):
+                pass
 
     def output_errors(self) -> None:
         """
@@ -241,3 +271,33 @@ def write_errors_to_resource(
     if success:
         logger.info(f"Wrote error message to {dataset_name}")
     return success
+
+
+def write_errors_to_dataset(
+    dataset_name: str, resource_errors: dict[str, set[str]]
+) -> bool:
+    """
+    Writes error messages to resources of a dataset on HDX, reading the dataset
+    once and updating all resources whose error message has changed in one
+    call. If a resource already has an error message, it is only overwritten if
+    the two messages are different.
+
+    Args:
+        dataset_name: Dataset name
+        resource_errors: Dictionary of resource name to set of errors
+    Returns:
+        True if any message was added, False if not
+    """
+    error_texts = {
+        resource_name: ", ".join(sorted(errors))
+        for resource_name, errors in resource_errors.items()
+    }
+    try:
+        dataset = Dataset.read_from_hdx(dataset_name)
+        success = dataset.add_hapi_errors(error_texts)
+    except (HDXError, AttributeError):
+        logger.error(f"Could not write errors to {dataset_name}")
+        return False
+    if success:
+        logger.info(f"Wrote error messages to {dataset_name}")
+    return success
@@ -40,10 +40,12 @@ class HDXState(State):
         self._dataset_name_or_id = dataset_name_or_id
         self._resource = None
         self._configuration = configuration
+        self._read_text = None
         super().__init__(path, read_fn, write_fn)
 
     def read(self) -> Any:
-        """Read state from HDX dataset
+        """Read state from HDX dataset. The state file is kept in path and is only
+        downloaded again if it has changed on HDX.
 
         Returns:
             State
@@ -52,20 +54,33 @@ class HDXState(State):
             self._dataset_name_or_id, configuration=self._configuration
         )
         self._resource = dataset.get_resource()
-        _, path = self._resource.download()
+        self.path.mkdir(parents=True, exist_ok=True)
+        _, path, transferred = self._resource.download_if_changed(self.path)
+        if not transferred:
+            logger.info(
+                f"State in {self._dataset_name_or_id} unchanged since last read"
+            )
         value = self.read_fn(load_text(path))
+        # Serialise now as the state may be modified in place before writing
+        self._read_text = self.write_fn(value)
         logger.info(f"State read from {self._dataset_name_or_id} = {value}")
         return value
 
     def write(self) -> None:
-        """Write state to HDX dataset
+        """Write state to HDX dataset unless it serialises to the same string as the
+        state that was read
 
         Returns:
             None
         """
+        text = self.write_fn(self.state)
+        if text == self._read_text:
+            logger.info(f"State unchanged in {self._dataset_name_or_id} = {self.state}")
+            return
         logger.info(f"State written to {self._dataset_name_or_id} = {self.state}")
         filename = self._resource["name"]
         file_to_upload = self.path / filename
-        save_text(self.write_fn(self.state), file_to_upload)
+        save_text(text, file_to_upload)
         self._resource.set_file_to_upload(file_to_upload)
         self._resource.update_in_hdx()
+        self._read_text = text
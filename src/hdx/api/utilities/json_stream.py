@@ -0,0 +1,117 @@
+"""Incremental parsing of CKAN action responses. Requires ijson."""
+
+import json
+from collections.abc import Iterator
+from typing import IO, Any
+
+import ijson
+from ckanapi.common import reverse_apicontroller_action
+from ckanapi.errors import CKANAPIError
+
+
+class ClosingIterator(Iterator):
+    """Iterator over items that closes a response once the items are exhausted,
+    parsing fails or close is called, whether or not iteration has started.
+
+    Args:
+        items: Iterator of items
+        response: Response to close eg. requests Response
+    """
+
+    def __init__(self, items: Iterator, response: Any) -> None:
+        self._items = items
+        self._response = response
+
+    def __next__(self) -> Any:
+        try:
+            return next(self._items)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Close the items iterator and the response
+
+        Returns:
+            None
+        """
+        close = getattr(self._items, "close", None)
+        if close is not None:
+            close()
+        self._response.close()
+
+
+def parse_ckan_response(
+    url: str, status: int, fileobj: IO[bytes], items_path: str
+) -> Any:
+    """Parse a CKAN action response incrementally from a file-like object. The
+    list found at items_path within the result (eg. "results" for
+    package_search or "" for package_list where the result is the list) is
+    replaced by an iterator that parses its items one by one as it is consumed,
+    so that the whole response is never held in memory. The parts of the
+    result that come before the list in the response (eg. count) are parsed
+    when this function is called. If the response is a CKAN error, the
+    corresponding ckanapi exception is raised.
+
+    Args:
+        url: URL of CKAN action (for errors)
+        status: HTTP status code of response (for errors)
+        fileobj: File-like object from which to read response
+        items_path: Path of list within result eg. "results"
+
+    Returns:
+        Result with the list at items_path replaced by an iterator
+    """
+    prefix = "result"
+    if items_path:
+        prefix = f"{prefix}.{items_path}"
+    item_prefix = f"{prefix}.item"
+    item_prefix_dot = f"{item_prefix}."
+    events = ijson.parse(fileobj, use_float=True)
+    builder = ijson.ObjectBuilder()
+    found = False
+    try:
+        for path, event, value in events:
+            if path == prefix and event == "start_array":
+                found = True
+                break
+            builder.event(event, value)
+    except ijson.JSONError as e:
+        raise CKANAPIError(repr([url, status, "Invalid JSON response"])) from e
+    if not found:
+        # Not a successful response with a list at items_path
+        response = getattr(builder, "value", None)
+        reverse_apicontroller_action(url, status, json.dumps(response))
+        return response["result"]
+
+    def iter_items() -> Iterator[Any]:
+        item_builder = None
+        for path, event, value in events:
+            if path == prefix and event == "end_array":
+                # Consume the rest of the response
+                for _ in events:
+                    pass
+                return
+            if path == item_prefix:
+                if event in ("start_map", "start_array"):
+                    item_builder = ijson.ObjectBuilder()
+                    item_builder.event(event, value)
+                    continue
+                if event == "map_key":
+                    item_builder.event(event, value)
+                    continue
+                if event in ("end_map", "end_array"):
+                    item_builder.event(event, value)
+                    yield item_builder.value
+                    item_builder = None
+                    continue
+                yield value
+            elif path.startswith(item_prefix_dot):
+                item_builder.event(event, value)
+
+    items = iter_items()
+    if not items_path:
+        return items
+    result = builder.value["result"]
+    result[items_path] = items
+    return result
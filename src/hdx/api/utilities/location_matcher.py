@@ -0,0 +1,72 @@
+"""Precompiled matcher for partial matching of text against HDX location titles."""
+
+from collections.abc import Sequence
+
+
+class LocationMatcher:
+    """Index over HDX location titles that finds the first location (in list
+    order) whose upper cased title contains or is contained in a given string.
+
+    Every substring of every title is mapped to the index of the first location
+    whose title contains it, so testing whether the string is inside a title is a
+    single lookup. Testing whether a title is inside the string only needs to look
+    at substrings of the string with the lengths that titles actually have. The
+    cost of a lookup therefore depends on the length of the string and not on the
+    number of locations.
+
+    Args:
+        locations: Valid locations list
+    """
+
+    def __init__(self, locations: Sequence[dict]) -> None:
+        self.locations = locations
+        self._no_locations = len(locations)
+        self._substrings: dict[str, int] = {}
+        self._titles: dict[str, int] = {}
+        for i, locdict in enumerate(locations):
+            title = locdict["title"].upper()
+            if title in self._titles:
+                continue
+            self._titles[title] = i
+            length = len(title)
+            for start in range(length + 1):
+                for end in range(start, length + 1):
+                    self._substrings.setdefault(title[start:end], i)
+        self._title_lengths = sorted({len(title) for title in self._titles})
+
+    def is_for(self, locations: Sequence[dict]) -> bool:
+        """Whether this matcher was built for the given locations list
+
+        Args:
+            locations: Valid locations list
+
+        Returns:
+            True if matcher was built for locations, False if not
+        """
+        return locations is self.locations and len(locations) == self._no_locations
+
+    def match(self, location: str) -> str | None:
+        """Get HDX code of the first location whose title contains or is contained
+        in the given location
+
+        Args:
+            location: Location for which to get HDX code
+
+        Returns:
+            HDX code or None
+        """
+        locationupper = location.upper()
+        index = self._substrings.get(locationupper)
+        length = len(locationupper)
+        for title_length in self._title_lengths:
+            if title_length > length:
+                break
+            for start in range(length - title_length + 1):
+                title_index = self._titles.get(
+                    locationupper[start : start + title_length]
+                )
+                if title_index is not None and (index is None or title_index < index):
+                    index = title_index
+        if index is None:
+            return None
+        return self.locations[index]["name"].upper()
@@ -0,0 +1,149 @@
+"""Read-through cache of HDX object metadata"""
+
+import copy
+import json
+from collections import OrderedDict
+from collections.abc import Iterable
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+
+def get_identifiers(metadata: Any) -> set[str]:
+    """Get the identifiers (id, name and package_id) in HDX object metadata
+    including those of any embedded package or resources
+
+    Args:
+        metadata: HDX object metadata
+
+    Returns:
+        Set of identifiers
+    """
+    identifiers = set()
+    if not isinstance(metadata, dict):
+        return identifiers
+    for key in ("id", "name", "package_id"):
+        value = metadata.get(key)
+        if isinstance(value, str) and value:
+            identifiers.add(value)
+    package = metadata.get("package")
+    if isinstance(package, dict):
+        identifiers.update(get_identifiers(package))
+    resources = metadata.get("resources")
+    if isinstance(resources, list):
+        for resource in resources:
+            if isinstance(resource, dict):
+                value = resource.get("id")
+                if isinstance(value, str) and value:
+                    identifiers.add(value)
+    return identifiers
+
+
+class ObjectCache:
+    """Thread-safe least recently used cache of the results of CKAN show actions
+    with a time to live. Entries are tagged with the identifiers found in their
+    key and result so that they can be invalidated when an object with one of
+    those identifiers is written. Copies of results are stored and returned so
+    that callers can change them freely.
+
+    Args:
+        maxsize: Maximum number of entries to keep. Defaults to 1024.
+        ttl: Seconds to keep entries. Defaults to 300.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[tuple[str, str], tuple[Any, float, set[str]]] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def get_key(action: str, data: dict) -> tuple[str, str]:
+        """Get cache key from action and parameters
+
+        Args:
+            action: CKAN action eg. package_show
+            data: Parameters for action
+
+        Returns:
+            Cache key
+        """
+        return action, json.dumps(data, sort_keys=True, default=str)
+
+    def get(self, key: tuple[str, str]) -> tuple[bool, Any]:
+        """Get result for key if it is in the cache and has not expired
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (True if found, False if not, copy of result or None)
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                result, expiry, _ = entry
+                if expiry > monotonic():
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return True, copy.deepcopy(result)
+                del self._cache[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: tuple[str, str], result: Any) -> None:
+        """Store result for key
+
+        Args:
+            key: Cache key
+            result: Result to store
+
+        Returns:
+            None
+        """
+        identifiers = get_identifiers(json.loads(key[1]))
+        identifiers.update(get_identifiers(result))
+        entry = (copy.deepcopy(result), monotonic() + self.ttl, identifiers)
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def invalidate(self, identifiers: Iterable[str]) -> None:
+        """Remove entries tagged with any of the given identifiers
+
+        Args:
+            identifiers: Identifiers of objects that have changed
+
+        Returns:
+            None
+        """
+        identifiers = set(identifiers)
+        if not identifiers:
+            return
+        with self._lock:
+            for key in [
+                key
+                for key, (_, _, tags) in self._cache.items()
+                if not tags.isdisjoint(identifiers)
+            ]:
+                del self._cache[key]
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
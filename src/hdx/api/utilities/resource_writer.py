@@ -0,0 +1,408 @@
+"""Helper to the Dataset class for writing rows to resource files."""
+
+import csv
+import gzip
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from importlib import import_module
+from io import TextIOWrapper
+from itertools import chain, islice
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from hdx.utilities.frictionless_wrapper import get_frictionless_tableresource
+
+from hdx.data.hdxobject import HDXError
+
+
+def _get_headers_and_rows(
+    rows: Iterable[Sequence | Mapping],
+    has_header: bool | None,
+    headers: Sequence[str] | None,
+) -> tuple[list[str], Iterator[Sequence]]:
+    """Get headers and an iterator of rows in list form from rows in dict or list
+    form, interpreting has_header and headers as Frictionless does for inline data.
+
+    Args:
+        rows: Rows in dict or list form
+        has_header: Whether the first row is a header row
+        headers: Headers to write
+
+    Returns:
+        (Headers, iterator of rows in list form)
+    """
+    rows = iter(rows)
+    try:
+        row = next(rows)
+    except StopIteration:
+        return list(headers or []), iter(())
+    if isinstance(row, Mapping):
+        keys = list(row.keys())
+        if not headers:
+            headers = keys
+        return list(headers), (
+            [row.get(key) for key in keys] for row in chain((row,), rows)
+        )
+    if headers:
+        return list(headers), chain((row,), rows)
+    return list(row), rows
+
+
+def get_headers_and_rows(
+    rows: Iterable[Sequence | Mapping],
+    headers: int | Sequence[str] | None = None,
+) -> tuple[list[str], Iterator[Sequence]]:
+    """Get headers and an iterator of rows in list form from rows in dict or list
+    form, interpreting headers as in Dataset.generate_resource: for rows in list
+    form, headers can be a list of headers or the number of the row containing
+    the headers (rows start counting at 1). It defaults to None which for rows in
+    list form means the first row and for rows in dict form means the keys of the
+    first row.
+
+    Args:
+        rows: Rows in dict or list form
+        headers: List of headers or row number of headers. Defaults to None.
+
+    Returns:
+        (Headers, iterator of rows in list form)
+    """
+    rows = iter(rows)
+    try:
+        row = next(rows)
+    except StopIteration:
+        if isinstance(headers, int):
+            headers = None
+        return list(headers or []), iter(())
+    if not isinstance(row, Mapping) and (headers is None or isinstance(headers, int)):
+        for _ in range((headers or 1) - 1):
+            row = next(rows)
+        headers = row
+        return list(headers), rows
+    if isinstance(headers, int):
+        headers = None
+    return _get_headers_and_rows(chain((row,), rows), None, headers)
+
+
+def write_csv_gz(
+    filepath: Path | str,
+    headers: Sequence[str],
+    rows: Iterator[Sequence],
+    encoding: str | None = None,
+) -> None:
+    """Write rows to gzip compressed csv. The gzip header timestamp is zeroed so
+    that writing the same rows gives the same file hash.
+
+    Args:
+        filepath: Path to write to
+        headers: Headers to write
+        rows: Iterator of rows in list form
+        encoding: Encoding to use. Defaults to None (utf-8).
+
+    Returns:
+        None
+    """
+    with open(filepath, "wb") as fileobj:
+        with gzip.GzipFile(fileobj=fileobj, mode="wb", mtime=0) as gzfile:
+            with TextIOWrapper(
+                gzfile, encoding=encoding or "utf-8", newline=""
+            ) as textfile:
+                writer = csv.writer(textfile)
+                writer.writerow(headers)
+                writer.writerows(rows)
+
+
+def _import_pyarrow(submodule: str) -> tuple[ModuleType, ModuleType]:
+    """Import pyarrow and one of its submodules, raising an HDXError if pyarrow
+    is not installed
+
+    Args:
+        submodule: pyarrow submodule eg. parquet
+
+    Returns:
+        (pyarrow module, pyarrow submodule)
+    """
+    try:
+        pyarrow = import_module("pyarrow")
+        return pyarrow, import_module(f"pyarrow.{submodule}")
+    except ImportError as e:
+        raise HDXError(
+            "pyarrow must be installed to write parquet or arrow files!"
+        ) from e
+
+
+def _get_record_batches(
+    pyarrow: ModuleType, schema: Any, rows: Iterator[Sequence]
+) -> Iterator:
+    """Get Arrow record batches from rows, converting all values other than None
+    to strings to match a schema in which every column is a string
+
+    Args:
+        pyarrow: pyarrow module
+        schema: Arrow schema
+        rows: Iterator of rows in list form
+
+    Returns:
+        Iterator of record batches
+    """
+    no_columns = len(schema)
+    while batch := list(islice(rows, ResourceWriter.batch_size)):
+        columns = [[] for _ in range(no_columns)]
+        for row in batch:
+            for i, column in enumerate(columns):
+                value = row[i] if i < len(row) else None
+                column.append(None if value is None else str(value))
+        yield pyarrow.record_batch(columns, schema=schema)
+
+
+def write_parquet(
+    filepath: Path | str,
+    headers: Sequence[str],
+    rows: Iterator[Sequence],
+    encoding: str | None = None,
+) -> None:
+    """Write rows to Parquet in record batches. All columns are written as
+    strings and None as null, so any types must be cast when the file is read.
+
+    Args:
+        filepath: Path to write to
+        headers: Headers to write
+        rows: Iterator of rows in list form
+        encoding: Ignored. Defaults to None.
+
+    Returns:
+        None
+    """
+    pyarrow, parquet = _import_pyarrow("parquet")
+    schema = pyarrow.schema([(header, pyarrow.string()) for header in headers])
+    with parquet.ParquetWriter(str(filepath), schema) as writer:
+        for batch in _get_record_batches(pyarrow, schema, rows):
+            writer.write_batch(batch)
+
+
+def write_arrow(
+    filepath: Path | str,
+    headers: Sequence[str],
+    rows: Iterator[Sequence],
+    encoding: str | None = None,
+) -> None:
+    """Write rows to Arrow IPC file in record batches. All columns are written as
+    strings and None as null, so any types must be cast when the file is read.
+
+    Args:
+        filepath: Path to write to
+        headers: Headers to write
+        rows: Iterator of rows in list form
+        encoding: Ignored. Defaults to None.
+
+    Returns:
+        None
+    """
+    pyarrow, ipc = _import_pyarrow("ipc")
+    schema = pyarrow.schema([(header, pyarrow.string()) for header in headers])
+    with ipc.new_file(str(filepath), schema) as writer:
+        for batch in _get_record_batches(pyarrow, schema, rows):
+            writer.write_batch(batch)
+
+
+class ResourceWriter:
+    """Writes rows to resource files without keeping them in memory. Writers can
+    be registered for formats and any format without one is written using
+    Frictionless. Writers are registered for csv.gz, which writes gzip
+    compressed csv, and for parquet and arrow, which write Parquet and Arrow IPC
+    files in record batches of batch_size rows. The parquet and arrow writers
+    write every column as strings (with None written as null) because rows are
+    streamed and a type inferred from the first batch could be contradicted by
+    a later one.
+    """
+
+    batch_size = 65536
+    _writers: dict[str, tuple[Callable, str]] = {}
+
+    @classmethod
+    def register_writer(
+        cls,
+        format: str,
+        writer: Callable[
+            [Path | str, Sequence[str], Iterator[Sequence], str | None], None
+        ],
+        hdx_format: str | None = None,
+    ) -> None:
+        """Register a writer for a format. The writer is called with the path to
+        write to, the headers, an iterator of rows in list form and the encoding. It
+        should consume the rows lazily. Formats that do not have a registered writer
+        are written using Frictionless.
+
+        Args:
+            format: Format eg. parquet
+            writer: Function to write rows
+            hdx_format: Format to set on HDX resource. Defaults to None (format).
+
+        Returns:
+            None
+        """
+        if hdx_format is None:
+            hdx_format = format
+        cls._writers[format.lower()] = (writer, hdx_format)
+
+    @classmethod
+    def has_writer(cls, format: str) -> bool:
+        """Whether a writer is registered for format
+
+        Args:
+            format: Format
+
+        Returns:
+            True if writer registered, False if not
+        """
+        return format.lower() in cls._writers
+
+    @classmethod
+    def get_hdx_format(cls, format: str) -> str:
+        """Get format to set on HDX resource for format
+
+        Args:
+            format: Format
+
+        Returns:
+            Format to set on HDX resource
+        """
+        writer = cls._writers.get(format.lower())
+        if writer is None:
+            return format
+        return writer[1]
+
+    @classmethod
+    def write_rows(
+        cls,
+        filepath: Path | str,
+        rows: Iterable[Sequence | Mapping],
+        has_header: bool | None,
+        headers: Sequence[str] | None,
+        format: str = "csv",
+        encoding: str | None = None,
+    ) -> None:
+        """Write rows to file using the writer registered for format or Frictionless
+        if there isn't one. The rows can be a lazy iterable which is consumed once
+        while writing.
+
+        Args:
+            filepath: Path to write to
+            rows: Rows in dict or list form
+            has_header: Whether the first row is a header row
+            headers: Headers to write
+            format: Format to write. Defaults to csv.
+            encoding: Encoding to use. Defaults to None (infer encoding).
+
+        Returns:
+            None
+        """
+        writer = cls._writers.get(format.lower())
+        if writer is not None:
+            headers, rows = _get_headers_and_rows(rows, has_header, headers)
+            writer[0](filepath, headers, rows, encoding)
+            return
+        resource = get_frictionless_tableresource(
+            data=lambda: iter(rows),
+            has_header=has_header,
+            headers=headers,
+            encoding=encoding,
+        )
+        resource.write(filepath, format=format, encoding=encoding)
+        resource.close()
+
+    @classmethod
+    def stream_iterable(
+        cls,
+        filepath: Path | str,
+        rows: Iterable[Sequence | Mapping],
+        headers: int | Sequence[str] | None = None,
+        columns: Sequence[int] | Sequence[str] | None = None,
+        format: str = "csv",
+        encoding: str | None = None,
+        row_function: Callable[[dict], dict | None] | None = None,
+        no_empty: bool = True,
+        rows_written: list | None = None,
+    ) -> tuple[int | None, Sequence[str] | None]:
+        """Save an iterable of rows in dict or list form to a file without keeping
+        the rows in memory. The arguments are interpreted as in
+        hdx.utilities.saver.save_iterable which this mirrors except that rather than
+        returning the list of rows written, it returns the number of data rows
+        written (or None if no file was written) and the headers.
+
+        Args:
+            filepath: Path to write to
+            rows: Rows in dict or list form
+            headers: Headers to write. Defaults to None.
+            columns: Columns to write. Defaults to all.
+            format: Format to write. Defaults to csv.
+            encoding: Encoding to use. Defaults to None (infer encoding).
+            row_function: Row function to call for each row. Defaults to None.
+            no_empty: Don't save file if there are no data rows. Defaults to True.
+            rows_written: List to which to append rows written. Defaults to None.
+
+        Returns:
+            (Number of data rows written or None, headers)
+        """
+        if row_function is None:
+
+            def row_function(row):
+                return row
+
+        rows = iter(rows)
+        try:
+            row = next(rows)
+        except StopIteration:
+            if not no_empty and headers:
+                cls.write_rows(filepath, [headers], None, None, format, encoding)
+                return 0, headers
+            return None, headers
+
+        count = [0]
+
+        def process_rows(first_row: Sequence | Mapping | None) -> Iterator:
+            if first_row is not None:
+                rows_to_process = chain((first_row,), rows)
+            else:
+                rows_to_process = rows
+            for row in rows_to_process:
+                row = row_function(row)
+                if row is None:
+                    continue
+                if columns:
+                    if isinstance(row, dict):
+                        row = {
+                            column: row[column] for column in columns if column in row
+                        }
+                    else:
+                        row = [row[column - 1] for column in columns]
+                count[0] += 1
+                if rows_written is not None:
+                    rows_written.append(row)
+                yield row
+
+        if isinstance(row, dict):
+            has_header = True
+            if columns and headers is None:
+                headers = columns
+            first_row = row
+        else:
+            if headers is None:
+                headers = 1
+            if isinstance(headers, int):
+                headers_rowno = headers
+                headers = row
+                for i in range(headers_rowno - 1):
+                    headers = next(rows)
+                first_row = None
+            else:
+                first_row = row
+            has_header = False
+        cls.write_rows(
+            filepath, process_rows(first_row), has_header, headers, format, encoding
+        )
+        return count[0], headers
+
+
+ResourceWriter.register_writer("csv.gz", write_csv_gz, "csv")
+ResourceWriter.register_writer("parquet", write_parquet)
+ResourceWriter.register_writer("arrow", write_arrow)
@@ -0,0 +1,183 @@
+"""Persistent cache of responses to read only CKAN actions"""
+
+import json
+import sqlite3
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any
+
+
+class ResponseCache:
+    """Cache of responses to read only CKAN actions stored in an SQLite database
+    so that it persists between runs. Entries are keyed on the HDX site, a hash
+    of the api key used (so that responses fetched with one key are never served
+    for another key or anonymous access), action and canonicalised parameters. How long entries are kept depends on the
+    action: ttls maps actions to seconds, with actions not in ttls kept for
+    default_ttl seconds. A ttl of 0 means the action is not cached. When there
+    are more than max_entries entries, the least recently used are removed.
+    It can be used from multiple threads.
+
+    Args:
+        path: Path to SQLite database file
+        ttls: Dictionary of action to seconds to keep entries. Defaults to None (default_ttls).
+        default_ttl: Seconds to keep entries for actions not in ttls. Defaults to 3600.
+        max_entries: Maximum number of entries to keep. Defaults to 10000.
+    """
+
+    default_ttls = {
+        "group_list": 86400,
+        "group_show": 86400,
+        "vocabulary_list": 86400,
+        "vocabulary_show": 86400,
+        "package_search": 600,
+        "resource_search": 600,
+        "datastore_search": 600,
+    }
+
+    def __init__(
+        self,
+        path: Path | str,
+        ttls: dict[str, float] | None = None,
+        default_ttl: float = 3600,
+        max_entries: int = 10000,
+    ) -> None:
+        if ttls is None:
+            ttls = self.default_ttls
+        self.path = path
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+                "action TEXT, expiry REAL, accessed REAL, response TEXT)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+    def get_ttl(self, action: str) -> float:
+        """Get seconds to keep entries for action
+
+        Args:
+            action: CKAN action eg. package_show
+
+        Returns:
+            Seconds to keep entries
+        """
+        return self.ttls.get(action, self.default_ttl)
+
+    @staticmethod
+    def get_key(
+        site_url: str, action: str, data: dict | None, apikey: str | None = None
+    ) -> str:
+        """Get cache key from HDX site, api key, action and parameters. The api
+        key is stored only as a hash.
+
+        Args:
+            site_url: HDX site url
+            action: CKAN action eg. package_show
+            data: Parameters for action
+            apikey: HDX api key used for request. Defaults to None (anonymous).
+
+        Returns:
+            Cache key
+        """
+        if apikey:
+            identity = sha256(apikey.encode("utf-8")).hexdigest()
+        else:
+            identity = "anonymous"
+        params = json.dumps(data or {}, sort_keys=True, separators=(",", ":"))
+        return f"{site_url} {identity} {action} {params}"
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Get response for key if it is in the cache and has not expired
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (True if found, False if not, response or None)
+        """
+        now = time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT expiry, response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            expiry, response = row
+            if expiry <= now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return False, None
+            self._connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return True, json.loads(response)
+
+    def set(self, key: str, action: str, response: Any) -> None:
+        """Store response for key unless the ttl for action is 0
+
+        Args:
+            key: Cache key
+            action: CKAN action eg. package_show
+            response: Response to store
+
+        Returns:
+            None
+        """
+        ttl = self.get_ttl(action)
+        if ttl <= 0:
+            return
+        now = time()
+        response = json.dumps(response, separators=(",", ":"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, action, now + ttl, now, response),
+            )
+            self._connection.execute("DELETE FROM responses WHERE expiry <= ?", (now,))
+            excess = (
+                self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                - self.max_entries
+            )
+            if excess > 0:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses "
+                    "ORDER BY accessed LIMIT ?)",
+                    (excess,),
+                )
+
+    def clear(self) -> None:
+        """Remove all entries
+
+        Returns:
+            None
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the database
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.close()
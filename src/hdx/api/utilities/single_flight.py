@@ -0,0 +1,69 @@
+"""Coalescing of concurrent identical calls"""
+
+import copy
+from collections.abc import Callable, Hashable
+from threading import Event, Lock
+from typing import Any
+
+
+class _Call:
+    """A call in flight whose outcome is shared with callers that wait for it"""
+
+    def __init__(self) -> None:
+        self.event = Event()
+        self.waiters = 0
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """Ensures that concurrent calls with the same key make only one call. The
+    first caller makes the call and callers that arrive while it is in flight
+    wait for it and get a copy of its result or have its exception raised.
+    Nothing is kept once the call completes so later calls are made afresh.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Call function unless a call with the same key is in flight in which
+        case wait for that call and use its outcome
+
+        Args:
+            key: Key identifying the call
+            function: Function to call
+
+        Returns:
+            Result of function or copy of result of call in flight
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+        if not leader:
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return copy.deepcopy(call.result)
+        result = None
+        try:
+            result = function()
+            return result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            if waiters and call.exception is None:
+                # Copy before the caller gets the result so that it can change it
+                call.result = copy.deepcopy(result)
+            call.event.set()
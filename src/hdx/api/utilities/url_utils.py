@@ -1,5 +1,14 @@
 import re
+from collections import OrderedDict
+from os import replace
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any
+from uuid import uuid4
 
+from hdx.utilities.loader import load_json
+from hdx.utilities.saver import save_json
 from hdx.utilities.session import get_session
 from requests import RequestException, Session
 
@@ -41,11 +50,13 @@ def get_ckan_ready_session(configuration: Configuration) -> Session:
     return session
 
 
-def follow_url(
+def _follow_url(
     url: str, configuration: Configuration | None = None, session: Session | None = None
-) -> str:
-    """Follow a URL to get the direct-download URL after any redirects. Either a
-    Configuration object or Session object must be provided
+) -> tuple[str, bool | None]:
+    """Follow a URL to get the direct-download URL after any redirects, also
+    returning whether the result depends only on the URL (in which case it never
+    changes) or on network requests. Either a Configuration object or Session object
+    must be provided
 
     Args:
         url: URL to follow
@@ -53,30 +64,27 @@ def follow_url(
         session: Session object to use. Defaults to None.
 
     Returns:
-        The direct-download URL
+        (Direct-download URL, True if URL only, False if network, None if failed)
 
     """
+    if session is None:
+        if configuration is None:
+            raise ValueError("Either Session or Configuration object must be provided!")
+        session = configuration.get_download_session()
     try:
-        if session is None:
-            if configuration is None:
-                raise ValueError(
-                    "Either Session or Configuration object must be provided!"
-                )
-            session = get_ckan_ready_session(configuration)
-
         # Is it a CKAN resource? (Assumes the v.3 API for now)
         result = CKAN_URL.match(url)
         if result:
             result = _get_ckan_urls(result.group(2), result.group(3))
             if result:
-                return result
+                return result, False
 
         # Is it a Google Drive "open" URL?
         result = GOOGLE_DRIVE_URL.match(url)
         if result:
             response = session.head(url)
             if response.is_redirect:
-                return response.headers["Location"]
+                return response.headers["Location"], False
 
         #
         # Stage 2: rewrite URLs to get direct-download links
@@ -86,24 +94,153 @@ def follow_url(
         result = GOOGLE_SHEETS_URL.match(url)
         if result and not re.search(r"/pub", url):
             if result.group(2):
-                return f"https://docs.google.com/spreadsheets/d/{result.group(1)}/export?format=csv&gid={result.group(2)}"
-            return f"https://docs.google.com/spreadsheets/d/{result.group(1)}/export?format=csv"
+                return (
+                    f"https://docs.google.com/spreadsheets/d/{result.group(1)}/export?format=csv&gid={result.group(2)}",
+                    True,
+                )
+            return (
+                f"https://docs.google.com/spreadsheets/d/{result.group(1)}/export?format=csv",
+                True,
+            )
 
         # Is it a Google Drive *file*?
         result = GOOGLE_FILE_URL.match(url)
         if not result:
             result = GOOGLE_SHEETS_XLSX_URL.match(url)
         if result and not re.search(r"/pub", url):
-            return f"https://drive.google.com/uc?export=download&id={result.group(1)}"
+            return (
+                f"https://drive.google.com/uc?export=download&id={result.group(1)}",
+                True,
+            )
 
         # Is it a Dropbox URL?
         result = DROPBOX_URL.match(url)
         if result:
-            return f"https://www.dropbox.com/s/{result.group(1)}/{result.group(2)}?dl=1"
+            return (
+                f"https://www.dropbox.com/s/{result.group(1)}/{result.group(2)}?dl=1",
+                True,
+            )
     except RequestException:
-        pass
+        return url, None
     # No changes
-    return url
+    if CKAN_URL.match(url) or GOOGLE_DRIVE_URL.match(url):
+        return url, False
+    return url, True
+
+
+def follow_url(
+    url: str, configuration: Configuration | None = None, session: Session | None = None
+) -> str:
+    """Follow a URL to get the direct-download URL after any redirects. Either a
+    Configuration object or Session object must be provided
+
+    Args:
+        url: URL to follow
+        configuration: Configuration object. Defaults to None.
+        session: Session object to use. Defaults to None.
+
+    Returns:
+        The direct-download URL
+
+    """
+    return _follow_url(url, configuration, session)[0]
+
+
+class URLResolver:
+    """Memoised version of follow_url. Results are kept in a least recently used
+    cache of up to maxsize urls. Results that come only from rewriting the url eg.
+    Google Sheets and Dropbox urls are kept indefinitely while those that need
+    network requests eg. CKAN dataset and resource pages expire after ttl seconds.
+    Failed lookups are not cached. If cache_path is given, the cache is loaded from
+    that JSON file and is written back to it by save (which is called on exit if
+    URLResolver is used as a context manager). It can be used from multiple threads.
+
+    Args:
+        configuration: Configuration object. Defaults to global configuration.
+        session: Session object to use. Defaults to None (shared download session).
+        maxsize: Maximum number of urls to keep. Defaults to 4096.
+        ttl: Seconds to keep results that needed network requests. Defaults to 86400.
+        cache_path: Path to JSON file for persistent cache. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        configuration: Configuration | None = None,
+        session: Session | None = None,
+        maxsize: int = 4096,
+        ttl: float = 86400,
+        cache_path: Path | str | None = None,
+    ) -> None:
+        if configuration is None and session is None:
+            configuration = Configuration.read()
+        self.configuration = configuration
+        self.session = session
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self._cache: OrderedDict[str, tuple[str, float | None]] = OrderedDict()
+        self._lock = Lock()
+        if cache_path and Path(cache_path).exists():
+            now = time()
+            for url, (final_url, expiry) in load_json(cache_path).items():
+                if expiry is None or expiry > now:
+                    self._cache[url] = (final_url, expiry)
+            while len(self._cache) > maxsize:
+                self._cache.popitem(last=False)
+
+    def __enter__(self) -> "URLResolver":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
+        self.save()
+
+    def resolve(self, url: str) -> str:
+        """Get the direct-download URL for a URL from the cache or if it is not
+        there or has expired by following it
+
+        Args:
+            url: URL to follow
+
+        Returns:
+            The direct-download URL
+        """
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is not None:
+                final_url, expiry = entry
+                if expiry is None or expiry > time():
+                    self._cache.move_to_end(url)
+                    return final_url
+                del self._cache[url]
+        final_url, permanent = _follow_url(url, self.configuration, self.session)
+        if permanent is None:
+            return final_url
+        expiry = None if permanent else time() + self.ttl
+        with self._lock:
+            self._cache[url] = (final_url, expiry)
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return final_url
+
+    def save(self) -> None:
+        """Save cache to cache_path if given
+
+        Returns:
+            None
+        """
+        if not self.cache_path:
+            return
+        now = time()
+        with self._lock:
+            cache = {
+                url: [final_url, expiry]
+                for url, (final_url, expiry) in self._cache.items()
+                if expiry is None or expiry > now
+            }
+        temp_path = Path(f"{self.cache_path}.{uuid4().hex}")
+        save_json(cache, temp_path)
+        replace(temp_path, self.cache_path)
 
 
 def _get_ckan_urls(dataset_id: str, resource_id: str) -> str | None:
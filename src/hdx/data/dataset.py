@@ -5,8 +5,10 @@ import logging
 import sys
 import warnings
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -42,10 +44,12 @@ from hdx.api.configuration import Configuration
 from hdx.api.locations import Locations
 from hdx.api.utilities.date_helper import DateHelper
 from hdx.api.utilities.filestore_helper import FilestoreHelper
+from hdx.api.utilities.resource_writer import ResourceWriter
 from hdx.data.hdxobject import HDXError, HDXObject
 from hdx.data.resource_matcher import ResourceMatcher
 
 if TYPE_CHECKING:
+    from hdx.api.utilities.url_utils import URLResolver
     from hdx.data.organization import Organization
     from hdx.data.resource import Resource
     from hdx.data.showcase import Showcase
@@ -68,6 +72,7 @@ class Dataset(HDXObject):
 
     max_attempts = 5
     max_int = sys.maxsize
+    date_parse_cache_size = 4096
     update_frequencies = {
         "-2": "As needed",
         "-1": "Never",
@@ -130,6 +135,7 @@ class Dataset(HDXObject):
         self.init_resources()
         super().__init__(initial_data, configuration=configuration)
         self._preview_resourceview = None
+        self._hdx_snapshot = None
 
     @staticmethod
     def actions() -> dict[str, str]:
@@ -200,27 +206,40 @@ class Dataset(HDXObject):
         path: Path | str,
         follow_urls: bool = False,
         session: Session | None = None,
+        max_workers: int | None = None,
+        resolver: Optional["URLResolver"] = None,
     ) -> None:
         """Save dataset to JSON. If follow_urls is True, resource urls that point to
-        datasets, HXL proxy urls etc. are followed to retrieve final urls.
+        datasets, HXL proxy urls etc. are followed to retrieve final urls. Each
+        distinct url is followed once and the urls are followed concurrently using
+        resolver. A URLResolver can be supplied so that its cache is shared between
+        calls (and with cache_path, between runs). Otherwise, one is created for the
+        call using session.
 
         Args:
             path: Path to save dataset
             follow_urls: Whether to follow urls. Defaults to False.
-            session:
+            session: Session to use to follow urls if no resolver. Defaults to None (shared download session).
+            max_workers: Maximum number of threads. Defaults to None (executor default).
+            resolver: URLResolver to use to follow urls. Defaults to None (new URLResolver).
 
         Returns:
             None
         """
         dataset_dict = self.get_dataset_dict()
         if follow_urls:
-            session = hdx.api.utilities.url_utils.get_ckan_ready_session(
-                self.configuration
-            )
-            for resource in dataset_dict.get("resources", tuple()):
-                resource["url"] = hdx.api.utilities.url_utils.follow_url(
-                    resource["url"], session=session
+            if resolver is None:
+                if session is None:
+                    session = self.configuration.get_download_session()
+                resolver = hdx.api.utilities.url_utils.URLResolver(
+                    configuration=self.configuration, session=session
                 )
+            resources = dataset_dict.get("resources", tuple())
+            urls = list(dict.fromkeys(resource["url"] for resource in resources))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                followed_urls = dict(zip(urls, executor.map(resolver.resolve, urls)))
+            for resource in resources:
+                resource["url"] = followed_urls[resource["url"]]
         save_json(dataset_dict, path)
 
     @staticmethod
@@ -350,6 +369,106 @@ class Dataset(HDXObject):
             resource = resource_objects[resource_index]
             self._resources.append(resource)
 
+    def upsert_resources(
+        self,
+        resources: Sequence[Union["Resource", dict]],
+        **kwargs: Any,
+    ) -> dict:
+        """Create new and update existing resources of a dataset in HDX in one
+        package_revise call including uploading any files to the filestore. The
+        dataset must have been read from HDX (eg. by read_from_hdx or
+        search_in_hdx) as resources are matched locally against its resources
+        using ids if they are available, otherwise names only if names are
+        unique or format in addition if not. Other metadata of the dataset is
+        not changed.
+
+        Returns a dictionary with key resource name and value status code:
+        0 = no file to upload and last_modified set to now
+        (resource creation or data_updated flag is True),
+        1 = no file to upload and data_updated flag is False,
+        2 = file uploaded to filestore (resource creation or either hash or size of file
+        has changed),
+        3 = file not uploaded to filestore (hash and size of file are the same),
+        4 = file not uploaded (hash, size unchanged), given last_modified ignored
+
+        Args:
+            resources: A list of resources metadata from either Resource objects or dictionaries
+            **kwargs: See below
+            updated_by_script (str): String to identify your script. Defaults to your user agent.
+            batch (str): A string you can specify to show which datasets are part of a single batch update
+            force_update (bool): Forces files to be updated even if they haven't changed
+
+        Returns:
+            Dictionary of resource name to status code
+        """
+        dataset_id = self.data.get("id")
+        if not dataset_id:
+            raise HDXError("Dataset must be read from HDX to upsert resources!")
+        resource_objects = []
+        for resource in resources:
+            resource = self._get_resource_from_obj(resource)
+            package_id = resource.get("package_id")
+            if package_id and package_id != dataset_id:
+                raise HDXError(
+                    f"Resource {resource['name']} being upserted has a different dataset id!"
+                )
+            resource.check_both_url_filetoupload()
+            resource_objects.append(resource)
+        (
+            resource_matches,
+            updated_resource_matches,
+            _,
+            updated_resource_no_matches,
+        ) = ResourceMatcher.match_resource_lists(self._resources, resource_objects)
+        # Empty resources in the update leave the corresponding resources in HDX
+        # unchanged
+        resources_to_update = [res_module.Resource({}) for _ in self._resources]
+        filestore_resources = {}
+        statuses = {}
+        for i, resource_index in enumerate(resource_matches):
+            resource = self._resources[resource_index]
+            resource_data_to_update = resource_objects[updated_resource_matches[i]]
+            logger.warning(f"Resource exists. Updating {resource['name']}")
+            status = FilestoreHelper.dataset_update_filestore_resource(
+                resource,
+                resource_data_to_update,
+                filestore_resources,
+                resource_index,
+                **kwargs,
+            )
+            statuses[resource["name"]] = status
+            resources_to_update[resource_index] = resource_data_to_update
+        for updated_resource_index in updated_resource_no_matches:
+            resource_data_to_update = resource_objects[updated_resource_index]
+            status = FilestoreHelper.check_filestore_resource(
+                resource_data_to_update,
+                filestore_resources,
+                len(resources_to_update),
+                **kwargs,
+            )
+            statuses[resource_data_to_update["name"]] = status
+            resources_to_update.append(resource_data_to_update)
+        files_to_upload = self._revise_files_to_upload_resource_deletions(
+            resources_to_update, (), filestore_resources
+        )
+        dataset_data_to_update = {}
+        self._prepare_hdx_call(dataset_data_to_update, kwargs, clean_tags=False)
+        if "batch_mode" in kwargs:
+            dataset_data_to_update["batch_mode"] = kwargs["batch_mode"]
+        dataset_data_to_update["resources"] = self._convert_hdxobjects(
+            resources_to_update
+        )
+        new_dataset = self.revise(
+            {"id": dataset_id},
+            update=dataset_data_to_update,
+            files_to_upload=files_to_upload,
+            configuration=self.configuration,
+        )
+        self.data = new_dataset.data
+        self._resources = new_dataset._resources
+        self._take_hdx_snapshot()
+        return statuses
+
     def delete_resource(
         self,
         resource: Union["Resource", dict, str],
@@ -396,6 +515,34 @@ class Dataset(HDXObject):
         """
         return len(self._resources)
 
+    def download_resources(
+        self,
+        folder: Path | str | None = None,
+        cache_folder: Path | str | None = None,
+        verify: bool = True,
+        max_workers: int | None = None,
+    ) -> list[tuple[str, Path]]:
+        """Download dataset's resources concurrently to provided folder or temporary
+        folder if no folder supplied. See Resource.download_resources.
+
+        Args:
+            folder: Folder to download resources to. Defaults to None.
+            cache_folder: Folder for cache of files keyed by hash. Defaults to None.
+            verify: Whether to check files against size and hash in HDX. Defaults to True.
+            max_workers: Maximum number of threads. Defaults to None (executor default).
+
+        Returns:
+            List of (URL downloaded, Path to downloaded file) in order of resources
+        """
+        return res_module.Resource.download_resources(
+            self._resources,
+            folder=folder,
+            cache_folder=cache_folder,
+            verify=verify,
+            max_workers=max_workers,
+            configuration=self.configuration,
+        )
+
     def reorder_resources(
         self, resource_ids: Sequence[str], hxl_update: bool = True
     ) -> None:
@@ -488,13 +635,18 @@ class Dataset(HDXObject):
 
     @staticmethod
     def read_from_hdx(
-        identifier: str, configuration: Configuration | None = None
+        identifier: str,
+        configuration: Configuration | None = None,
+        keep_snapshot: bool = False,
     ) -> Optional["Dataset"]:
-        """Reads the dataset given by identifier from HDX and returns Dataset object
+        """Reads the dataset given by identifier from HDX and returns Dataset object.
+        If keep_snapshot is True, a copy of the metadata as read is kept so that
+        the dataset can be updated with update_in_hdx(assume_current=True).
 
         Args:
             identifier: Identifier of dataset
             configuration: HDX configuration. Defaults to global configuration.
+            keep_snapshot: Whether to keep a copy of the metadata as read. Defaults to False.
 
         Returns:
             Dataset object if successful read, None if not
@@ -503,6 +655,8 @@ class Dataset(HDXObject):
         dataset = Dataset(configuration=configuration)
         result = dataset._dataset_load_from_hdx(identifier)
         if result:
+            if keep_snapshot:
+                dataset._take_hdx_snapshot()
             return dataset
         return None
 
@@ -518,6 +672,19 @@ class Dataset(HDXObject):
             self.init_resources()
             self.separate_resources()
 
+    def _take_hdx_snapshot(self) -> None:
+        """Keep a copy of the dataset's metadata and resources as they are in
+        HDX for use when updating with assume_current. This is done on read only
+        if requested but always after the dataset is saved to HDX.
+
+        Returns:
+            None
+        """
+        self._hdx_snapshot = deepcopy(self.data)
+        self._hdx_snapshot["resources"] = [
+            deepcopy(resource.data) for resource in self._resources
+        ]
+
     def _dataset_load_from_hdx(self, id_or_name: str) -> bool:
         """Loads the dataset given by either id or name from HDX
 
@@ -533,6 +700,23 @@ class Dataset(HDXObject):
         self._dataset_create_resources()
         return True
 
+    def _dataset_assume_current(self) -> None:
+        """Set up the dataset for update as if it had just been loaded from HDX
+        but without reading it, using the copy of the metadata and resources
+        kept when the dataset was read from HDX with keep_snapshot or last saved
+        to HDX
+
+        Returns:
+            None
+        """
+        if self._hdx_snapshot is None:
+            raise HDXError(
+                "Dataset must be read from HDX with keep_snapshot=True or saved to HDX to update with assume_current!"
+            )
+        self._old_data = self.data
+        self.data = deepcopy(self._hdx_snapshot)
+        self._dataset_create_resources()
+
     def check_resources_url_filetoupload(self) -> None:
         """Check for error where both url or file to upload are provided for resources
 
@@ -626,7 +810,9 @@ class Dataset(HDXObject):
         dataset.separate_resources()
         return dataset
 
-    def _prepare_hdx_call(self, data: dict, kwargs: Any) -> None:
+    def _prepare_hdx_call(
+        self, data: dict, kwargs: Any, clean_tags: bool = True
+    ) -> None:
         """Common method used in create and update calls. Cleans tags and
         processes keyword arguments populating updated_by_script (details
         about what script is doing the update and when), batch
@@ -635,6 +821,7 @@ class Dataset(HDXObject):
 
         Args:
             data: Dataset data to update if needed
+            clean_tags: Whether to clean tags. Defaults to True.
             **kwargs: See below
             updated_by_script (str): Script info. Defaults to user agent.
             batch (str): Batch UUID for where multiple datasets are grouped into one batch
@@ -643,7 +830,8 @@ class Dataset(HDXObject):
         Returns:
             None
         """
-        self.clean_tags()
+        if clean_tags:
+            self.clean_tags()
         scriptinfo = kwargs.get("updated_by_script")
         if scriptinfo:
             del kwargs["updated_by_script"]
@@ -770,6 +958,7 @@ class Dataset(HDXObject):
         new_resource_order: Sequence[str] | None,
         create_default_views: bool = False,
         test: bool = False,
+        match: dict | None = None,
         **kwargs: Any,
     ) -> dict:
         """Helper method to save the modified dataset and add any filestore resources
@@ -783,6 +972,7 @@ class Dataset(HDXObject):
             new_resource_order: New resource order to use or None
             create_default_views: Whether to create default views. Defaults to False.
             test: Whether running in a test. Defaults to False.
+            match: Metadata on which to match dataset. Defaults to None (id).
             **kwargs: See below
             ignore_field (str): Any field to ignore when checking dataset metadata. Defaults to None.
 
@@ -817,14 +1007,17 @@ class Dataset(HDXObject):
         results["files_to_upload"] = files_to_upload
         if test:
             return results
+        if match is None:
+            match = {"id": self.data["id"]}
         new_dataset = self.revise(
-            {"id": self.data["id"]},
+            match,
             filter=revise_filter,
             update=dataset_data_to_update,
             files_to_upload=files_to_upload,
         )
         self.data = new_dataset.data
         self._resources = new_dataset._resources
+        self._take_hdx_snapshot()
 
         # We do field check after call so that we have the changed data
         if "ignore_check" not in kwargs or not kwargs.get(
@@ -1007,6 +1200,7 @@ class Dataset(HDXObject):
         remove_additional_resources: bool,
         match_resource_order: bool,
         create_default_views: bool,
+        match: dict | None = None,
         **kwargs: Any,
     ) -> tuple[dict, dict]:
         """Helper method to compare new and existing dataset data, update
@@ -1025,6 +1219,7 @@ class Dataset(HDXObject):
             remove_additional_resources: Remove additional resources found in dataset (if updating)
             match_resource_order: Match order of given resources by name
             create_default_views: Whether to call package_create_default_resource_views.
+            match: Metadata on which to match dataset. Defaults to None (id).
 
         Returns:
             Tuple of (resource status codes, revise call info)
@@ -1066,6 +1261,7 @@ class Dataset(HDXObject):
             filestore_resources,
             new_resource_order,
             create_default_views=create_default_views,
+            match=match,
             **kwargs,
         )
         return statuses, revise_call
@@ -1080,11 +1276,20 @@ class Dataset(HDXObject):
         match_resource_order: bool = False,
         create_default_views: bool = True,
         hxl_update: bool = True,
+        assume_current: bool = False,
         **kwargs: Any,
     ) -> dict:
         """Check if dataset exists in HDX and if so, update it. match_resources_by_metadata uses ids if they are
         available, otherwise names only if names are unique or format in addition if not.
 
+        If assume_current is True and the dataset has an id, the dataset is not
+        read from HDX before updating. The dataset must have been read by
+        read_from_hdx or search_in_hdx with keep_snapshot True or last saved to
+        HDX. Its changes are compared against the copy of the metadata kept then
+        so that removals (eg. of tags) are made as in a normal update and the
+        update is made only if the dataset's metadata_modified still matches
+        HDX, otherwise an HDXError is raised.
+
         Returns a dictionary with key resource name and value status code:
         0 = no file to upload and last_modified set to now
         (resource creation or data_updated flag is True),
@@ -1102,6 +1307,7 @@ class Dataset(HDXObject):
             remove_additional_resources: Remove additional resources found in dataset. Defaults to False.
             match_resource_order: Match order of given resources by name. Defaults to False.
             create_default_views: Whether to call package_create_default_resource_views. Defaults to True.
+            assume_current: Whether to skip reading the dataset from HDX. Defaults to False.
             **kwargs: See below
             keep_crisis_tags (bool): Whether to keep existing crisis tags. Defaults to True.
             updated_by_script (str): String to identify your script. Defaults to your user agent.
@@ -1112,8 +1318,17 @@ class Dataset(HDXObject):
             Status codes of resources
         """
         self.check_resources_url_filetoupload()
+        match = None
         loaded = False
-        if "id" in self.data:
+        if assume_current and "id" in self.data:
+            self._check_existing_object("dataset", "id")
+            match = {"id": self.data["id"]}
+            self._dataset_assume_current()
+            metadata_modified = self.data.get("metadata_modified")
+            if metadata_modified:
+                match["metadata_modified"] = metadata_modified
+            loaded = True
+        elif "id" in self.data:
             self._check_existing_object("dataset", "id")
             if self._dataset_load_from_hdx(self.data["id"]):
                 loaded = True
@@ -1131,6 +1346,7 @@ class Dataset(HDXObject):
             remove_additional_resources=remove_additional_resources,
             match_resource_order=match_resource_order,
             create_default_views=create_default_views,
+            match=match,
             **kwargs,
         )
         logger.info(f"Updated {self.get_hdx_url()}")
@@ -1250,14 +1466,18 @@ class Dataset(HDXObject):
         query: str | None = "*:*",
         configuration: Configuration | None = None,
         page_size: int = 1000,
+        keep_snapshot: bool = False,
         **kwargs: Any,
     ) -> list["Dataset"]:
-        """Searches for datasets in HDX
+        """Searches for datasets in HDX. If keep_snapshot is True, a copy of the
+        metadata of each dataset as read is kept so that it can be updated with
+        update_in_hdx(assume_current=True).
 
         Args:
             query: Query (in Solr format). Defaults to '*:*'.
             configuration: HDX configuration. Defaults to global configuration.
             page_size: Size of page to use internally to query HDX. Defaults to 1000.
+            keep_snapshot: Whether to keep a copy of the metadata as read. Defaults to False.
             **kwargs: See below
             fq (string): Any filter queries to apply
             rows (int): Number of matching rows to return. Defaults to all datasets (sys.maxsize).
@@ -1311,30 +1531,49 @@ class Dataset(HDXObject):
                 rows_left = total_rows - pagetimespagesize
                 rows = min(rows_left, page_size)
                 kwargs["rows"] = rows
-                _, result = dataset._read_from_hdx(
-                    "dataset",
-                    query,
-                    "q",
-                    Dataset.actions()["search"],
-                    **kwargs,
-                )
+                if dataset.configuration.is_json_streaming():
+                    _, result = dataset._read_streamed_from_hdx(
+                        "dataset",
+                        query,
+                        "q",
+                        Dataset.actions()["search"],
+                        "results",
+                        **kwargs,
+                    )
+                else:
+                    _, result = dataset._read_from_hdx(
+                        "dataset",
+                        query,
+                        "q",
+                        Dataset.actions()["search"],
+                        **kwargs,
+                    )
                 datasets = []
                 if result:
-                    count = result.get("count", None)
-                    if count:
-                        counts.add(count)
-                        no_results = len(result["results"])
-                        for datasetdict in result["results"]:
-                            dataset = Dataset(configuration=configuration)
-                            dataset._old_data = {}
-                            dataset.data = datasetdict
-                            dataset._dataset_create_resources()
-                            datasets.append(dataset)
-                        all_datasets += datasets
-                        if no_results < rows:
+                    try:
+                        count = result.get("count", None)
+                        if count:
+                            counts.add(count)
+                            no_results = 0
+                            for datasetdict in result["results"]:
+                                no_results += 1
+                                dataset = Dataset(configuration=configuration)
+                                dataset._old_data = {}
+                                dataset.data = datasetdict
+                                dataset._dataset_create_resources()
+                                if keep_snapshot:
+                                    dataset._take_hdx_snapshot()
+                                datasets.append(dataset)
+                            all_datasets += datasets
+                            if no_results < rows:
+                                break
+                        else:
                             break
-                    else:
-                        break
+                    finally:
+                        # Release a streamed response even if not consumed
+                        close = getattr(result.get("results"), "close", None)
+                        if close is not None:
+                            close()
                 else:
                     logger.debug(result)
             if (
@@ -1381,6 +1620,34 @@ class Dataset(HDXObject):
         dataset = Dataset(configuration=configuration)
         return dataset._write_to_hdx("list", kwargs)
 
+    @staticmethod
+    def iter_all_dataset_names(
+        configuration: Configuration | None = None,
+        page_size: int = 1000,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """Iterate over all dataset names in HDX, requesting them in pages so
+        that memory use does not depend on the number of datasets
+
+        Args:
+            configuration: HDX configuration. Defaults to global configuration.
+            page_size: Number of dataset names to request per page. Defaults to 1000.
+            **kwargs: See below
+            rows (int): Number of rows to return. Defaults to all datasets.
+            start (int): Offset in the complete result for where the set of returned dataset names should begin
+
+        Returns:
+            Iterator of all dataset names in HDX
+        """
+        total_rows = kwargs.pop("rows", None)
+        if total_rows:
+            kwargs["limit"] = total_rows
+        start = kwargs.pop("start", None)
+        if start:
+            kwargs["offset"] = start
+        dataset = Dataset(configuration=configuration)
+        return dataset._iter_list_from_hdx(page_size, kwargs)
+
     @classmethod
     def get_all_datasets(
         cls,
@@ -2392,6 +2659,8 @@ class Dataset(HDXObject):
         yearcol: int | str | None = None,
         date_function: Callable[[dict], dict | None] | None = None,
         no_empty: bool = True,
+        return_rows: bool = True,
+        add_to_dataset: bool = True,
     ) -> tuple[bool, dict]:
         """Write rows to file and create resource, adding it to the dataset. The headers
         argument is either a row number (rows start counting at 1), or the actual
@@ -2400,7 +2669,10 @@ class Dataset(HDXObject):
         the headers).
 
         The returned dictionary will contain the resource in the key resource, headers
-        in the key headers and list of rows in the key rows.
+        in the key headers and list of rows in the key rows. If return_rows is False,
+        rows are streamed straight to the file without being kept in memory and the
+        key rows is replaced by the key row_count containing the number of data rows
+        written.
 
         The time period can optionally be set by supplying a column in
         which the date or year is to be looked up. Note that any timezone
@@ -2413,6 +2685,9 @@ class Dataset(HDXObject):
         the time period and are returned in the results dictionary in keys
         startdate and enddate.
 
+        The formats parquet and arrow write every column as strings (with None
+        written as null) since the rows are streamed in batches.
+
         Args:
             folder: Folder to which to write file containing rows
             filename: Filename of file to write rows
@@ -2420,12 +2695,14 @@ class Dataset(HDXObject):
             resourcedata: Resource data
             headers: All headers. Defaults to None.
             columns: Columns to write. Defaults to all.
-            format: Format to write. Defaults to csv.
+            format: Format to write eg. csv, xlsx, json, csv.gz, parquet, arrow. Defaults to csv.
             encoding: Encoding to use. Defaults to None (infer encoding).
             datecol: Date column for setting time period. Defaults to None (don't set).
             yearcol: Year column for setting dataset year range. Defaults to None (don't set).
             date_function: Date function to call for each row. Defaults to None.
             no_empty: Don't generate resource if there are no data rows. Defaults to True.
+            return_rows: Return rows written in results. Defaults to True.
+            add_to_dataset: Set time period and add resource to dataset. Defaults to True.
 
         Returns:
             (True if resource added, dictionary of results)
@@ -2435,27 +2712,36 @@ class Dataset(HDXObject):
         retdict = {}
         dates = [default_enddate, default_date]
 
+        # Date and year columns usually have few distinct values relative to the
+        # number of rows, so each distinct value is only parsed once
         if yearcol is not None:
 
+            @lru_cache(maxsize=self.date_parse_cache_size)
+            def parse_year(year):
+                return parse_date_range(
+                    year,
+                    zero_time=True,
+                    max_endtime=True,
+                )
+
             def yearcol_function(row):
                 result = {}
                 year = row[yearcol]
                 if year:
-                    result["startdate"], result["enddate"] = parse_date_range(
-                        year,
-                        zero_time=True,
-                        max_endtime=True,
-                    )
+                    result["startdate"], result["enddate"] = parse_year(year)
                 return result
 
             date_function = yearcol_function
         elif datecol is not None:
+            cached_parse_date = lru_cache(maxsize=self.date_parse_cache_size)(
+                parse_date
+            )
 
             def datecol_function(row):
                 result = {}
                 date = row[datecol]
                 if date:
-                    date = parse_date(date)
+                    date = cached_parse_date(date)
                     result["startdate"] = date
                     result["enddate"] = date
                 return result
@@ -2479,17 +2765,36 @@ class Dataset(HDXObject):
             return row
 
         filepath = Path(folder) / filename
-        rows = save_iterable(
-            filepath,
-            rows,
-            headers,
-            columns,
-            format=format,
-            encoding=encoding,
-            row_function=process_row,
-            no_empty=no_empty,
-        )
-        if not rows:
+        if return_rows and not ResourceWriter.has_writer(format):
+            rows = save_iterable(
+                filepath,
+                rows,
+                headers,
+                columns,
+                format=format,
+                encoding=encoding,
+                row_function=process_row,
+                no_empty=no_empty,
+            )
+            written = bool(rows)
+        else:
+            rows_written = [] if return_rows else None
+            row_count, file_headers = ResourceWriter.stream_iterable(
+                filepath,
+                rows,
+                headers,
+                columns,
+                format=format,
+                encoding=encoding,
+                row_function=process_row,
+                no_empty=no_empty,
+                rows_written=rows_written,
+            )
+            rows = rows_written
+            written = row_count is not None and (row_count != 0 or not no_empty)
+            if headers is None or isinstance(headers, int):
+                headers = file_headers
+        if not written:
             logger.error(f"No data rows in {filename}!")
             return False, retdict
         if yearcol is not None or date_function is not None:
@@ -2499,18 +2804,23 @@ class Dataset(HDXObject):
             else:
                 retdict["startdate"] = dates[0]
                 retdict["enddate"] = dates[1]
-                self.set_time_period(dates[0], dates[1])
+                if add_to_dataset:
+                    self.set_time_period(dates[0], dates[1])
         resource = res_module.Resource(resourcedata)
-        resource.set_format(format)
+        resource.set_format(ResourceWriter.get_hdx_format(format))
         resource.set_file_to_upload(filepath)
-        self.add_update_resource(resource)
+        if add_to_dataset:
+            self.add_update_resource(resource)
         retdict["resource"] = resource
         if columns is not None:
             retdict["headers"] = columns
             retdict["original_headers"] = headers
         else:
             retdict["headers"] = headers
-        retdict["rows"] = rows
+        if return_rows:
+            retdict["rows"] = rows
+        else:
+            retdict["row_count"] = row_count
         return True, retdict
 
     def generate_resource_from_rows(
@@ -2716,12 +3026,15 @@ class Dataset(HDXObject):
         yearcol: int | str | None = None,
         date_function: Callable[[dict], dict | None] | None = None,
         no_empty: bool = True,
+        return_rows: bool = True,
+        add_to_dataset: bool = True,
         **kwargs: Any,
     ) -> tuple[bool, dict]:
         """Download url, write rows to csv and create resource, adding to it
         the dataset. The returned dictionary will contain the resource in the
         key resource, headers in the key headers and list of rows in the key
-        rows.
+        rows (or number of data rows in the key row_count if return_rows is
+        False).
 
         Optionally, headers can be inserted at specific positions. This is
         achieved using the header_insertions argument. If supplied, it is a
@@ -2752,12 +3065,14 @@ class Dataset(HDXObject):
             header_insertions: List of (position, header) to insert. Defaults to None.
             row_function: Function to call for each row. Defaults to None.
             columns: Columns to write. Defaults to all.
-            format: Format to write. Defaults to csv.
+            format: Format to write eg. csv, xlsx, json, csv.gz, parquet, arrow. Defaults to csv.
             encoding: Encoding to use. Defaults to None (infer encoding).
             datecol: Date column for setting time period. Defaults to None (don't set).
             yearcol: Year column for setting dataset year range. Defaults to None (don't set).
             date_function: Date function to call for each row. Defaults to None.
             no_empty: Don't generate resource if there are no data rows. Defaults to True.
+            return_rows: Return rows written in results. Defaults to True.
+            add_to_dataset: Set time period and add resource to dataset. Defaults to True.
             **kwargs: Any additional args to pass to downloader.get_tabular_rows
 
         Returns:
@@ -2784,8 +3099,66 @@ class Dataset(HDXObject):
             yearcol=yearcol,
             date_function=date_function,
             no_empty=no_empty,
+            return_rows=return_rows,
+            add_to_dataset=add_to_dataset,
         )
 
+    def generate_resources(
+        self,
+        specs: Sequence[dict],
+        max_workers: int | None = None,
+    ) -> list[tuple[bool, dict]]:
+        """Generate multiple resources concurrently in a pool of threads. Each
+        spec is a dictionary of keyword arguments for download_generate_resource
+        if it contains the key downloader or for generate_resource otherwise.
+        Each worker should be given its own downloader if the downloader is not
+        safe to share between threads.
+
+        Once all files are written, the resources that were generated are added
+        to the dataset in the order of the specs and the time period of the
+        dataset is extended to span the time periods of all of them as well as
+        any time period it already had.
+
+        Args:
+            specs: List of keyword arguments for each resource to generate
+            max_workers: Maximum number of threads. Defaults to None (Python default).
+
+        Returns:
+            List of (True if resource added, dictionary of results) in order of specs
+        """
+
+        def generate(spec: dict) -> tuple[bool, dict]:
+            kwargs = dict(spec)
+            kwargs["add_to_dataset"] = False
+            if "downloader" in kwargs:
+                return self.download_generate_resource(**kwargs)
+            return self.generate_resource(**kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(generate, specs))
+        time_period = self.get_time_period()
+        existing_startdate = time_period.get("startdate")
+        existing_enddate = time_period.get("enddate")
+        startdate = None
+        enddate = None
+        for success, retdict in results:
+            if not success:
+                continue
+            resource_startdate = retdict.get("startdate")
+            if resource_startdate is not None:
+                if startdate is None or resource_startdate < startdate:
+                    startdate = resource_startdate
+                resource_enddate = retdict["enddate"]
+                if enddate is None or resource_enddate > enddate:
+                    enddate = resource_enddate
+            self.add_update_resource(retdict["resource"])
+        if startdate is not None:
+            if existing_startdate is not None:
+                startdate = min(startdate, existing_startdate)
+                enddate = max(enddate, existing_enddate)
+            self.set_time_period(startdate, enddate, time_period.get("ongoing", False))
+        return results
+
     def download_and_generate_resource(
         self,
         downloader: BaseDownload,
@@ -2903,3 +3276,37 @@ class Dataset(HDXObject):
         resource["qa_hapi_report"] = error_message
         resource.update_in_hdx(operation="patch")
         return True
+
+    def add_hapi_errors(self, resource_errors: dict[str, str]) -> bool:
+        """Writes error messages that were uncovered while processing data for
+        the HAPI database to the metadata of multiple resources on HDX in one
+        package_revise call. resource_errors is a dictionary from resource
+        name or id to error message. Resources that already have the same
+        error message are not changed.
+
+        Args:
+            resource_errors: Dictionary of resource name or id to error message
+
+        Returns:
+            True if any message was added, False if not
+        """
+        changed = []
+        update = {}
+        for resource in self.get_resources():
+            error_message = resource_errors.get(resource["name"])
+            if error_message is None:
+                error_message = resource_errors.get(resource["id"])
+                if error_message is None:
+                    continue
+            if resource.get("qa_hapi_report") == error_message:
+                continue
+            changed.append((resource, error_message))
+            update[f"update__resources__{resource['id']}"] = {
+                "qa_hapi_report": error_message
+            }
+        if not changed:
+            return False
+        self.revise({"id": self.data["id"]}, configuration=self.configuration, **update)
+        for resource, error_message in changed:
+            resource["qa_hapi_report"] = error_message
+        return True
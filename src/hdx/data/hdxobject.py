@@ -6,7 +6,7 @@ import copy
 import logging
 from abc import ABC, abstractmethod
 from collections import UserDict
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from os.path import isfile
 from pathlib import Path
 from typing import Any, Optional, Union
@@ -19,6 +19,7 @@ from hdx.utilities.loader import (
 )
 
 from hdx.api.configuration import Configuration
+from hdx.api.utilities.object_cache import get_identifiers
 
 logger = logging.getLogger(__name__)
 
@@ -113,8 +114,55 @@ class HDXObject(UserDict, ABC):
             action = self.actions()["show"]
         data = {fieldname: value}
         data.update(kwargs)
+        cache = self.configuration.get_object_cache()
+        if cache is not None and action == self.actions().get("show"):
+            key = cache.get_key(action, data)
+            found, result = cache.get(key)
+            if found:
+                return True, result
+        else:
+            cache = None
         try:
             result = self.configuration.call_remoteckan(action, data)
+            if cache is not None:
+                cache.set(key, result)
+            return True, result
+        except NotFound:
+            return False, f"{fieldname}={value}: not found!"
+        except Exception as e:
+            raise HDXError(
+                f"Failed when trying to read: {fieldname}={value}! (POST)"
+            ) from e
+
+    def _read_streamed_from_hdx(
+        self,
+        object_type: str,
+        value: str,
+        fieldname: str,
+        action: str,
+        items_path: str,
+        **kwargs: Any,
+    ) -> tuple[bool, Any]:
+        """Makes a read call to HDX passing in given parameter, parsing the
+        response incrementally (see Configuration.call_remoteckan_streaming).
+
+        Args:
+            object_type: Description of HDX object type (for messages)
+            value: Value of HDX field
+            fieldname: HDX field name
+            action: CKAN action url to use
+            items_path: Path of list within result to iterate eg. "results"
+            **kwargs: Other fields to pass to CKAN.
+
+        Returns:
+            (True/False, HDX result with iterator at items_path/Error)
+        """
+        data = {fieldname: value}
+        data.update(kwargs)
+        try:
+            result = self.configuration.call_remoteckan_streaming(
+                action, data, items_path
+            )
             return True, result
         except NotFound:
             return False, f"{fieldname}={value}: not found!"
@@ -395,13 +443,17 @@ class HDXObject(UserDict, ABC):
             HDX object metadata
         """
         open_files_to_upload = {}
+        cache = self.configuration.get_object_cache()
         try:
             if files_to_upload:
                 for key, value in files_to_upload.items():
                     open_files_to_upload[key] = open(value, "rb")
-            return self.configuration.call_remoteckan(
+            result = self.configuration.call_remoteckan(
                 self.actions()[action], data, files=open_files_to_upload
             )
+            if cache is not None:
+                cache.invalidate(get_identifiers(result))
+            return result
         except Exception as e:
             if id_field_name:
                 idstr = f" {data[id_field_name]}"
@@ -409,9 +461,75 @@ class HDXObject(UserDict, ABC):
                 idstr = ""
             raise HDXError(f"Failed when trying to {action}{idstr}! (POST)") from e
         finally:
+            if cache is not None:
+                cache.invalidate(get_identifiers(data))
             for file in open_files_to_upload.values():
                 file.close()
 
+    def _iter_list_from_hdx(
+        self, page_size: int, kwargs: dict[str, Any]
+    ) -> Iterator[Any]:
+        """Iterate over the results of the HDX object's list action, requesting
+        them in pages using limit and offset so that only one page at a time is
+        held in memory. Any limit and offset in kwargs apply to the results as
+        a whole. Paging stops if a page starts with the same result as the
+        previous page so that a server that ignores offset cannot cause an
+        endless loop. If JSON streaming is enabled in the configuration, each
+        page is also parsed incrementally.
+
+        Args:
+            page_size: Number of results to request per page
+            kwargs: Other fields to pass to the list action
+
+        Returns:
+            Iterator of results
+        """
+        kwargs = dict(kwargs)
+        offset = kwargs.pop("offset", None) or 0
+        total_rows = kwargs.pop("limit", None)
+        previous_first = None
+        while total_rows is None or total_rows > 0:
+            limit = page_size if total_rows is None else min(page_size, total_rows)
+            kwargs["limit"] = limit
+            kwargs["offset"] = offset
+            if self.configuration.is_json_streaming():
+                try:
+                    results = self.configuration.call_remoteckan_streaming(
+                        self.actions()["list"], kwargs, ""
+                    )
+                except Exception as e:
+                    raise HDXError("Failed when trying to list! (POST)") from e
+            else:
+                results = self._write_to_hdx("list", kwargs)
+            if not results:
+                return
+            no_results = 0
+            try:
+                for result in results:
+                    if no_results == 0:
+                        if previous_first is not None and result == previous_first:
+                            # The server ignored offset and returned the same
+                            # page again
+                            return
+                        previous_first = result
+                    no_results += 1
+                    yield result
+                    if total_rows is not None and no_results >= limit:
+                        break
+            finally:
+                # Release a streamed response even if not fully consumed
+                close = getattr(results, "close", None)
+                if close is not None:
+                    close()
+            if no_results == 0 or no_results > limit:
+                # No more results or the server ignored limit and offset
+                return
+            # The server may cap the page size below limit (eg. CKAN's
+            # organization_list) so advance by the number actually returned
+            offset += no_results
+            if total_rows is not None:
+                total_rows -= no_results
+
     def _save_to_hdx(
         self,
         action: str,
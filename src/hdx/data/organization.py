@@ -1,7 +1,8 @@
 """Organization class containing all logic for creating, checking, and updating organizations."""
 
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional, Union
 
@@ -126,29 +127,54 @@ class Organization(HDXObject):
         """
         self._delete_from_hdx("organization", "id")
 
-    def get_users(self, capacity: str | None = None) -> list["User"]:
-        """Returns the organization's users.
+    def get_users(
+        self,
+        capacity: str | None = None,
+        full_profile: bool = True,
+        max_workers: int | None = None,
+    ) -> list["User"]:
+        """Returns the organization's users. By default, full user profiles are
+        read from HDX concurrently. If full_profile is False, User objects are
+        created from the user metadata embedded in the organization without
+        reading from HDX and the full profile of a user is only read when a field
+        not in the embedded metadata is accessed.
 
         Args:
             capacity: Filter by capacity eg. member, admin. Defaults to None.
+            full_profile: Whether to read full user profiles. Defaults to True.
+            max_workers: Maximum number of concurrent reads. Defaults to None (ThreadPoolExecutor default).
+
         Returns:
             Organization's users.
         """
-        users = []
         usersdicts = self.data.get("users")
-        if usersdicts is not None:
-            for userdata in usersdicts:
-                if capacity is not None and userdata["capacity"] != capacity:
-                    continue
-                id = userdata.get("id")
-                if id is None:
-                    id = userdata["name"]
-                user = user_module.User.read_from_hdx(
-                    id, configuration=self.configuration
+        if usersdicts is None:
+            return []
+        usersdicts = [
+            userdata
+            for userdata in usersdicts
+            if capacity is None or userdata["capacity"] == capacity
+        ]
+        if not full_profile:
+            return [
+                user_module.User.from_summary(
+                    userdata, configuration=self.configuration
                 )
-                user["capacity"] = userdata["capacity"]
-                users.append(user)
-        return users
+                for userdata in usersdicts
+            ]
+
+        def read_user(userdata: dict) -> "User":
+            id = userdata.get("id")
+            if id is None:
+                id = userdata["name"]
+            user = user_module.User.read_from_hdx(id, configuration=self.configuration)
+            user["capacity"] = userdata["capacity"]
+            return user
+
+        if len(usersdicts) < 2:
+            return [read_user(userdata) for userdata in usersdicts]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(read_user, usersdicts))
 
     def add_update_user(
         self,
@@ -262,6 +288,34 @@ class Organization(HDXObject):
         organization = Organization(configuration=configuration)
         return organization._write_to_hdx("list", kwargs)
 
+    @staticmethod
+    def iter_all_organization_names(
+        configuration: Configuration | None = None,
+        page_size: int = 1000,
+        **kwargs: Any,
+    ) -> Iterator[str | dict]:
+        """Iterate over all organization names in HDX, requesting them in pages
+        so that memory use does not depend on the number of organizations
+
+        Args:
+            configuration: HDX configuration. Defaults to global configuration.
+            page_size: Number of organizations to request per page. Defaults to 1000.
+            **kwargs: See below
+            sort (str): Sort the search results according to field name and sort-order. Allowed fields are ‘name’, ‘package_count’ and ‘title’. Defaults to 'name asc'.
+            limit (int): Number of organizations to return. Defaults to all organizations.
+            offset (int): Offset in the complete result for where the set of returned organizations should begin
+            all_fields (bool): Return group dictionaries instead of just names. Only core fields are returned - get some more using the include_* options. Defaults to False.
+            include_extras (bool): If all_fields, include the group extra fields. Defaults to False.
+            include_tags (bool): If all_fields, include the group tags. Defaults to False.
+            include_groups (bool): If all_fields, include the groups the groups are in. Defaults to False.
+            include_users (bool): If all_fields, include the organization users. Defaults to False.
+
+        Returns:
+            Iterator of all organization names (or dictionaries if all_fields) in HDX
+        """
+        organization = Organization(configuration=configuration)
+        return organization._iter_list_from_hdx(page_size, kwargs)
+
     @classmethod
     def autocomplete(
         cls,
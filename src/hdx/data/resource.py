@@ -2,15 +2,28 @@
 
 import logging
 import warnings
-from collections.abc import Sequence
-from datetime import datetime
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from copy import deepcopy
+from datetime import date, datetime
+from itertools import chain, islice
+from os import replace
 from pathlib import Path
+from shutil import copyfile
+from threading import Lock
+from time import sleep
 from typing import Any, Optional
+from uuid import uuid4
 
+from hdx.utilities.base_downloader import BaseDownload
 from hdx.utilities.dateparse import now_utc, now_utc_notz, parse_date
-from hdx.utilities.downloader import Download
+from hdx.utilities.downloader import DownloadError
 from hdx.utilities.file_hashing import get_size_and_hash
+from hdx.utilities.loader import load_json
 from hdx.utilities.retriever import Retrieve
+from hdx.utilities.saver import save_json
+from hdx.utilities.url import get_path_for_url
 from hdx.utilities.uuid import is_valid_uuid
 
 import hdx.api.utilities.url_utils
@@ -18,6 +31,7 @@ import hdx.data.dataset
 import hdx.data.resource_matcher
 from hdx.api.configuration import Configuration
 from hdx.api.utilities.date_helper import DateHelper
+from hdx.api.utilities.resource_writer import get_headers_and_rows
 from hdx.data.hdxobject import HDXError, HDXObject
 from hdx.data.resource_view import ResourceView
 
@@ -34,6 +48,7 @@ class Resource(HDXObject):
     """
 
     _formats_dict = None
+    _formats_lock = Lock()
 
     def __init__(
         self,
@@ -62,6 +77,8 @@ class Resource(HDXObject):
             "delete": "resource_delete",
             "search": "resource_search",
             "broken": "hdx_mark_broken_link_in_resource",
+            "datastore_create": "datastore_create",
+            "datastore_upsert": "datastore_upsert",
             "datastore_delete": "datastore_delete",
             "datastore_search": "datastore_search",
         }
@@ -172,24 +189,26 @@ class Resource(HDXObject):
         Returns:
             Returns formats dictionary
         """
-        if not cls._formats_dict:
+        if cls._formats_dict:
+            return cls._formats_dict
+        with cls._formats_lock:
+            if cls._formats_dict:
+                return cls._formats_dict
             if configuration is None:
                 configuration = Configuration.read()
-            with Download(
-                full_agent=configuration.get_user_agent(),
-                use_env=False,
-            ) as downloader:
+            with configuration.get_downloader() as downloader:
                 if url is None:
                     url = configuration["formats_mapping_url"]
                 downloader.download(url)
-                cls._formats_dict = {}
+                formats_dict = {}
                 for format_data in downloader.get_json():
                     hdx_format = format_data[0].lower()
                     if hdx_format == "_comment":
                         continue
-                    cls._formats_dict[hdx_format] = hdx_format
+                    formats_dict[hdx_format] = hdx_format
                     for file_format in format_data[3]:
-                        cls._formats_dict[file_format.lower()] = hdx_format
+                        formats_dict[file_format.lower()] = hdx_format
+            cls._formats_dict = formats_dict
         return cls._formats_dict
 
     @classmethod
@@ -458,56 +477,102 @@ class Resource(HDXObject):
         self._merge_hdx_update("resource", "id", files, True, **kwargs)
         return status
 
-    def _get_resource_id(self, **kwargs: Any) -> str | None:
+    def _get_resource_id_and_data(
+        self, **kwargs: Any
+    ) -> tuple[str | None, dict | None]:
         """Helper function to get resource id if available from given resource or by
-        comparing ot a given dataset's resources.
+        comparing to a given dataset's resources. If the resource is found in a
+        given dataset or in the dataset read from HDX using the resource's
+        package_id, its metadata from that dataset is also returned so that it
+        does not need to be read again.
 
         Args:
             **kwargs: See below
             dataset (Dataset): Existing dataset if available to obtain resource id
 
         Returns:
-            Resource id or None
+            (Resource id or None, resource metadata from dataset or None)
         """
         loadedid = self.data.get("id")
-        if loadedid is None:
-            dataset = kwargs.get("dataset")
+        dataset = kwargs.get("dataset")
+        if loadedid is not None:
             if dataset:
-                dataset_id = dataset.get("id")
-                if not dataset_id:
-                    dataset_name = dataset.get("name")
-                    if dataset_name:
-                        dataset = hdx.data.dataset.Dataset.read_from_hdx(dataset_name)
-                        if dataset:
-                            dataset_id = dataset["id"]
-                    else:
-                        raise HDXError("No dataset id or name in dataset!")
-                if dataset_id:
-                    package_id = self.data.get("package_id")
-                    if package_id and package_id != dataset_id:
-                        logger.warning(
-                            f"Using dataset id {dataset_id} from dataset parameter which doesn't match {package_id} in resource!"
-                        )
-            else:
-                dataset_id = self.data.get("package_id")
-                if dataset_id:
-                    dataset = hdx.data.dataset.Dataset.read_from_hdx(dataset_id)
-                    if not dataset:
-                        dataset_id = None
+                for resource in dataset.get_resources():
+                    if resource.get("id") == loadedid:
+                        return loadedid, resource.data
+            return loadedid, None
+        if dataset:
+            dataset_id = dataset.get("id")
+            if not dataset_id:
+                dataset_name = dataset.get("name")
+                if dataset_name:
+                    dataset = hdx.data.dataset.Dataset.read_from_hdx(
+                        dataset_name, configuration=self.configuration
+                    )
+                    if dataset:
+                        dataset_id = dataset["id"]
+                else:
+                    raise HDXError("No dataset id or name in dataset!")
             if dataset_id:
-                self.data["package_id"] = dataset["id"]
-                dataset_resources = dataset.get_resources()
-                matching_index = (
-                    hdx.data.resource_matcher.ResourceMatcher.match_resource_list(
-                        dataset_resources, self
+                package_id = self.data.get("package_id")
+                if package_id and package_id != dataset_id:
+                    logger.warning(
+                        f"Using dataset id {dataset_id} from dataset parameter which doesn't match {package_id} in resource!"
                     )
+        else:
+            dataset_id = self.data.get("package_id")
+            if dataset_id:
+                dataset = hdx.data.dataset.Dataset.read_from_hdx(
+                    dataset_id, configuration=self.configuration
                 )
-                if matching_index:
-                    matching_resource = dataset_resources[matching_index]
-                    loadedid = matching_resource.get("id")
-                    if loadedid:
-                        self.data["id"] = loadedid
-        return loadedid
+                if not dataset:
+                    dataset_id = None
+        if not dataset_id:
+            return None, None
+        self.data["package_id"] = dataset["id"]
+        dataset_resources = dataset.get_resources()
+        matching_index = hdx.data.resource_matcher.ResourceMatcher.match_resource_list(
+            dataset_resources, self
+        )
+        if matching_index is None:
+            return None, None
+        matching_resource = dataset_resources[matching_index]
+        loadedid = matching_resource.get("id")
+        if not loadedid:
+            return None, None
+        self.data["id"] = loadedid
+        return loadedid, matching_resource.data
+
+    def _get_resource_id(self, **kwargs: Any) -> str | None:
+        """Helper function to get resource id if available from given resource or by
+        comparing ot a given dataset's resources.
+
+        Args:
+            **kwargs: See below
+            dataset (Dataset): Existing dataset if available to obtain resource id
+
+        Returns:
+            Resource id or None
+        """
+        return self._get_resource_id_and_data(**kwargs)[0]
+
+    def _resource_load_existing(self, loadedid: str, data: dict | None) -> bool:
+        """Helper function to load the existing resource given by loadedid, using
+        data (metadata taken from its dataset) if given rather than reading the
+        resource from HDX.
+
+        Args:
+            loadedid: Resource id
+            data: Resource metadata from dataset or None
+
+        Returns:
+            True if loaded, False if not
+        """
+        if data is None:
+            return self._load_from_hdx("resource", loadedid)
+        self._old_data = self.data
+        self.data = deepcopy(data)
+        return True
 
     def update_in_hdx(self, **kwargs: Any) -> int:
         """Check if resource exists in HDX and if so, update it. To indicate
@@ -531,14 +596,16 @@ class Resource(HDXObject):
             data_updated (bool): If True, set last_modified to now. Defaults to False.
             date_data_updated (datetime): Date to use for last_modified. Default to None.
             force_update (bool): Force file to be updated even if it hasn't changed. Defaults to False.
-            dataset (Dataset): Existing dataset if available to obtain resource id
+            dataset (Dataset): Existing dataset if available to obtain resource id and metadata
 
         Returns:
             Status code
         """
         self.check_both_url_filetoupload()
-        _ = self._get_resource_id(**kwargs)
-        self._check_load_existing_object("resource", "id")
+        _, data = self._get_resource_id_and_data(**kwargs)
+        self._check_existing_object("resource", "id")
+        if not self._resource_load_existing(self.data["id"], data):
+            raise HDXError("No existing resource to update!")
         return self._resource_merge_hdx_update(**kwargs)
 
     def create_in_hdx(self, **kwargs: Any) -> int:
@@ -564,15 +631,15 @@ class Resource(HDXObject):
             data_updated (bool): If True, set last_modified to now. Defaults to False.
             date_data_updated (datetime): Date to use for last_modified. Default to None.
             force_update (bool): Force file to be updated even if it hasn't changed. Defaults to False.
-            dataset (Dataset): Existing dataset if available to obtain resource id
+            dataset (Dataset): Existing dataset if available to obtain resource id and metadata
 
         Returns:
             Status code
         """
         self.check_both_url_filetoupload()
-        loadedid = self._get_resource_id(**kwargs)
+        loadedid, data = self._get_resource_id_and_data(**kwargs)
         if loadedid:
-            if self._load_from_hdx("resource", loadedid):
+            if self._resource_load_existing(loadedid, data):
                 logger.warning(f"{'resource'} exists. Updating {loadedid}")
                 return self._resource_merge_hdx_update(**kwargs)
             logger.warning(f"Failed to load resource with id {loadedid}")
@@ -616,35 +683,129 @@ class Resource(HDXObject):
     def search_in_hdx(
         query: str,
         configuration: Configuration | None = None,
+        page_size: int = 1000,
+        max_workers: int = 1,
         **kwargs: Any,
     ) -> list["Resource"]:
-        """Searches for resources in HDX. NOTE: Does not search dataset metadata!
+        """Searches for resources in HDX paging through the results. An HDXError
+        is raised if a page after the first cannot be read.
+        NOTE: Does not search dataset metadata!
 
         Args:
             query: Query
             configuration: HDX configuration. Defaults to global configuration.
+            page_size: Size of page to use internally to query HDX. Defaults to 1000.
+            max_workers: Number of pages to request in parallel. Defaults to 1.
             **kwargs: See below
-            order_by (str): A field on the Resource model that orders the results
+            order_by (str): A field on the Resource model that orders the results. Defaults to id.
             offset (int): Apply an offset to the query
-            limit (int): Apply a limit to the query
+            limit (int): Apply a limit to the query. Defaults to all resources.
         Returns:
             List of resources resulting from query
         """
+        return list(
+            Resource.iter_search_in_hdx(
+                query,
+                configuration=configuration,
+                page_size=page_size,
+                max_workers=max_workers,
+                **kwargs,
+            )
+        )
+
+    @staticmethod
+    def iter_search_in_hdx(
+        query: str,
+        configuration: Configuration | None = None,
+        page_size: int = 1000,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> Iterator["Resource"]:
+        """Iterate over the resources in HDX matching a query, requesting them in
+        pages from resource_search using limit and offset so that only one page
+        at a time is held in memory. Once the first page has given the total
+        count, if max_workers is more than 1, further pages are requested in
+        parallel with at most twice max_workers pages in progress at any time.
+        If the first page cannot be read there are no results but an HDXError is
+        raised if any later page cannot be read so that results are never
+        silently truncated. NOTE: Does not search dataset metadata!
 
-        resources = []
+        Args:
+            query: Query
+            configuration: HDX configuration. Defaults to global configuration.
+            page_size: Size of page to use internally to query HDX. Defaults to 1000.
+            max_workers: Number of pages to request in parallel. Defaults to 1.
+            **kwargs: See below
+            order_by (str): A field on the Resource model that orders the results. Defaults to id.
+            offset (int): Apply an offset to the query
+            limit (int): Apply a limit to the query. Defaults to all resources.
+        Returns:
+            Iterator of resources resulting from query
+        """
         resource = Resource(configuration=configuration)
-        success, result = resource._read_from_hdx(
-            "resource", query, "query", Resource.actions()["search"]
-        )
-        if result:
-            count = result.get("count", None)
-            if count:
-                for resourcedict in result["results"]:
-                    resource = Resource(resourcedict, configuration=configuration)
-                    resources.append(resource)
-        else:
-            logger.debug(result)
-        return resources
+        start = kwargs.pop("offset", None) or 0
+        total_rows = kwargs.pop("limit", None)
+        if not kwargs.get("order_by"):
+            # Paging needs a stable order
+            kwargs["order_by"] = "id"
+
+        def get_page(offset: int, limit: int) -> tuple[int, list[dict]]:
+            success, result = resource._read_from_hdx(
+                "resource",
+                query,
+                "query",
+                Resource.actions()["search"],
+                offset=offset,
+                limit=limit,
+                **kwargs,
+            )
+            if not success:
+                if offset == start:
+                    # Nothing has been yielded yet so treat as no results
+                    logger.debug(result)
+                    return 0, []
+                raise HDXError(
+                    f"Failed to read resource search {query} at offset {offset}: {result}"
+                )
+            return result.get("count", 0), result["results"]
+
+        def get_resources(resourcedicts: list[dict]) -> Iterator["Resource"]:
+            for resourcedict in resourcedicts:
+                yield Resource(resourcedict, configuration=configuration)
+
+        limit = page_size if total_rows is None else min(page_size, total_rows)
+        count, resourcedicts = get_page(start, limit)
+        if not count:
+            return
+        yield from get_resources(resourcedicts)
+        if not resourcedicts:
+            return
+        # The count from the first page bounds the paging. The server may cap
+        # the page size below limit so the first page's size is used after it.
+        end = count if total_rows is None else min(count, start + total_rows)
+        page_size = min(page_size, len(resourcedicts))
+        offset = start + len(resourcedicts)
+        if max_workers <= 1:
+            while offset < end:
+                _, resourcedicts = get_page(offset, min(page_size, end - offset))
+                if not resourcedicts:
+                    return
+                yield from get_resources(resourcedicts)
+                offset += len(resourcedicts)
+            return
+        offsets = range(offset, end, page_size)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = deque()
+            for offset in offsets:
+                if len(futures) >= max_workers * 2:
+                    _, resourcedicts = futures.popleft().result()
+                    yield from get_resources(resourcedicts)
+                futures.append(
+                    executor.submit(get_page, offset, min(page_size, end - offset))
+                )
+            while futures:
+                _, resourcedicts = futures.popleft().result()
+                yield from get_resources(resourcedicts)
 
     def download(
         self, folder: Path | str | None = None, retriever: Retrieve | None = None
@@ -660,50 +821,584 @@ class Resource(HDXObject):
             (URL downloaded, Path to downloaded file)
 
         """
-        # Download the resource
+        with self.configuration.get_downloader() as downloader:
+            if retriever:
+                downloader = retriever.clone(downloader)
+            return self._download(downloader, folder)
+
+    def _get_url_and_filename(self) -> tuple[str, str]:
+        """Get url of resource and filename to use when downloading it
+
+        Returns:
+            (URL, filename)
+        """
         url = self.data.get("url", None)
         if not url:
             raise HDXError("No URL to download!")
-        logger.debug(f"Downloading {url}")
         filename = self.data["name"]
         file_format = f".{self.get_format()}"
         if not filename.endswith(file_format):
             filename = f"{filename}{file_format}"
-        session = hdx.api.utilities.url_utils.get_ckan_ready_session(self.configuration)
-        with Download(session=session) as downloader:
-            if retriever:
-                downloader = retriever.clone(downloader)
-            path = downloader.download_file(url, folder=folder, filename=filename)
-            return url, path
+        return url, filename
+
+    def _download(
+        self,
+        downloader: BaseDownload,
+        folder: Path | str | None = None,
+        cache_folder: Path | str | None = None,
+        verify: bool = False,
+    ) -> tuple[str, Path]:
+        """Download resource using downloader to provided folder or temporary
+        folder if no folder supplied. If cache_folder is given and the resource has
+        a hash, the file is copied from the cache if it is there and added to the
+        cache after downloading if not.
+
+        Args:
+            downloader: A Download or Retrieve object
+            folder: Folder to download resource to. Defaults to None.
+            cache_folder: Folder for cache of files keyed by hash. Defaults to None.
+            verify: Whether to check file against size and hash in HDX. Defaults to False.
+
+        Returns:
+            (URL downloaded, Path to downloaded file)
+        """
+        url, filename = self._get_url_and_filename()
+        file_format = f".{self.get_format()}"
+        hash = self.data.get("hash")
+        cache_path = None
+        if cache_folder and hash:
+            cache_path = Path(cache_folder, f"{hash}{file_format}")
+            if cache_path.exists():
+                path = get_path_for_url(url, folder, filename)
+                logger.debug(f"Copying {url} from cache {cache_path}")
+                copyfile(cache_path, path)
+                return url, path
+        logger.debug(f"Downloading {url}")
+        path = downloader.download_file(url, folder=folder, filename=filename)
+        if verify or cache_path:
+            size, filehash = get_size_and_hash(path, self.get_format() or "")
+            expected_size = self.data.get("size")
+            if expected_size and int(expected_size) != size:
+                mismatch = f"size {size} != {expected_size}"
+            elif hash and hash != filehash:
+                mismatch = f"hash {filehash} != {hash}"
+            else:
+                mismatch = None
+            if mismatch:
+                if verify:
+                    raise HDXError(f"Download of {url} does not match HDX: {mismatch}!")
+                return url, path
+            if cache_path:
+                Path(cache_folder).mkdir(parents=True, exist_ok=True)
+                temp_path = cache_path.with_name(f"{cache_path.name}.{uuid4().hex}")
+                copyfile(path, temp_path)
+                replace(temp_path, cache_path)
+        return url, path
+
+    def download_if_changed(
+        self, folder: Path | str | None = None, resume: bool = True
+    ) -> tuple[str, Path, bool]:
+        """Download resource to provided folder or temporary folder if no folder
+        supplied, only transferring data if it has changed. Unlike download, an
+        existing file with the same name is reused rather than a new unique name
+        being generated.
+
+        If the existing file matches the hash of the resource, no request is made.
+        Otherwise, a conditional GET is made using the ETag and Last-Modified headers
+        stored alongside the file (in a .headers file) from the last download, so
+        that the server can reply that it is unchanged. If resume is True and an
+        earlier download was interrupted, it is resumed with a Range request.
+
+        Args:
+            folder: Folder to download resource to. Defaults to None.
+            resume: Whether to resume interrupted downloads. Defaults to True.
+
+        Returns:
+            (URL downloaded, Path to downloaded file, whether data was transferred)
+        """
+        url, filename = self._get_url_and_filename()
+        path = get_path_for_url(url, folder, filename, keep=True)
+        headers_path = Path(f"{path}.headers")
+        part_path = Path(f"{path}.part")
+        part_headers_path = Path(f"{part_path}.headers")
+        headers = {}
+        if path.exists():
+            hash = self.data.get("hash")
+            if hash and get_size_and_hash(path, self.get_format() or "")[1] == hash:
+                logger.debug(f"{path} matches hash of {url}")
+                return url, path, False
+            if headers_path.exists():
+                validators = load_json(headers_path)
+                if validators.get("etag"):
+                    headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    headers["If-Modified-Since"] = validators["last_modified"]
+        offset = 0
+        if resume and part_path.exists() and part_headers_path.exists():
+            offset = part_path.stat().st_size
+            validators = load_json(part_headers_path)
+            validator = validators.get("etag") or validators.get("last_modified")
+            if offset and validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+        with self.configuration.get_downloader() as downloader:
+            logger.debug(f"Downloading {url}")
+            try:
+                response = downloader.setup(url, headers=headers)
+            except DownloadError:
+                if "Range" not in headers or downloader.response is None:
+                    raise
+                if downloader.response.status_code != 416:
+                    raise
+                # The partial file is not a prefix of the current file so start again
+                del headers["Range"]
+                del headers["If-Range"]
+                response = downloader.setup(url, headers=headers)
+            if response.status_code == 304:
+                logger.debug(f"{url} not modified")
+                return url, path, False
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            content_range = response.headers.get("Content-Range", "")
+            if response.status_code == 206 and content_range.startswith(
+                f"bytes {offset}-"
+            ):
+                logger.debug(f"Resuming download of {url} from byte {offset}")
+                mode = "ab"
+            else:
+                if response.status_code == 206:
+                    raise HDXError(f"Unexpected partial response for {url}!")
+                mode = "wb"
+                if resume and (validators["etag"] or validators["last_modified"]):
+                    save_json(validators, part_headers_path)
+            with open(part_path, mode) as fp:
+                for chunk in response.iter_content(chunk_size=10240):
+                    if chunk:
+                        fp.write(chunk)
+        replace(part_path, path)
+        if part_headers_path.exists():
+            part_headers_path.unlink()
+        if validators["etag"] or validators["last_modified"]:
+            save_json(validators, headers_path)
+        elif headers_path.exists():
+            headers_path.unlink()
+        return url, path, True
+
+    @staticmethod
+    def download_resources(
+        resources: Sequence["Resource"],
+        folder: Path | str | None = None,
+        cache_folder: Path | str | None = None,
+        verify: bool = True,
+        max_workers: int | None = None,
+        configuration: Configuration | None = None,
+    ) -> list[tuple[str, Path]]:
+        """Download resources concurrently to provided folder or temporary folder if
+        no folder supplied, using one session for all downloads. If cache_folder is
+        given, downloaded files are stored in it keyed by the resource hash field so
+        that files that have already been downloaded are copied from there rather than
+        downloaded again. If verify is True, downloaded files are checked against the
+        size and hash fields of the resources, raising an HDXError if they do not
+        match. Files that do not match are never added to the cache.
+
+        Args:
+            resources: Resources to download
+            folder: Folder to download resources to. Defaults to None.
+            cache_folder: Folder for cache of files keyed by hash. Defaults to None.
+            verify: Whether to check files against size and hash in HDX. Defaults to True.
+            max_workers: Maximum number of threads. Defaults to None (executor default).
+            configuration: HDX configuration. Defaults to configuration of first resource.
+
+        Returns:
+            List of (URL downloaded, Path to downloaded file) in order of resources
+        """
+        if not resources:
+            return []
+        if configuration is None:
+            configuration = resources[0].configuration
+
+        def download(resource: "Resource") -> tuple[str, Path]:
+            with configuration.get_downloader() as downloader:
+                return resource._download(downloader, folder, cache_folder, verify)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(download, resources))
+
+    def _iter_datastore_pages(
+        self, resource_id: str, page_size: int, **kwargs: Any
+    ) -> Iterator[list[dict]]:
+        """Page through a datastore table with datastore_search using limit and
+        offset, yielding the records of each page. Paging stops on an empty page
+        or once the total number of records has been read. An HDXError is raised
+        if any page fails to be read so that results are never silently
+        truncated.
+
+        Args:
+            resource_id: Id of resource or datastore table
+            page_size: Number of records to request per page
+            **kwargs: Other fields to pass to datastore_search eg. filters
+
+        Returns:
+            Iterator of lists of records
+        """
+        offset = 0
+        while True:
+            success, result = self._read_from_hdx(
+                "datastore",
+                resource_id,
+                "resource_id",
+                self.actions()["datastore_search"],
+                limit=page_size,
+                offset=offset,
+                **kwargs,
+            )
+            if not success:
+                raise HDXError(
+                    f"Failed to read datastore {resource_id} at offset {offset}: {result}"
+                )
+            records = result["records"]
+            if not records:
+                return
+            yield records
+            # The server may cap the page size below limit so advance by the
+            # number of records actually returned
+            offset += len(records)
+            total = result.get("total")
+            if total is not None and offset >= total:
+                return
 
     @staticmethod
     def get_all_resource_ids_in_datastore(
         configuration: Configuration | None = None,
+        page_size: int = 10000,
     ) -> list[str]:
-        """Get list of resources that have a datastore returning their ids.
+        """Get list of resources that have a datastore returning their ids. As
+        before paging was added, an empty list is returned if the first page
+        cannot be read, but an HDXError is raised if a later page cannot be read
+        so that the list is never silently truncated.
 
         Args:
             configuration: HDX configuration. Defaults to global configuration.
+            page_size: Number of datastore tables to request per call. Defaults to 10000.
 
         Returns:
             List of resource ids that are in the datastore
         """
         resource = Resource(configuration=configuration)
-        success, result = resource._read_from_hdx(
-            "datastore",
-            "_table_metadata",
-            "resource_id",
-            Resource.actions()["datastore_search"],
-            limit=10000,
-        )
         resource_ids = []
-        if not success:
-            logger.debug(result)
-        else:
-            for record in result["records"]:
-                resource_ids.append(record["name"])
+        try:
+            for records in resource._iter_datastore_pages("_table_metadata", page_size):
+                for record in records:
+                    resource_ids.append(record["name"])
+        except HDXError as ex:
+            if resource_ids:
+                raise
+            logger.debug(ex)
         return resource_ids
 
+    def iter_datastore_records(
+        self,
+        filters: dict | None = None,
+        fields: Sequence[str] | None = None,
+        page_size: int = 10000,
+        sort: str | None = "_id",
+        batch_format: str | None = None,
+    ) -> Iterator[dict | list[dict] | Any]:
+        """Iterate over the rows in the resource's datastore, requesting them in
+        pages from datastore_search so that memory use does not depend on the size
+        of the table. Pages are requested using limit and offset and are sorted by
+        _id by default so that paging is stable.
+
+        By default, each row is yielded as a dictionary. If batch_format is
+        "list", the rows of each page are yielded as a list and if it is "arrow",
+        as a pyarrow RecordBatch (which requires pyarrow to be installed).
+
+        Args:
+            filters: Dictionary of field to value to match. Defaults to None.
+            fields: Fields to return. Defaults to None (all fields).
+            page_size: Number of rows to request per page. Defaults to 10000.
+            sort: Sort order passed to datastore_search. Defaults to "_id".
+            batch_format: None, "list" or "arrow". Defaults to None (yield rows).
+
+        Returns:
+            Iterator of rows or batches of rows
+        """
+        if batch_format not in (None, "list", "arrow"):
+            raise HDXError(f"Invalid batch format {batch_format}!")
+        if batch_format == "arrow":
+            try:
+                import pyarrow
+            except ImportError as e:
+                raise HDXError(
+                    "pyarrow must be installed to return arrow batches!"
+                ) from e
+        kwargs = {}
+        if filters:
+            kwargs["filters"] = filters
+        if fields:
+            kwargs["fields"] = list(fields)
+        if sort:
+            kwargs["sort"] = sort
+        for records in self._iter_datastore_pages(self.data["id"], page_size, **kwargs):
+            if batch_format is None:
+                yield from records
+            elif batch_format == "list":
+                yield records
+            else:
+                yield pyarrow.RecordBatch.from_pylist(records)
+
+    @staticmethod
+    def infer_datastore_schema(
+        headers: Sequence[str], rows: Iterable[Sequence]
+    ) -> list[dict]:
+        """Infer a datastore schema from headers and rows in list form. Each column
+        is given the CKAN type int, numeric or timestamp if all of its non empty
+        values can be interpreted as that type and text otherwise.
+
+        Args:
+            headers: Headers
+            rows: Rows in list form
+
+        Returns:
+            List of fields of form {"id": header, "type": type}
+        """
+
+        def get_type(value: Any) -> str | None:
+            if value is None or value == "":
+                return None
+            if isinstance(value, bool):
+                return "text"
+            if isinstance(value, int):
+                return "int" if -(2**31) <= value < 2**31 else "numeric"
+            if isinstance(value, float):
+                return "numeric"
+            if isinstance(value, (date, datetime)):
+                return "timestamp"
+            value = str(value).strip()
+            if len(value) > 1 and value.lstrip("+-").startswith("0"):
+                # Codes like 01 would lose their leading zeros as numbers
+                if not value.lstrip("+-").startswith("0."):
+                    return "text"
+            try:
+                return get_type(int(value))
+            except ValueError:
+                pass
+            try:
+                float(value)
+                return "numeric"
+            except ValueError:
+                pass
+            try:
+                datetime.fromisoformat(value)
+                return "timestamp"
+            except ValueError:
+                return "text"
+
+        promotions = {
+            frozenset(("int", "numeric")): "numeric",
+        }
+        types = [None] * len(headers)
+        for row in rows:
+            for i, value in enumerate(row[: len(headers)]):
+                current = types[i]
+                if current == "text":
+                    continue
+                valuetype = get_type(value)
+                if valuetype is None or valuetype == current:
+                    continue
+                if current is None:
+                    types[i] = valuetype
+                else:
+                    types[i] = promotions.get(frozenset((current, valuetype)), "text")
+        return [
+            {"id": header, "type": types[i] or "text"}
+            for i, header in enumerate(headers)
+        ]
+
+    def _datastore_upsert_batch(
+        self, method: str, records: list[dict], retries: int, retry_delay: float
+    ) -> int:
+        """Send a batch of records to the datastore, retrying on failure after
+        waiting retry_delay seconds, doubling the wait for each further retry
+
+        Args:
+            method: Method to use: insert or upsert
+            records: Records to send
+            retries: Number of times to retry a failed batch
+            retry_delay: Seconds to wait before the first retry
+
+        Returns:
+            Number of records sent
+        """
+        data = {
+            "resource_id": self.data["id"],
+            "force": True,
+            "method": method,
+            "records": records,
+        }
+        for attempt in range(retries + 1):
+            try:
+                self._write_to_hdx("datastore_upsert", data, "resource_id")
+                return len(records)
+            except HDXError:
+                if attempt == retries:
+                    raise
+                delay = retry_delay * 2**attempt
+                logger.warning(
+                    f"Datastore {method} of {len(records)} records into {self.data['id']} failed. Retrying in {delay} seconds."
+                )
+                sleep(delay)
+
+    def datastore_upsert_from_iterable(
+        self,
+        rows: Iterable[Sequence | Mapping],
+        headers: int | Sequence[str] | None = None,
+        schema: Sequence[dict] | None = None,
+        primary_key: str | Sequence[str] | None = None,
+        create: bool = True,
+        infer_rows: int = 1000,
+        batch_size: int = 10000,
+        max_workers: int = 1,
+        retries: int = 2,
+        retry_delay: float = 1,
+    ) -> int:
+        """Load rows into the resource's datastore. The rows are consumed lazily and
+        sent to datastore_upsert in batches of batch_size. Headers are interpreted as
+        in Dataset.generate_resource: for rows in list form, headers can be a list of
+        headers or the number of the row containing the headers (defaulting to the
+        first row) and for rows in dict form, the headers default to the keys of the
+        first row.
+
+        If create is True, the datastore table is created first with datastore_create
+        using schema or if schema is not supplied, a schema inferred from the first
+        infer_rows rows. If a primary key is given, rows are upserted, otherwise they
+        are inserted. Each batch is retried up to retries times with exponential
+        backoff starting at retry_delay seconds. If max_workers is more than 1,
+        batches are sent in parallel and may complete in any order.
+
+        Args:
+            rows: Rows in dict or list form
+            headers: List of headers or row number of headers. Defaults to None.
+            schema: List of fields of form {"id": header, "type": type}. Defaults to None (infer).
+            primary_key: Primary key field(s). Defaults to None.
+            create: Whether to create the datastore table first. Defaults to True.
+            infer_rows: Number of rows from which to infer schema. Defaults to 1000.
+            batch_size: Number of rows to send per call. Defaults to 10000.
+            max_workers: Number of batches to send in parallel. Defaults to 1.
+            retries: Number of times to retry a failed batch. Defaults to 2.
+            retry_delay: Seconds to wait before retrying, doubled for each further retry. Defaults to 1.
+
+        Returns:
+            Number of rows loaded
+        """
+        headers, rows = get_headers_and_rows(rows, headers)
+        if create:
+            if schema is None:
+                first_rows = list(islice(rows, infer_rows))
+                schema = self.infer_datastore_schema(headers, first_rows)
+                rows = chain(first_rows, rows)
+            data = {
+                "resource_id": self.data["id"],
+                "force": True,
+                "fields": list(schema),
+            }
+            if primary_key:
+                data["primary_key"] = primary_key
+            self._write_to_hdx("datastore_create", data, "resource_id")
+        method = "upsert" if primary_key else "insert"
+
+        def get_value(value: Any) -> Any:
+            if isinstance(value, (date, datetime)):
+                return value.isoformat()
+            if value == "":
+                return None
+            return value
+
+        def get_batches() -> Iterator[list[dict]]:
+            while batch := list(islice(rows, batch_size)):
+                yield [
+                    {header: get_value(value) for header, value in zip(headers, row)}
+                    for row in batch
+                ]
+
+        if max_workers <= 1:
+            return sum(
+                self._datastore_upsert_batch(method, records, retries, retry_delay)
+                for records in get_batches()
+            )
+        total = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = set()
+            for records in get_batches():
+                if len(futures) >= max_workers * 2:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    total += sum(future.result() for future in done)
+                futures.add(
+                    executor.submit(
+                        self._datastore_upsert_batch,
+                        method,
+                        records,
+                        retries,
+                        retry_delay,
+                    )
+                )
+            total += sum(future.result() for future in futures)
+        return total
+
+    def datastore_upsert_from_file(
+        self,
+        downloader: BaseDownload,
+        url: Path | str,
+        headers: int | Sequence[str] = 1,
+        schema: Sequence[dict] | None = None,
+        primary_key: str | Sequence[str] | None = None,
+        create: bool = True,
+        infer_rows: int = 1000,
+        batch_size: int = 10000,
+        max_workers: int = 1,
+        retries: int = 2,
+        retry_delay: float = 1,
+        **kwargs: Any,
+    ) -> int:
+        """Load a tabular file given by a path or url into the resource's datastore.
+        The file is read with downloader.get_tabular_rows and the rows are passed to
+        datastore_upsert_from_iterable.
+
+        Args:
+            downloader: A Download or Retrieve object
+            url: Path or URL of file to load
+            headers: Number of row(s) containing headers or list of headers. Defaults to 1.
+            schema: List of fields of form {"id": header, "type": type}. Defaults to None (infer).
+            primary_key: Primary key field(s). Defaults to None.
+            create: Whether to create the datastore table first. Defaults to True.
+            infer_rows: Number of rows from which to infer schema. Defaults to 1000.
+            batch_size: Number of rows to send per call. Defaults to 10000.
+            max_workers: Number of batches to send in parallel. Defaults to 1.
+            retries: Number of times to retry a failed batch. Defaults to 2.
+            retry_delay: Seconds to wait before retrying, doubled for each further retry. Defaults to 1.
+            **kwargs: Any additional args to pass to downloader.get_tabular_rows
+
+        Returns:
+            Number of rows loaded
+        """
+        headers, iterator = downloader.get_tabular_rows(
+            url, headers=headers, dict_form=False, **kwargs
+        )
+        return self.datastore_upsert_from_iterable(
+            iterator,
+            headers,
+            schema=schema,
+            primary_key=primary_key,
+            create=create,
+            infer_rows=infer_rows,
+            batch_size=batch_size,
+            max_workers=max_workers,
+            retries=retries,
+            retry_delay=retry_delay,
+        )
+
     def has_datastore(self) -> bool:
         """Check if the resource has a datastore.
 
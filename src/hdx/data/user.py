@@ -1,7 +1,7 @@
 """User class containing all logic for creating, checking, and updating users."""
 
 import logging
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from pathlib import Path
 from typing import Any, Optional
 
@@ -27,8 +27,64 @@ class User(HDXObject):
     ) -> None:
         if not initial_data:
             initial_data = {}
+        self._summary = False
         super().__init__(initial_data, configuration=configuration)
 
+    def __getitem__(self, key: Any) -> Any:
+        if self._summary and key not in self.data:
+            self.load_full_profile()
+        return super().__getitem__(key)
+
+    def __contains__(self, key: Any) -> bool:
+        if self._summary and key not in self.data:
+            self.load_full_profile()
+        return key in self.data
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self.data[key]
+        return default
+
+    @classmethod
+    def from_summary(
+        cls, summary: dict, configuration: Configuration | None = None
+    ) -> "User":
+        """Create User object from summary user metadata like that embedded in an
+        organization without reading from HDX. The full user profile is read from
+        HDX the first time a field that is not in the summary is accessed.
+
+        Args:
+            summary: Summary user metadata dictionary
+            configuration: HDX configuration. Defaults to global configuration.
+
+        Returns:
+            User object
+        """
+        user = cls(dict(summary), configuration=configuration)
+        user._summary = True
+        return user
+
+    def load_full_profile(self) -> bool:
+        """Read the full user profile from HDX if the User object was created from
+        summary metadata. The capacity (which comes from users from Organization)
+        is kept.
+
+        Returns:
+            True if loaded, False if not
+        """
+        if not self._summary:
+            return False
+        self._summary = False
+        identifier = self.data.get("id")
+        if identifier is None:
+            identifier = self.data["name"]
+        capacity = self.data.get("capacity")
+        if not self._load_from_hdx("user", identifier):
+            return False
+        if capacity is not None:
+            self.data["capacity"] = capacity
+        return True
+
     @staticmethod
     def actions() -> dict[str, str]:
         """Dictionary of actions that can be performed on object
@@ -207,6 +263,32 @@ class User(HDXObject):
             logger.debug(result)
         return users
 
+    @staticmethod
+    def iter_all_users(
+        configuration: Configuration | None = None,
+        page_size: int = 1000,
+        **kwargs: Any,
+    ) -> Iterator["User"]:
+        """Iterate over all users in HDX, requesting them in pages so that memory
+        use does not depend on the number of users. Each User object is only
+        created when it is reached.
+
+        Args:
+            configuration: HDX configuration. Defaults to global configuration.
+            page_size: Number of users to request per page. Defaults to 1000.
+            **kwargs: See below
+            q (str): Restrict to names containing a string. Defaults to all users.
+            order_by (str): Field by which to sort - any user field or edits (number_of_edits). Defaults to 'name'.
+            limit (int): Number of users to return. Defaults to all users.
+            offset (int): Offset in the complete result for where the set of returned users should begin
+
+        Returns:
+            Iterator of all users in HDX
+        """
+        user = User(configuration=configuration)
+        for userdict in user._iter_list_from_hdx(page_size, kwargs):
+            yield User(userdict, configuration=configuration)
+
     @staticmethod
     def email_users(
         users: Sequence["User"],
@@ -4,10 +4,9 @@ import logging
 from collections import OrderedDict
 from collections.abc import Sequence
 from pathlib import Path
+from threading import Lock
 from typing import Any, Optional
 
-from hdx.utilities.downloader import Download
-
 from hdx.api.configuration import Configuration
 from hdx.data.hdxobject import HDXObject
 
@@ -29,7 +28,9 @@ class Vocabulary(HDXObject):
     """
 
     _approved_vocabulary = None
+    _approved_vocabulary_lock = Lock()
     _tags_dict = None
+    _tags_lock = Lock()
 
     def __init__(
         self,
@@ -225,12 +226,14 @@ class Vocabulary(HDXObject):
             HDX Vocabulary object
         """
         if cls._approved_vocabulary is None:
-            if configuration is None:
-                configuration = Configuration.read()
-            vocabulary_name = configuration["approved_tags_vocabulary"]
-            cls._approved_vocabulary = Vocabulary.read_from_hdx(
-                vocabulary_name, configuration=configuration
-            )
+            with cls._approved_vocabulary_lock:
+                if cls._approved_vocabulary is None:
+                    if configuration is None:
+                        configuration = Configuration.read()
+                    vocabulary_name = configuration["approved_tags_vocabulary"]
+                    cls._approved_vocabulary = Vocabulary.read_from_hdx(
+                        vocabulary_name, configuration=configuration
+                    )
         return cls._approved_vocabulary
 
     @classmethod
@@ -249,9 +252,7 @@ class Vocabulary(HDXObject):
         Returns:
             List of approved tags
         """
-        with Download(
-            full_agent=configuration.get_user_agent(), use_env=False
-        ) as downloader:
+        with configuration.get_downloader() as downloader:
             if url is None:
                 url = configuration["tags_list_url"]
             return list(
@@ -385,22 +386,23 @@ class Vocabulary(HDXObject):
         Returns:
             Returns Tags dictionary
         """
-        if not cls._tags_dict:
+        if cls._tags_dict:
+            return cls._tags_dict
+        with cls._tags_lock:
+            if cls._tags_dict:
+                return cls._tags_dict
             if configuration is None:
                 configuration = Configuration.read()
-            with Download(
-                full_agent=configuration.get_user_agent(),
-                use_env=False,
-            ) as downloader:
+            with configuration.get_downloader() as downloader:
                 if url is None:
                     url = configuration["tags_mapping_url"]
-                cls._tags_dict = downloader.download_tabular_rows_as_dicts(
+                tags_dict = downloader.download_tabular_rows_as_dicts(
                     url, keycolumn=keycolumn
                 )
-                keys = cls._tags_dict.keys()
+                keys = tags_dict.keys()
                 chainerror = False
                 for i, tag in enumerate(keys):
-                    whattodo = cls._tags_dict[tag]
+                    whattodo = tags_dict[tag]
                     final_tags = whattodo["New Tag(s)"]
                     if final_tags is None:
                         continue
@@ -409,7 +411,7 @@ class Vocabulary(HDXObject):
                         if final_tag in keys:
                             index = list(keys).index(final_tag)
                             if index != i:
-                                whattodo2 = cls._tags_dict[final_tag]
+                                whattodo2 = tags_dict[final_tag]
                                 action2 = whattodo2["Action to Take"]
                                 if action2 != "ok" and action2 != "other":
                                     final_tags2 = whattodo2["New Tag(s)"]
@@ -420,6 +422,7 @@ class Vocabulary(HDXObject):
                                                 f"Chained rules: {action} ({tag} -> {final_tags}) | {action2} ({final_tag} -> {final_tags2})"
                                             )
 
+                cls._tags_dict = tags_dict
                 if failchained and chainerror:
                     raise ChainRuleError("Chained rules for tags detected!")
         return cls._tags_dict
@@ -0,0 +1,101 @@
+"""Bulk Runner Tests"""
+
+import json
+from threading import Lock
+
+import pytest
+
+from hdx.api.bulk import BulkRunner
+from hdx.data.dataset import Dataset
+from hdx.data.hdxobject import HDXError
+
+
+class TestBulkRunner:
+    @pytest.fixture(scope="function")
+    def calls(self):
+        calls = []
+        lock = Lock()
+
+        class MyDataset(Dataset):
+            def create_in_hdx(self, **kwargs):
+                with lock:
+                    calls.append(("create", self["name"], kwargs))
+                if self["name"] == "fail" and not self.get("fixed"):
+                    raise HDXError("Failed!")
+                return {f"{self['name']} resource": 2}
+
+            def update_in_hdx(self, **kwargs):
+                with lock:
+                    calls.append(("update", self["name"], kwargs))
+                return {}
+
+        return MyDataset, calls
+
+    def test_run(self, configuration, tmp_path, calls):
+        MyDataset, calls = calls
+        checkpoint_path = tmp_path / "checkpoint.jsonl"
+        datasets = [MyDataset({"name": name}) for name in ("a", "fail", "b")]
+        datasets.append(("c", lambda: MyDataset({"name": "c"})))
+        runner = BulkRunner(
+            checkpoint_path, max_workers=2, updated_by_script="test script"
+        )
+        summary = runner.run(datasets)
+        batch = summary["batch"]
+        assert summary["succeeded"] == {
+            "a": {"a resource": 2},
+            "b": {"b resource": 2},
+            "c": {"c resource": 2},
+        }
+        assert summary["failed"] == {"fail": "Failed!"}
+        assert summary["skipped"] == []
+        assert len(calls) == 4
+        for operation, _, kwargs in calls:
+            assert operation == "create"
+            assert kwargs == {"batch": batch, "updated_by_script": "test script"}
+        with open(checkpoint_path) as f:
+            entries = [json.loads(line) for line in f]
+        assert entries[0] == {"batch": batch}
+        assert len(entries) == 5
+        assert runner.read_checkpoint() == (batch, {"a", "b", "c"})
+
+        # Resume after a crash mid-write with the failed dataset fixed
+        with open(checkpoint_path, "a") as f:
+            f.write('{"name": "d", "outc')
+        calls.clear()
+        datasets[1]["fixed"] = True
+        summary = BulkRunner(checkpoint_path).run(datasets)
+        assert summary == {
+            "batch": batch,
+            "succeeded": {"fail": {"fail resource": 2}},
+            "failed": {},
+            "skipped": ["a", "b", "c"],
+        }
+        assert calls == [("create", "fail", {"batch": batch})]
+        assert BulkRunner(checkpoint_path).read_checkpoint() == (
+            batch,
+            {"a", "b", "c", "fail"},
+        )
+
+        calls.clear()
+        runner = BulkRunner(tmp_path / "checkpoint2.jsonl", operation="update")
+        summary = runner.run(datasets[:1])
+        assert summary["succeeded"] == {"a": {}}
+        assert calls == [("update", "a", {"batch": summary["batch"]})]
+        assert summary["batch"] != batch
+
+        calls.clear()
+        runner = BulkRunner(tmp_path / "checkpoint3.jsonl")
+        summary = runner.run([MyDataset({"title": "No name"}), ("", MyDataset)])
+        assert summary["failed"] == {
+            "unnamed dataset 0": "Dataset has no name!",
+            "unnamed dataset 1": "Dataset has no name!",
+        }
+        assert summary["succeeded"] == {}
+        assert calls == []
+        assert runner.read_checkpoint() == (summary["batch"], set())
+
+    def test_errors(self, tmp_path):
+        with pytest.raises(HDXError):
+            BulkRunner(tmp_path / "checkpoint.jsonl", operation="delete")
+        with pytest.raises(HDXError):
+            BulkRunner(tmp_path / "checkpoint.jsonl", batch="1234")
@@ -1,11 +1,18 @@
 """Configuration Tests"""
 
+import json
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
 import pytest
 from hdx.utilities.loader import LoadError
 from hdx.utilities.useragent import UserAgentError
+from requests import Request
 
+from .. import MockResponse, resultgroups
 from hdx.api import __version__
 from hdx.api.configuration import Configuration, ConfigurationError
+from hdx.api.locations import Locations
 from hdx.api.remotehdx import RemoteHDX
 
 
@@ -806,6 +813,84 @@ hello there"""
         configuration.set_read_only(False)
         assert configuration.get_api_key() == "NEW API KEY"
 
+    def test_download_session(self):
+        Configuration._create(
+            user_agent="test",
+            hdx_site="prod",
+            hdx_key="TEST_HDX_KEY",
+            hdx_base_config_dict={},
+            project_config_dict={"download_pool_maxsize": 20},
+        )
+        configuration = Configuration.read()
+        session = configuration.get_download_session()
+        assert configuration.get_download_session() is session
+        assert session.get_adapter("https://test.org")._pool_maxsize == 20
+        assert "Authorization" not in session.headers
+        request = session.prepare_request(
+            Request("GET", "https://data.humdata.org/dataset/test")
+        )
+        assert request.headers["Authorization"] == "TEST_HDX_KEY"
+        request = session.prepare_request(Request("GET", "https://test.org/test.csv"))
+        assert "Authorization" not in request.headers
+        with configuration.get_downloader() as downloader:
+            assert downloader.session is session
+        configuration.close_download_session()
+        assert configuration.get_download_session() is not session
+
+    def test_call_remoteckan_single_flight(self, configuration):
+        configuration = Configuration.read()
+        single_flight = configuration._single_flight
+        urls = []
+        wait_for_waiters = [False]
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                urls.append(url)
+                if wait_for_waiters[0]:
+                    for _ in range(1000):
+                        calls = list(single_flight._calls.values())
+                        if calls and calls[0].waiters == 2:
+                            break
+                        sleep(0.001)
+                result = json.dumps(resultgroups)
+                return MockResponse(
+                    200,
+                    f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=group_list"}}',
+                )
+
+        configuration.remoteckan().session = MockSession()
+        assert Configuration.is_read_action("package_show") is True
+        assert Configuration.is_read_action("datastore_search") is True
+        assert Configuration.is_read_action("package_update") is False
+        assert Configuration.is_read_action(None) is False
+        validlocations = Locations._validlocations
+        Locations.set_validlocations(None)
+        try:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [executor.submit(Locations.validlocations) for _ in range(3)]
+                results = [future.result() for future in futures]
+        finally:
+            Locations.set_validlocations(validlocations)
+        assert len(urls) == 1
+        assert results[0] == resultgroups
+        wait_for_waiters[0] = True
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(
+                    configuration.call_remoteckan, "group_list", {"all_fields": True}
+                )
+                for _ in range(3)
+            ]
+            results = [future.result() for future in futures]
+        assert len(urls) == 2
+        assert all(result == resultgroups for result in results)
+        assert results[0] is not results[1]
+        wait_for_waiters[0] = False
+        configuration.call_remoteckan("package_patch", {"id": "a"})
+        configuration.call_remoteckan("package_patch", {"id": "a"})
+        assert len(urls) == 4
+
     def test_env_vars(self, monkeypatch):
         hdx_url = "https://testurl"
         hdx_key = "TEST_HDX_KEY"
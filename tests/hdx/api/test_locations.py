@@ -4,6 +4,7 @@ from hdx.location.country import Country
 
 from hdx.api.configuration import Configuration
 from hdx.api.locations import Locations
+from hdx.api.utilities.location_matcher import LocationMatcher
 
 
 class MyConfiguration:
@@ -77,3 +78,31 @@ class TestHDXLocations:
             True,
         )
         assert Locations.get_location_from_HDX_code("zaf") == "South Africa"
+
+    def test_matcher_per_list(self, monkeypatch):
+        built = []
+
+        class RecordingMatcher(LocationMatcher):
+            def __init__(self, locations):
+                built.append(locations)
+                super().__init__(locations)
+
+        monkeypatch.setattr("hdx.api.locations.LocationMatcher", RecordingMatcher)
+        monkeypatch.setattr(Locations, "_matchers", {})
+        locations1 = [{"name": "zmb", "title": "Zambia"}]
+        locations2 = [{"name": "pry", "title": "Paraguay"}]
+        for _ in range(3):
+            assert Locations.get_HDX_code_from_location_partial(
+                "ZAM", locations=locations1
+            ) == ("ZMB", False)
+            assert Locations.get_HDX_code_from_location_partial(
+                "PARA", locations=locations2
+            ) == ("PRY", False)
+        assert built == [locations1, locations2]
+        # A list that is changed in place gets a new matcher
+        locations1.append({"name": "pry", "title": "Paraguay"})
+        assert Locations.get_HDX_code_from_location_partial(
+            "PARA", locations=locations1
+        ) == ("PRY", False)
+        assert len(built) == 3
+        assert len(Locations._matchers) == 2
@@ -16,6 +16,7 @@ from ... import MockResponse, dataset_resultdict
 from ...data.test_resource import resultdict
 from hdx.api.configuration import Configuration
 from hdx.api.utilities.hdx_state import HDXState
+from hdx.data.resource import Resource
 
 
 class TestState:
@@ -92,8 +93,24 @@ class TestState:
         Configuration.read().remoteckan().session = MockSession()
 
     def test_state(
-        self, tempfolder, statefolder, statefile, date1, date2, configuration, do_state
+        self,
+        tempfolder,
+        statefolder,
+        statefile,
+        date1,
+        date2,
+        configuration,
+        do_state,
+        monkeypatch,
     ):
+        updates = []
+        update_in_hdx = Resource.update_in_hdx
+
+        def count_update_in_hdx(resource, **kwargs):
+            updates.append(resource["name"])
+            return update_in_hdx(resource, **kwargs)
+
+        monkeypatch.setattr(Resource, "update_in_hdx", count_update_in_hdx)
         if not exists(tempfolder):
             makedirs(tempfolder)
         statepath = tempfolder / statefile
@@ -102,11 +119,13 @@ class TestState:
             "test_dataset", tempfolder, parse_date, iso_string_from_datetime
         ) as state:
             assert state.get() == date1
+        assert updates == []
         with HDXState(
             "test_dataset", tempfolder, parse_date, iso_string_from_datetime
         ) as state:
             assert state.get() == date1
             state.set(date2)
+        assert updates == [statefile]
         with HDXState(
             "test_dataset", tempfolder, parse_date, iso_string_from_datetime
         ) as state:
@@ -0,0 +1,120 @@
+"""JSON Stream Tests"""
+
+import json
+from io import BytesIO
+
+import pytest
+from ckanapi.errors import CKANAPIError, NotFound, ValidationError
+
+from ... import dataset_resultdict
+from hdx.api.configuration import Configuration
+from hdx.api.utilities.json_stream import parse_ckan_response
+from hdx.data.dataset import Dataset
+
+url = "http://test-data.humdata.org/api/action/package_search"
+
+
+def get_response(result):
+    return {
+        "help": "http://test-data.humdata.org/api/3/action/help_show?name=package_search",
+        "success": True,
+        "result": result,
+    }
+
+
+class MockStreamResponse:
+    def __init__(self, text):
+        self.status_code = 200
+        self.raw = BytesIO(text.encode("utf-8"))
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestJSONStream:
+    def test_parse_ckan_response(self):
+        results = [dataset_resultdict, {"name": "b", "num": 1.5, "tags": [[1], {}]}]
+        response = get_response({"count": 2, "results": results, "sort": "score desc"})
+        fileobj = BytesIO(json.dumps(response).encode("utf-8"))
+        result = parse_ckan_response(url, 200, fileobj, "results")
+        assert result["count"] == 2
+        assert "sort" not in result
+        assert next(result["results"]) == dataset_resultdict
+        assert list(result["results"]) == results[1:]
+
+        names = ["a", "b", "c"]
+        fileobj = BytesIO(json.dumps(get_response(names)).encode("utf-8"))
+        assert list(parse_ckan_response(url, 200, fileobj, "")) == names
+
+        response = get_response({"count": 0})
+        fileobj = BytesIO(json.dumps(response).encode("utf-8"))
+        assert parse_ckan_response(url, 200, fileobj, "results") == {"count": 0}
+
+        for error, exception in (
+            ("Not Found Error", NotFound),
+            ("Validation Error", ValidationError),
+        ):
+            response = {
+                "success": False,
+                "error": {"message": "Error", "__type": error},
+            }
+            fileobj = BytesIO(json.dumps(response).encode("utf-8"))
+            with pytest.raises(exception):
+                parse_ckan_response(url, 404, fileobj, "results")
+        with pytest.raises(CKANAPIError):
+            parse_ckan_response(url, 502, BytesIO(b"<html>"), "results")
+        with pytest.raises(CKANAPIError):
+            parse_ckan_response(url, 502, BytesIO(b""), "results")
+
+    def test_streaming(self, configuration):
+        datasetdicts = []
+        for i in range(5):
+            datasetdict = dict(dataset_resultdict)
+            datasetdict["id"] = f"id{i}"
+            datasetdict["name"] = f"name{i}"
+            datasetdicts.append(datasetdict)
+        responses = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, stream, auth=None):
+                datadict = json.loads(data.decode("utf-8"))
+                if "package_search" in url:
+                    start = datadict["start"]
+                    results = datasetdicts[start : start + datadict["rows"]]
+                    result = {"count": len(datasetdicts), "results": results}
+                else:
+                    offset = datadict["offset"]
+                    names = [x["name"] for x in datasetdicts]
+                    result = names[offset : offset + datadict["limit"]]
+                response = MockStreamResponse(json.dumps(get_response(result)))
+                responses.append(response)
+                return response
+
+        configuration = Configuration.read()
+        configuration.remoteckan().session = MockSession()
+        assert configuration.is_json_streaming() is False
+        configuration.enable_json_streaming()
+        try:
+            datasets = Dataset.search_in_hdx("*:*", page_size=2)
+            assert [x["name"] for x in datasets] == [x["name"] for x in datasetdicts]
+            assert len(datasets[0].get_resources()) == 3
+            assert len(responses) == 3
+            names = Dataset.iter_all_dataset_names(page_size=2, start=1)
+            assert list(names) == ["name1", "name2", "name3", "name4"]
+            assert len(responses) == 6
+            names = Dataset.iter_all_dataset_names(page_size=3, limit=2)
+            assert list(names) == ["name0", "name1"]
+            assert len(responses) == 7
+            names = Dataset.iter_all_dataset_names(page_size=3)
+            assert next(names) == "name0"
+            names.close()
+            assert len(responses) == 8
+            datasetdicts.clear()
+            assert Dataset.search_in_hdx("*:*") == []
+            assert len(responses) == 9
+            assert all(response.closed for response in responses)
+        finally:
+            configuration.disable_json_streaming()
+        assert configuration.is_json_streaming() is False
@@ -0,0 +1,50 @@
+"""Location Matcher Tests"""
+
+from hdx.api.utilities.location_matcher import LocationMatcher
+
+
+class TestLocationMatcher:
+    locations = [
+        {"name": "cod", "title": "Democratic Republic of the Congo"},
+        {"name": "cog", "title": "Congo"},
+        {"name": "ner", "title": "Niger"},
+        {"name": "nga", "title": "Nigeria"},
+        {"name": "gnb", "title": "Guinea-Bissau"},
+        {"name": "gin", "title": "Guinea"},
+    ]
+
+    @staticmethod
+    def linear_match(location, locations):
+        locationupper = location.upper()
+        for locdict in locations:
+            locationname = locdict["title"].upper()
+            if locationupper in locationname or locationname in locationupper:
+                return locdict["name"].upper()
+        return None
+
+    def test_match(self):
+        matcher = LocationMatcher(self.locations)
+        assert matcher.is_for(self.locations) is True
+        assert matcher.is_for(list(self.locations)) is False
+        assert matcher.match("congo") == "COD"
+        assert matcher.match("Republic of Congo") == "COG"
+        assert matcher.match("Nige") == "NER"
+        assert matcher.match("Federal Republic of Nigeria") == "NER"
+        assert matcher.match("Guinea") == "GNB"
+        assert matcher.match("Papua New Guinea") == "GIN"
+        assert matcher.match("Zambia") is None
+        for location in (
+            "",
+            "o",
+            "GO",
+            "the Congo, Democratic Republic of",
+            "Democratic Republic of the Congo (DRC)",
+            "Bissau",
+            "Guinea-Bissau and Niger",
+            "Equatorial Guinea",
+            "Niger State, Nigeria",
+            "xyz",
+        ):
+            assert matcher.match(location) == self.linear_match(
+                location, self.locations
+            )
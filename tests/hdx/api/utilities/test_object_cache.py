@@ -0,0 +1,92 @@
+"""Object Cache Tests"""
+
+import json
+
+import pytest
+
+from ... import MockResponse, dataset_mockshow, dataset_resultdict
+from hdx.api.configuration import Configuration
+from hdx.api.utilities.object_cache import ObjectCache, get_identifiers
+from hdx.data.dataset import Dataset
+
+
+class TestObjectCache:
+    @pytest.fixture(scope="function")
+    def urls(self, configuration):
+        urls = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                urls.append(url)
+                datadict = json.loads(data.decode("utf-8"))
+                if "revise" in url:
+                    result = json.dumps({"package": dataset_resultdict})
+                    return MockResponse(
+                        200,
+                        f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=package_revise"}}',
+                    )
+                return dataset_mockshow(url, datadict)
+
+        configuration = Configuration.read()
+        configuration.remoteckan().session = MockSession()
+        configuration.enable_object_cache()
+        yield urls
+        configuration.disable_object_cache()
+
+    def test_get_identifiers(self):
+        identifiers = get_identifiers({"package": dataset_resultdict})
+        assert dataset_resultdict["id"] in identifiers
+        assert dataset_resultdict["name"] in identifiers
+        assert "de6549d8-268b-4dfe-adaf-a4ae5c8510d5" in identifiers
+        assert get_identifiers(["a"]) == set()
+
+    def test_object_cache(self, monkeypatch):
+        cache = ObjectCache(maxsize=2, ttl=10)
+        key1 = cache.get_key("package_show", {"id": "a"})
+        assert key1 == cache.get_key("package_show", {"id": "a"})
+        assert cache.get(key1) == (False, None)
+        result = {"id": "a", "resources": [{"id": "r"}]}
+        cache.set(key1, result)
+        result["name"] = "changed"
+        found, cached = cache.get(key1)
+        assert found is True
+        assert cached == {"id": "a", "resources": [{"id": "r"}]}
+        cached["id"] = "changed"
+        assert cache.get(key1)[1]["id"] == "a"
+        key2 = cache.get_key("package_show", {"id": "b"})
+        cache.set(key2, {"id": "b"})
+        key3 = cache.get_key("resource_show", {"id": "c"})
+        cache.set(key3, {"id": "c", "package_id": "b"})
+        assert len(cache) == 2
+        assert cache.get(key1)[0] is False
+        cache.invalidate(["r"])
+        assert len(cache) == 2
+        cache.invalidate(["b"])
+        assert len(cache) == 0
+        assert cache.hits == 2
+        assert cache.misses == 2
+        cache.set(key1, {"id": "a"})
+        now = cache._cache[key1][1]
+        monkeypatch.setattr("hdx.api.utilities.object_cache.monotonic", lambda: now + 1)
+        assert cache.get(key1)[0] is False
+        cache.clear()
+        assert cache.hits == 0
+        assert cache.misses == 0
+
+    def test_read_from_hdx(self, configuration, urls):
+        cache = Configuration.read().get_object_cache()
+        dataset = Dataset.read_from_hdx("TEST1")
+        dataset["title"] = "Changed"
+        dataset = Dataset.read_from_hdx("TEST1")
+        assert dataset["title"] == dataset_resultdict["title"]
+        assert len(urls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        Dataset.revise({"name": "MyDataset1"}, update={"title": "x"})
+        assert len(urls) == 2
+        Dataset.read_from_hdx("TEST1")
+        assert len(urls) == 3
+        assert (cache.hits, cache.misses) == (1, 2)
+        Configuration.read().disable_object_cache()
+        Dataset.read_from_hdx("TEST1")
+        assert len(urls) == 4
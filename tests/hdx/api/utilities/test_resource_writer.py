@@ -0,0 +1,118 @@
+"""Resource Writer Tests"""
+
+import csv
+import gzip
+
+import pytest
+from hdx.utilities.file_hashing import get_size_and_hash
+from hdx.utilities.path import temp_dir
+
+from hdx.api.utilities.resource_writer import ResourceWriter, get_headers_and_rows
+from hdx.data.dataset import Dataset
+
+
+class TestResourceWriter:
+    rows = [
+        {"country": "Algeria", "year": "2001", "value": 1},
+        {"country": "Algeria", "year": "2002", "value": None},
+        {"country": "Niger", "year": "2002", "value": 3},
+    ]
+    expected_rows = [
+        ["country", "year", "value"],
+        ["Algeria", "2001", "1"],
+        ["Algeria", "2002", ""],
+        ["Niger", "2002", "3"],
+    ]
+
+    def test_registry(self):
+        assert ResourceWriter.has_writer("csv") is False
+        assert ResourceWriter.has_writer("CSV.GZ") is True
+        assert ResourceWriter.get_hdx_format("csv") == "csv"
+        assert ResourceWriter.get_hdx_format("csv.gz") == "csv"
+        assert ResourceWriter.get_hdx_format("parquet") == "parquet"
+
+    def test_get_headers_and_rows(self):
+        headers, rows = get_headers_and_rows(self.rows)
+        assert headers == ["country", "year", "value"]
+        assert list(rows) == [
+            ["Algeria", "2001", 1],
+            ["Algeria", "2002", None],
+            ["Niger", "2002", 3],
+        ]
+        rows = [["x"], ["a", "b"], ["1", "2"]]
+        headers, iterator = get_headers_and_rows(rows, 2)
+        assert headers == ["a", "b"]
+        assert list(iterator) == [["1", "2"]]
+        headers, iterator = get_headers_and_rows(rows[1:], ["c", "d"])
+        assert headers == ["c", "d"]
+        assert list(iterator) == [["a", "b"], ["1", "2"]]
+        assert get_headers_and_rows([], 1)[0] == []
+
+    def test_stream_iterable_csv_gz(self):
+        with temp_dir("test_resource_writer") as folder:
+            filepath = folder / "test.csv.gz"
+            rows_written = []
+            row_count, headers = ResourceWriter.stream_iterable(
+                filepath,
+                iter(self.rows),
+                format="csv.gz",
+                rows_written=rows_written,
+            )
+            assert row_count == 3
+            assert headers is None
+            assert rows_written == self.rows
+            with gzip.open(filepath, "rt", newline="") as textfile:
+                assert list(csv.reader(textfile)) == self.expected_rows
+            size, hash = get_size_and_hash(filepath, "csv")
+            ResourceWriter.stream_iterable(filepath, self.rows, format="csv.gz")
+            assert get_size_and_hash(filepath, "csv") == (size, hash)
+
+    def test_stream_iterable_arrow(self, monkeypatch):
+        ipc = pytest.importorskip("pyarrow.ipc")
+        parquet = pytest.importorskip("pyarrow.parquet")
+
+        monkeypatch.setattr(ResourceWriter, "batch_size", 2)
+        with temp_dir("test_resource_writer") as folder:
+            filepath = folder / "test.parquet"
+            row_count, _ = ResourceWriter.stream_iterable(
+                filepath, self.rows, format="parquet"
+            )
+            assert row_count == 3
+            table = parquet.read_table(filepath)
+            assert table.column_names == ["country", "year", "value"]
+            assert table.column("value").to_pylist() == ["1", None, "3"]
+            assert {str(field.type) for field in table.schema} == {"string"}
+            filepath = folder / "test.arrow"
+            row_count, _ = ResourceWriter.stream_iterable(
+                filepath, self.rows, format="arrow"
+            )
+            assert row_count == 3
+            with ipc.open_file(filepath) as reader:
+                assert reader.num_record_batches == 2
+                table = reader.read_all()
+            assert table.column("country").to_pylist() == [
+                "Algeria",
+                "Algeria",
+                "Niger",
+            ]
+
+    def test_generate_resource_csv_gz(self, configuration):
+        with temp_dir("test_resource_writer") as folder:
+            dataset = Dataset()
+            success, results = dataset.generate_resource(
+                folder,
+                "test.csv.gz",
+                self.rows,
+                {"name": "test", "description": "Test"},
+                format="csv.gz",
+                yearcol="year",
+            )
+            assert success is True
+            assert results["rows"] == self.rows
+            resource = dataset.get_resource()
+            assert resource["format"] == "csv"
+            assert resource.get_file_to_upload() == folder / "test.csv.gz"
+            assert (
+                dataset["dataset_date"]
+                == "[2001-01-01T00:00:00 TO 2002-12-31T23:59:59]"
+            )
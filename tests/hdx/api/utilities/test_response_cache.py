@@ -0,0 +1,137 @@
+"""Response Cache Tests"""
+
+import json
+
+import pytest
+from hdx.utilities.path import temp_dir
+
+from ... import MockResponse, dataset_mockshow, dataset_resultdict
+from hdx.api.configuration import Configuration
+from hdx.api.utilities.response_cache import ResponseCache
+from hdx.data.dataset import Dataset
+
+
+class TestResponseCache:
+    @pytest.fixture(scope="function")
+    def urls(self, configuration):
+        urls = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                urls.append(url)
+                datadict = json.loads(data.decode("utf-8"))
+                if "revise" in url:
+                    result = json.dumps({"package": dataset_resultdict})
+                    return MockResponse(
+                        200,
+                        f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=package_revise"}}',
+                    )
+                return dataset_mockshow(url, datadict)
+
+        Configuration.read().remoteckan().session = MockSession()
+        return urls
+
+    def test_response_cache(self, monkeypatch):
+        with temp_dir("test_response_cache") as folder:
+            path = folder / "responses.sqlite"
+            with ResponseCache(
+                path, ttls={"package_show": 10, "user_show": 0}, max_entries=2
+            ) as cache:
+                key1 = cache.get_key("https://x", "package_show", {"id": "a", "b": 1})
+                assert key1 == cache.get_key(
+                    "https://x", "package_show", {"b": 1, "id": "a"}
+                )
+                assert cache.get(key1) == (False, None)
+                cache.set(key1, "package_show", {"id": "a"})
+                assert cache.get(key1) == (True, {"id": "a"})
+                key2 = cache.get_key("https://x", "user_show", {"id": "a"})
+                cache.set(key2, "user_show", {"id": "a"})
+                assert cache.get(key2) == (False, None)
+                key3 = cache.get_key("https://x", "package_show", {"id": "c"})
+                cache.set(key3, "package_show", {"id": "c"})
+                key4 = cache.get_key("https://x", "group_list", {})
+                cache.set(key4, "group_list", [{"name": "afg"}])
+                assert len(cache) == 2
+                assert cache.get(key1) == (False, None)
+                assert cache.get_ttl("group_list") == 3600
+            with ResponseCache(path) as cache:
+                assert cache.get(key4) == (True, [{"name": "afg"}])
+                assert cache.get_ttl("group_list") == 86400
+                now = cache._connection.execute(
+                    "SELECT expiry FROM responses WHERE key = ?", (key3,)
+                ).fetchone()[0]
+                monkeypatch.setattr(
+                    "hdx.api.utilities.response_cache.time", lambda: now + 1
+                )
+                assert cache.get(key3) == (False, None)
+                cache.clear()
+                assert len(cache) == 0
+
+    def test_call_remoteckan(self, configuration, urls):
+        configuration = Configuration.read()
+        with temp_dir("test_response_cache") as folder:
+            configuration.enable_response_cache(folder / "responses.sqlite")
+            try:
+                Dataset.read_from_hdx("TEST1")
+                Dataset.read_from_hdx("TEST1")
+                assert len(urls) == 2
+                configuration.set_read_only(True)
+                dataset = Dataset.read_from_hdx("TEST1")
+                assert dataset["name"] == dataset_resultdict["name"]
+                dataset = Dataset.read_from_hdx("TEST1")
+                assert dataset["name"] == dataset_resultdict["name"]
+                assert len(urls) == 3
+                Dataset.revise({"name": "MyDataset1"}, update={"title": "x"})
+                Dataset.revise({"name": "MyDataset1"}, update={"title": "x"})
+                assert len(urls) == 5
+            finally:
+                configuration.set_read_only(False)
+                configuration.disable_response_cache()
+
+    def test_cache_keyed_on_apikey(
+        self, configuration, urls, hdx_config_yaml, project_config_yaml
+    ):
+        assert ResponseCache.get_key("https://x", "group_list", {}) != (
+            ResponseCache.get_key("https://x", "group_list", {}, "key1")
+        )
+        configuration = Configuration.read()
+        configuration2 = Configuration(
+            user_agent="test",
+            hdx_config_yaml=hdx_config_yaml,
+            project_config_yaml=project_config_yaml,
+        )
+        configuration2.setup_session_remoteckan()
+        configuration2.remoteckan().session = configuration.remoteckan().session
+        with temp_dir("test_response_cache") as folder:
+            path = folder / "responses.sqlite"
+            configuration.enable_response_cache(path)
+            configuration2.enable_response_cache(path)
+            try:
+                configuration.set_read_only(True)
+                configuration2.set_read_only(True)
+                data = {"id": "TEST1"}
+                configuration.call_remoteckan("package_show", data, apikey="key1")
+                configuration.call_remoteckan("package_show", data, apikey="key1")
+                assert len(urls) == 1
+                # The same key from another configuration is served from the cache
+                configuration2.call_remoteckan("package_show", data, apikey="key1")
+                assert len(urls) == 1
+                # A different key or anonymous access is not
+                configuration2.call_remoteckan("package_show", data, apikey="key2")
+                assert len(urls) == 2
+                configuration2.call_remoteckan("package_show", data)
+                assert len(urls) == 3
+                with ResponseCache(path) as cache:
+                    keys = [
+                        row[0]
+                        for row in cache._connection.execute(
+                            "SELECT key FROM responses"
+                        )
+                    ]
+                assert len(keys) == 3
+                assert not any("key1" in key or "key2" in key for key in keys)
+            finally:
+                for config in (configuration, configuration2):
+                    config.set_read_only(False)
+                    config.disable_response_cache()
@@ -0,0 +1,51 @@
+"""Single Flight Tests"""
+
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+import pytest
+
+from hdx.api.utilities.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    @staticmethod
+    def wait_for_waiters(single_flight, key, waiters):
+        while single_flight._calls[key].waiters < waiters:
+            sleep(0.001)
+
+    def test_do(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def function():
+            calls.append(1)
+            self.wait_for_waiters(single_flight, "key", 3)
+            return {"result": [1, 2]}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(single_flight.do, "key", function) for _ in range(4)
+            ]
+            results = [future.result() for future in futures]
+        assert len(calls) == 1
+        assert all(result == {"result": [1, 2]} for result in results)
+        assert len({id(result) for result in results}) == 4
+        assert single_flight._calls == {}
+        assert single_flight.do("key", lambda: 2) == 2
+
+    def test_do_exception(self):
+        single_flight = SingleFlight()
+
+        def function():
+            self.wait_for_waiters(single_flight, "key", 1)
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(single_flight.do, "key", function) for _ in range(2)
+            ]
+            for future in futures:
+                with pytest.raises(ValueError):
+                    future.result()
+        assert single_flight._calls == {}
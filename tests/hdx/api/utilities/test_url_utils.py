@@ -1,7 +1,11 @@
 import pytest
 from requests import RequestException, Session
 
-from hdx.api.utilities.url_utils import follow_url, get_ckan_ready_session
+from hdx.api.utilities.url_utils import (
+    URLResolver,
+    follow_url,
+    get_ckan_ready_session,
+)
 
 
 class TestURLUtils:
@@ -52,16 +56,13 @@ class TestURLUtils:
         with pytest.raises(ValueError, match="Either Session or Configuration"):
             follow_url("http://example.com")
 
-    def test_follow_url_creates_session_if_missing(self, mocker, mock_configuration):
-        """Test that a session is created from config if not provided."""
+    def test_follow_url_uses_download_session_if_missing(self, mock_configuration):
+        """Test that the shared download session is used if not provided."""
         url = "http://example.com/no-match"
-        mock_get_ready = mocker.patch(
-            "hdx.api.utilities.url_utils.get_ckan_ready_session"
-        )
 
         follow_url(url, configuration=mock_configuration)
 
-        mock_get_ready.assert_called_once_with(mock_configuration)
+        mock_configuration.get_download_session.assert_called_once_with()
 
     def test_follow_url_google_sheets_rewrite(self, mock_session):
         # Regex requires 44 chars for the ID
@@ -193,3 +194,43 @@ class TestURLUtils:
         url = "http://example.com/random-page"
         result = follow_url(url, session=mock_session)
         assert result == url
+
+    # --- Tests for URLResolver ---
+
+    def test_url_resolver(self, mocker, mock_session, tmp_path):
+        sheet_id = "a" * 44
+        sheet_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit"
+        drive_url = "https://drive.google.com/open?id=123xyz"
+        fail_url = "https://drive.google.com/open?id=fail"
+        mock_response = mocker.Mock()
+        mock_response.is_redirect = True
+        mock_response.headers = {"Location": "https://drive.google.com/uc?id=123xyz"}
+
+        def head(url):
+            if url == fail_url:
+                raise RequestException("Connection Error")
+            return mock_response
+
+        mock_session.head.side_effect = head
+        mock_time = mocker.patch("hdx.api.utilities.url_utils.time", return_value=0)
+        cache_path = tmp_path / "urls.json"
+        with URLResolver(session=mock_session, ttl=10, cache_path=cache_path) as res:
+            for _ in range(2):
+                assert res.resolve(drive_url) == "https://drive.google.com/uc?id=123xyz"
+                assert res.resolve(sheet_url).endswith("/export?format=csv")
+                assert res.resolve(fail_url) == fail_url
+            assert mock_session.head.call_count == 3
+            mock_time.return_value = 11
+            res.resolve(drive_url)
+            assert mock_session.head.call_count == 4
+        mock_session.head.reset_mock()
+        resolver = URLResolver(session=mock_session, cache_path=cache_path)
+        assert resolver.resolve(drive_url) == "https://drive.google.com/uc?id=123xyz"
+        assert resolver.resolve(sheet_url).endswith("/export?format=csv")
+        assert mock_session.head.call_count == 0
+        mock_time.return_value = 100
+        resolver = URLResolver(session=mock_session, cache_path=cache_path, maxsize=1)
+        resolver.resolve(sheet_url)
+        resolver.resolve(drive_url)
+        assert mock_session.head.call_count == 1
+        assert list(resolver._cache) == [drive_url]
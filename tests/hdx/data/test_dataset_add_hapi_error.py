@@ -5,6 +5,7 @@ import pytest
 
 from .. import MockResponse, dataset_data, dataset_resultdict, resources_data
 from hdx.api.configuration import Configuration
+from hdx.api.utilities.hdx_error_handler import HDXErrorHandler
 from hdx.data.dataset import Dataset
 
 
@@ -67,3 +68,82 @@ class TestDatasetAddHAPIError:
             resource_name="Resource1",
         )
         assert success is True
+
+    @pytest.fixture(scope="function")
+    def hapi_dataset_revise(self):
+        revises = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                if "package_show" in url:
+                    result = json.dumps(dataset_resultdict)
+                    return MockResponse(
+                        200,
+                        f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=package_show"}}',
+                    )
+                if "package_revise" not in url:
+                    return MockResponse(
+                        404,
+                        '{"success": false, "error": {"message": "TEST ERROR: Not revise", "__type": "TEST ERROR: Not Revise Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=package_revise"}',
+                    )
+                revises.append(json.loads(data.decode("utf-8")))
+                result = json.dumps({"package": dataset_resultdict})
+                return MockResponse(
+                    200,
+                    f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=package_revise"}}',
+                )
+
+        Configuration.read().remoteckan().session = MockSession()
+        return revises
+
+    def test_add_hapi_errors(self, configuration, hapi_dataset_revise):
+        dataset = Dataset(copy.deepcopy(dataset_resultdict))
+        success = dataset.add_hapi_errors(
+            {
+                "Resource1": "test message",
+                "3d777226-96aa-4239-860a-703389d16d1f": "test message 2",
+                "Resource9": "unknown resource",
+            }
+        )
+        assert success is True
+        assert len(hapi_dataset_revise) == 1
+        data = hapi_dataset_revise[0]
+        assert json.loads(data["match"]) == {"id": dataset_resultdict["id"]}
+        assert json.loads(
+            data["update__resources__de6549d8-268b-4dfe-adaf-a4ae5c8510d5"]
+        ) == {"qa_hapi_report": "test message"}
+        assert json.loads(
+            data["update__resources__3d777226-96aa-4239-860a-703389d16d1f"]
+        ) == {"qa_hapi_report": "test message 2"}
+        assert dataset.get_resource(0)["qa_hapi_report"] == "test message"
+        success = dataset.add_hapi_errors({"Resource1": "test message"})
+        assert success is False
+        assert len(hapi_dataset_revise) == 1
+
+    def test_write_errors_to_hdx(self, configuration, hapi_dataset_revise):
+        errors = HDXErrorHandler(write_to_hdx=True)
+        errors.add_message(
+            "pipeline1", "MyDataset1", "error b", "Resource1", err_to_hdx=True
+        )
+        errors.add_message(
+            "pipeline2", "MyDataset1", "error a", "Resource1", err_to_hdx=True
+        )
+        errors.add_message(
+            "pipeline1", "MyDataset1", "error c", "Resource2", err_to_hdx=True
+        )
+        assert errors.get_errors_by_dataset() == {
+            "MyDataset1": {
+                "Resource1": {"error a", "error b"},
+                "Resource2": {"error c"},
+            }
+        }
+        errors.write_errors_to_hdx()
+        assert len(hapi_dataset_revise) == 1
+        data = hapi_dataset_revise[0]
+        assert json.loads(
+            data["update__resources__de6549d8-268b-4dfe-adaf-a4ae5c8510d5"]
+        ) == {"qa_hapi_report": "error a, error b"}
+        assert json.loads(
+            data["update__resources__3d777226-96aa-4239-860a-703389d16d1f"]
+        ) == {"qa_hapi_report": "error c"}
@@ -603,6 +603,74 @@ class TestDatasetCore:
             os.remove(file.name)
         # Dataset creates that end up updating are in the test below
 
+    def test_update_in_hdx_assume_current(self, configuration, post_update):
+        session = Configuration.read().remoteckan().session
+        calls = []
+
+        class RecordingSession:
+            @staticmethod
+            def post(url, data, *args, **kwargs):
+                if isinstance(data, dict):
+                    datadict = {
+                        k.decode("utf8"): v.decode("utf8") for k, v in data.items()
+                    }
+                else:
+                    datadict = json.loads(data.decode("utf-8"))
+                calls.append((url, datadict))
+                response = session.post(url, data, *args, **kwargs)
+                if "package_revise" in url:
+                    # Saving the dataset changes metadata_modified
+                    response.text = response.text.replace(
+                        dataset_resultdict["metadata_modified"], metadata_modified
+                    )
+                return response
+
+        metadata_modified = "2016-06-10T10:00:00.000000"
+        Configuration.read().remoteckan().session = RecordingSession()
+        dataset = Dataset.read_from_hdx("TEST1", keep_snapshot=True)
+        calls.clear()
+        dataset["dataset_date"] = "02/26/2016"
+        dataset["id"] = "TEST1"
+        dataset["name"] = "MyDataset1"
+        dataset["groups"] = dataset["groups"][:1]
+        statuses = dataset.update_in_hdx(
+            assume_current=True, create_default_views=False
+        )
+        assert statuses == {"Resource1": 1, "Resource2": 1, "Resource3": 1}
+        assert dataset["dataset_date"] == "02/26/2016"
+        assert not any("package_show" in url for url, _ in calls)
+        url, datadict = next(call for call in calls if "package_revise" in call[0])
+        assert json.loads(datadict["match"]) == {
+            "id": "TEST1",
+            "metadata_modified": dataset_resultdict["metadata_modified"],
+        }
+        update = json.loads(datadict["update"])
+        assert update["dataset_date"] == "02/26/2016"
+        assert json.loads(datadict["filter"]) == ["-groups__1"]
+        assert update["groups"] == dataset_resultdict["groups"][:1]
+        assert len(update["resources"]) == 3
+        assert dataset["metadata_modified"] == metadata_modified
+
+        # A second update uses the metadata as saved by the first
+        calls.clear()
+        dataset["notes"] = "New notes"
+        dataset.update_in_hdx(assume_current=True, create_default_views=False)
+        assert not any("package_show" in url for url, _ in calls)
+        url, datadict = next(call for call in calls if "package_revise" in call[0])
+        assert json.loads(datadict["match"]) == {
+            "id": "TEST1",
+            "metadata_modified": metadata_modified,
+        }
+        assert "filter" not in datadict
+        assert json.loads(datadict["update"])["notes"] == "New notes"
+
+        dataset = Dataset.read_from_hdx("TEST1")
+        with pytest.raises(HDXError):
+            dataset.update_in_hdx(assume_current=True)
+        dataset = Dataset({"id": "TEST1", "name": "MyDataset1"})
+        with pytest.raises(HDXError):
+            dataset.update_in_hdx(assume_current=True)
+
     def test_update_in_hdx(self, configuration, post_update, date_pattern, test_xlsx):
         dataset = Dataset()
         dataset["id"] = "NOTEXIST"
@@ -1234,6 +1302,10 @@ class TestDatasetCore:
         assert dataset_names == dataset_list
         dataset_names = Dataset.get_all_dataset_names(start=3, rows=5)
         assert dataset_names == dataset_list[3:8]
+        dataset_names = Dataset.iter_all_dataset_names(page_size=3)
+        assert list(dataset_names) == dataset_list
+        dataset_names = Dataset.iter_all_dataset_names(page_size=3, start=3, rows=5)
+        assert list(dataset_names) == dataset_list[3:8]
 
     def test_get_all_datasets(self, configuration, all):
         datasets = Dataset.get_all_datasets()
@@ -8,6 +8,7 @@ import pytest
 from hdx.location.country import Country
 from hdx.utilities.path import temp_dir
 from hdx.utilities.saver import save_text
+from requests import Session
 
 from .. import (
     MockResponse,
@@ -31,6 +32,7 @@ from .test_showcase import showcase_resultdict
 from .test_user import user_mockshow
 from .test_vocabulary import vocabulary_mockshow
 from hdx.api.configuration import Configuration
+from hdx.api.utilities.url_utils import URLResolver
 from hdx.data.dataset import Dataset
 from hdx.data.hdxobject import HDXError
 from hdx.data.organization import Organization
@@ -811,6 +813,61 @@ class TestDatasetNoncore:
             dataset = Dataset.load_from_json(path)
             assert dataset is None
 
+    def test_save_to_json_follow_urls(self, configuration, monkeypatch):
+        followed = []
+
+        def follow_url(url, configuration=None, session=None):
+            followed.append(url)
+            return f"{url}?dl=1", True
+
+        monkeypatch.setattr("hdx.api.utilities.url_utils._follow_url", follow_url)
+        dataset = Dataset({"name": "lala", "title": "title", "notes": "description"})
+        for name, url in (
+            ("resource1", "http://lala/1"),
+            ("resource2", "http://lala/2"),
+            ("resource3", "http://lala/1"),
+        ):
+            dataset.add_update_resource(
+                {
+                    "name": name,
+                    "description": "description",
+                    "format": "csv",
+                    "url": url,
+                }
+            )
+        with temp_dir(
+            "SaveDatasetFollowURLs",
+            delete_on_success=True,
+            delete_on_failure=False,
+        ) as temp_folder:
+            path = temp_folder / "dataset.json"
+            dataset.save_to_json(path, follow_urls=True, max_workers=2)
+            assert sorted(followed) == ["http://lala/1", "http://lala/2"]
+            resources = Dataset.load_from_json(path).get_resources()
+            assert [resource["url"] for resource in resources] == [
+                "http://lala/1?dl=1",
+                "http://lala/2?dl=1",
+                "http://lala/1?dl=1",
+            ]
+            followed.clear()
+            for i, url in enumerate(
+                ("http://lala/1", "http://lala/2", "http://lala/1")
+            ):
+                dataset.get_resource(i)["url"] = url
+            resolver = URLResolver(session=Session())
+            dataset.save_to_json(path, follow_urls=True, resolver=resolver)
+            for i, url in enumerate(
+                ("http://lala/1", "http://lala/3", "http://lala/2")
+            ):
+                dataset.get_resource(i)["url"] = url
+            dataset.save_to_json(path, follow_urls=True, resolver=resolver)
+            assert sorted(followed) == [
+                "http://lala/1",
+                "http://lala/2",
+                "http://lala/3",
+            ]
+            assert resolver._cache["http://lala/3"][0] == "http://lala/3?dl=1"
+
     def test_custom_viz(self, configuration):
         dataset = Dataset({"name": "lala", "title": "title", "notes": "description"})
         url = "http://lala"
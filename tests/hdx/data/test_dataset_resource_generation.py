@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 
 import pytest
 from hdx.utilities.compare import assert_files_same
-from hdx.utilities.dateparse import parse_date_range
+from hdx.utilities.dateparse import parse_date, parse_date_range
 from hdx.utilities.downloader import Download
 from hdx.utilities.path import temp_dir
 
@@ -540,6 +540,232 @@ class TestDatasetResourceGeneration:
                 )
                 assert success is False
 
+    def test_download_generate_resource_no_rows(
+        self, configuration, fixturesfolder, test_data
+    ):
+        with temp_dir("test") as folder:
+            filename = "conflict_data_alg.csv"
+            resourcedata = {
+                "name": "Conflict Data for Algeria",
+                "description": "Conflict data",
+            }
+
+            def process_row(headers, row):
+                row["lala"] = "lala"
+                return row
+
+            dataset = Dataset()
+            with Download(user_agent="test") as downloader:
+                success, results = dataset.download_generate_resource(
+                    downloader,
+                    test_data,
+                    folder,
+                    filename,
+                    resourcedata,
+                    header_insertions=[(0, "lala")],
+                    row_function=process_row,
+                    yearcol="YEAR",
+                    return_rows=False,
+                )
+                assert success is True
+                assert "rows" not in results
+                assert results["row_count"] == 4
+                assert results["startdate"] == datetime(
+                    2001, 1, 1, 0, 0, tzinfo=timezone.utc
+                )
+                assert results["enddate"] == datetime(
+                    2002, 12, 31, 23, 59, 59, tzinfo=timezone.utc
+                )
+                assert results["headers"][:3] == ["lala", "GWNO", "EVENT_ID_CNTY"]
+                assert (
+                    dataset["dataset_date"]
+                    == "[2001-01-01T00:00:00 TO 2002-12-31T23:59:59]"
+                )
+                assert_files_same(
+                    fixturesfolder / "gen_resource" / filename,
+                    folder / filename,
+                )
+
+                columns_to_include = ["lala", "GWNO", "EVENT_DATE", "FATALITIES"]
+                success, results = dataset.download_generate_resource(
+                    downloader,
+                    test_data,
+                    folder,
+                    filename,
+                    resourcedata,
+                    columns=columns_to_include,
+                    header_insertions=[(0, "lala")],
+                    row_function=process_row,
+                    datecol="EVENT_DATE",
+                    return_rows=False,
+                )
+                assert success is True
+                assert results["row_count"] == 4
+                assert results["headers"] == columns_to_include
+                assert (
+                    dataset["dataset_date"]
+                    == "[2001-04-18T00:00:00 TO 2001-04-21T23:59:59]"
+                )
+
+                url = fixturesfolder / "gen_resource" / "test_data_no_data.csv"
+                success, results = dataset.download_generate_resource(
+                    downloader,
+                    url,
+                    folder,
+                    filename,
+                    resourcedata,
+                    return_rows=False,
+                )
+                assert success is False
+                success, results = dataset.download_generate_resource(
+                    downloader,
+                    url,
+                    folder,
+                    filename,
+                    resourcedata,
+                    no_empty=False,
+                    return_rows=False,
+                )
+                assert success is True
+                assert results["row_count"] == 0
+
+    def test_generate_resource_date_parsing(self, configuration, monkeypatch):
+        calls = []
+
+        def count_calls(function):
+            def wrapper(*args, **kwargs):
+                calls.append(args[0])
+                return function(*args, **kwargs)
+
+            return wrapper
+
+        monkeypatch.setattr("hdx.data.dataset.parse_date", count_calls(parse_date))
+        monkeypatch.setattr(
+            "hdx.data.dataset.parse_date_range", count_calls(parse_date_range)
+        )
+        rows = [
+            {"date": date, "year": date[:4], "value": i}
+            for i, date in enumerate(
+                ["2020-03-01", "2019-12-31", "2020-03-01", "2021-07-15"] * 50
+            )
+        ]
+        resourcedata = {"name": "Dates", "description": "Dates"}
+        with temp_dir("test") as folder:
+            dataset = Dataset()
+            success, results = dataset.generate_resource(
+                folder, "dates.csv", rows, resourcedata, datecol="date"
+            )
+            assert success is True
+            assert results["startdate"] == datetime(
+                2019, 12, 31, 0, 0, tzinfo=timezone.utc
+            )
+            assert results["enddate"] == datetime(
+                2021, 7, 15, 0, 0, tzinfo=timezone.utc
+            )
+            assert calls == ["2020-03-01", "2019-12-31", "2021-07-15"]
+            assert (
+                dataset["dataset_date"]
+                == "[2019-12-31T00:00:00 TO 2021-07-15T23:59:59]"
+            )
+            calls.clear()
+            success, results = dataset.generate_resource(
+                folder, "dates.csv", rows, resourcedata, yearcol="year"
+            )
+            assert success is True
+            assert results["startdate"] == datetime(
+                2019, 1, 1, 0, 0, tzinfo=timezone.utc
+            )
+            assert results["enddate"] == datetime(
+                2021, 12, 31, 23, 59, 59, tzinfo=timezone.utc
+            )
+            assert calls == ["2020", "2019", "2021"]
+
+    def test_generate_resources(self, configuration, test_data):
+        def rows(dates):
+            return [{"date": date, "value": i} for i, date in enumerate(dates)]
+
+        with temp_dir("test") as folder:
+            dataset = Dataset()
+            with Download(user_agent="test") as downloader:
+                specs = [
+                    {
+                        "folder": folder,
+                        "filename": "res1.csv",
+                        "rows": rows(["2020-03-01", "2020-04-01"]),
+                        "resourcedata": {"name": "res1", "description": "Res 1"},
+                        "datecol": "date",
+                    },
+                    {
+                        "downloader": downloader,
+                        "url": test_data,
+                        "folder": folder,
+                        "filename": "res2.csv",
+                        "resourcedata": {"name": "res2", "description": "Res 2"},
+                        "yearcol": "YEAR",
+                    },
+                    {
+                        "folder": folder,
+                        "filename": "res3.csv",
+                        "rows": [],
+                        "resourcedata": {"name": "res3", "description": "Res 3"},
+                    },
+                    {
+                        "folder": folder,
+                        "filename": "res4.csv",
+                        "rows": rows(["2023-01-15"]),
+                        "resourcedata": {"name": "res4", "description": "Res 4"},
+                        "datecol": "date",
+                        "return_rows": False,
+                    },
+                ]
+                results = dataset.generate_resources(specs, max_workers=4)
+            assert [success for success, _ in results] == [True, True, False, True]
+            assert results[0][1]["enddate"] == datetime(
+                2020, 4, 1, 0, 0, tzinfo=timezone.utc
+            )
+            assert results[3][1]["row_count"] == 1
+            assert [resource["name"] for resource in dataset.get_resources()] == [
+                "res1",
+                "res2",
+                "res4",
+            ]
+            assert (
+                dataset["dataset_date"]
+                == "[2001-01-01T00:00:00 TO 2023-01-15T23:59:59]"
+            )
+            for filename in ("res1.csv", "res2.csv", "res4.csv"):
+                assert (folder / filename).exists()
+
+    def test_generate_resources_existing_time_period(self, configuration):
+        def spec(name, dates):
+            return {
+                "folder": folder,
+                "filename": f"{name}.csv",
+                "rows": [{"date": date, "value": i} for i, date in enumerate(dates)],
+                "resourcedata": {"name": name, "description": name},
+                "datecol": "date",
+            }
+
+        with temp_dir("test") as folder:
+            dataset = Dataset()
+            dataset.set_time_period("2019-01-01", "2025-12-31")
+            specs = [spec("res1", ["2020-03-01"]), spec("res2", ["2023-01-15"])]
+            dataset.generate_resources(specs, max_workers=2)
+            assert (
+                dataset["dataset_date"]
+                == "[2019-01-01T00:00:00 TO 2025-12-31T23:59:59]"
+            )
+            dataset.set_time_period("2021-01-01", "2021-06-30")
+            specs = [spec("res3", ["2020-03-01"]), spec("res4", ["2021-02-01"])]
+            dataset.generate_resources(specs)
+            assert (
+                dataset["dataset_date"]
+                == "[2020-03-01T00:00:00 TO 2021-06-30T23:59:59]"
+            )
+            dataset.set_time_period("2021-01-01", ongoing=True)
+            dataset.generate_resources([spec("res5", ["2020-01-01"])])
+            assert dataset["dataset_date"] == "[2020-01-01T00:00:00 TO *]"
+
     def test_download_and_generate_resource(self, configuration, fixturesfolder):
         with temp_dir("test") as folder:
             filename = "conflict_data_alg.csv"
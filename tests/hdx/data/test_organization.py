@@ -71,15 +71,20 @@ def organization_mockshow(url, datadict):
     )
 
 
-def mocklist(url):
+def mocklist(url, datadict, max_rows=None):
     if "list" not in url:
         return MockResponse(
             404,
             '{"success": false, "error": {"message": "TEST ERROR: Not all", "__type": "TEST ERROR: Not All Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=organization_list"}',
         )
+    offset = datadict.get("offset", 0)
+    limit = datadict.get("limit", len(organization_list))
+    if max_rows is not None:
+        limit = min(limit, max_rows)
+    result = json.dumps(organization_list[offset : offset + limit])
     return MockResponse(
         200,
-        f'{{"success": true, "result": {json.dumps(organization_list)}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=organization_list"}}',
+        f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=organization_list"}}',
     )
 
 
@@ -227,8 +232,29 @@ class TestOrganization:
         class MockSession:
             @staticmethod
             def post(url, data, headers, files, allow_redirects, auth=None):
-                json.loads(data.decode("utf-8"))
-                return mocklist(url)
+                datadict = json.loads(data.decode("utf-8"))
+                return mocklist(url, datadict)
+
+        Configuration.read().remoteckan().session = MockSession()
+
+    @pytest.fixture(scope="function")
+    def post_list_capped(self):
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                datadict = json.loads(data.decode("utf-8"))
+                return mocklist(url, datadict, max_rows=3)
+
+        Configuration.read().remoteckan().session = MockSession()
+
+    @pytest.fixture(scope="function")
+    def post_list_no_offset(self):
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                datadict = json.loads(data.decode("utf-8"))
+                datadict["offset"] = 0
+                return mocklist(url, datadict, max_rows=3)
 
         Configuration.read().remoteckan().session = MockSession()
 
@@ -378,6 +404,24 @@ class TestOrganization:
     def test_get_all_organizations(self, configuration, post_list):
         organizations = Organization.get_all_organization_names()
         assert len(organizations) == 10
+        organizations = Organization.iter_all_organization_names(page_size=4)
+        assert list(organizations) == organization_list
+        organizations = Organization.iter_all_organization_names(
+            page_size=4, offset=2, limit=5
+        )
+        assert list(organizations) == organization_list[2:7]
+
+    def test_get_all_organizations_no_offset(self, configuration, post_list_no_offset):
+        organizations = Organization.iter_all_organization_names(page_size=4)
+        assert list(organizations) == organization_list[:3]
+
+    def test_get_all_organizations_capped(self, configuration, post_list_capped):
+        organizations = Organization.iter_all_organization_names(page_size=4)
+        assert list(organizations) == organization_list
+        organizations = Organization.iter_all_organization_names(
+            page_size=4, offset=2, limit=5
+        )
+        assert list(organizations) == organization_list[2:7]
 
     def test_users(self, configuration, user_read):
         org_data = copy.deepcopy(resultdict)
@@ -431,6 +475,49 @@ class TestOrganization:
         with pytest.raises(HDXError):
             organization.remove_user(123)
 
+    def test_users_concurrent_and_summary(self, configuration):
+        urls = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                urls.append(url)
+                datadict = json.loads(data.decode("utf-8"))
+                return user_mockshow(url, datadict)
+
+        Configuration.read().remoteckan().session = MockSession()
+        org_data = copy.deepcopy(resultdict)
+        organization = Organization(org_data)
+        userdata = copy.deepcopy(org_data["users"][0])
+        del userdata["id"]
+        userdata["name"] = "MyUser1"
+        userdata["capacity"] = "member"
+        organization["users"].append(userdata)
+        users = organization.get_users(max_workers=2)
+        assert len(urls) == 2
+        assert [user["capacity"] for user in users] == ["admin", "member"]
+        assert users[0]["about"] == "Data Scientist"
+        urls.clear()
+        users = organization.get_users(full_profile=False)
+        assert len(urls) == 0
+        assert users[0]["name"] == "acled"
+        assert users[1].get("display_name") == "ACLED Conflict Event Data Project"
+        assert len(urls) == 0
+        assert users[0]["apikey"] == "31e86726-2993-4d82-be93-3d2133c81d94"
+        assert len(urls) == 1
+        assert users[0]["capacity"] == "admin"
+        assert users[0].get("not_a_field") is None
+        assert len(urls) == 1
+        users = organization.get_users("member", full_profile=False)
+        assert len(users) == 1
+        assert users[0]["capacity"] == "member"
+        urls.clear()
+        users = organization.get_users(full_profile=False)
+        assert users[0].get("apikey") == "31e86726-2993-4d82-be93-3d2133c81d94"
+        assert len(urls) == 1
+        assert "apikey" in users[1]
+        assert len(urls) == 2
+
     def test_get_datasets(self, configuration, datasets_get):
         org_data = copy.deepcopy(resultdict)
         organization = Organization(org_data)
@@ -11,7 +11,8 @@ import pytest
 from hdx.utilities.dateparse import parse_date
 from hdx.utilities.dictandlist import merge_two_dictionaries
 from hdx.utilities.downloader import Download, DownloadError
-from hdx.utilities.path import get_temp_dir
+from hdx.utilities.file_hashing import get_size_and_hash
+from hdx.utilities.path import get_temp_dir, temp_dir
 from hdx.utilities.retriever import Retrieve
 
 from .. import MockResponse, dataset_resultdict, resource_data
@@ -786,6 +787,49 @@ class TestResource:
         with pytest.raises(HDXError):
             resource.create_in_hdx()
 
+    def test_update_in_hdx_from_dataset(self, configuration, post_update):
+        session = Configuration.read().remoteckan().session
+        urls = []
+
+        class RecordingSession:
+            @staticmethod
+            def post(url, data, *args, **kwargs):
+                urls.append(url)
+                return session.post(url, data, *args, **kwargs)
+
+        Configuration.read().remoteckan().session = RecordingSession()
+        existing = Resource.read_from_hdx("74b74ae1-df0c-4716-829f-4f939a046811")
+        dataset = Dataset(
+            {
+                "id": existing["package_id"],
+                "name": "MyDataset1",
+                "resources": [copy.deepcopy(existing.data)],
+            }
+        )
+        urls.clear()
+        resource = Resource(
+            {"name": "MyResource1", "format": "csv", "description": "new"}
+        )
+        status = resource.update_in_hdx(dataset=dataset)
+        assert status == 1
+        assert len(urls) == 1
+        assert "resource_update" in urls[0]
+        assert resource["id"] == existing["id"]
+        assert resource["description"] == "new"
+        assert resource["format"] == existing["format"]
+        urls.clear()
+        resource = Resource({"id": existing["id"], "name": "MyResource1"})
+        status = resource.create_in_hdx(dataset=dataset)
+        assert status == 1
+        assert len(urls) == 1
+        urls.clear()
+        resource = Resource(
+            {"id": "74b74ae1-df0c-4716-829f-4f939a046811", "name": "MyResource1"}
+        )
+        resource.update_in_hdx()
+        assert len(urls) == 2
+        assert "resource_show" in urls[0]
+
     def test_update_in_hdx(self, configuration, date_pattern, post_update, test_data):
         resource = Resource()
         resource["id"] = "NOTEXIST"
@@ -933,6 +977,73 @@ class TestResource:
         with pytest.raises(HDXError):
             Resource.search_in_hdx("fail")
 
+    def test_search_in_hdx_paging(self, configuration):
+        resourcedicts = [
+            {"id": f"{i:02d}", "name": f"resource{i}", "format": "csv"}
+            for i in range(25)
+        ]
+        max_rows = None
+        fail_offset = None
+        calls = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                datadict = json.loads(data.decode("utf-8"))
+                calls.append((datadict["offset"], datadict["limit"]))
+                assert datadict["order_by"] == "id"
+                offset = datadict["offset"]
+                limit = datadict["limit"]
+                if offset == fail_offset:
+                    return MockResponse(
+                        404,
+                        '{"success": false, "error": {"message": "Not found", "__type": "Not Found Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=resource_search"}',
+                    )
+                if max_rows:
+                    limit = min(limit, max_rows)
+                result = json.dumps(
+                    {
+                        "count": len(resourcedicts),
+                        "results": resourcedicts[offset : offset + limit],
+                    }
+                )
+                return MockResponse(
+                    200,
+                    f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=resource_search"}}',
+                )
+
+        Configuration.read().remoteckan().session = MockSession()
+        resources = Resource.search_in_hdx("format:csv", page_size=10)
+        assert [x["id"] for x in resources] == [x["id"] for x in resourcedicts]
+        assert calls == [(0, 10), (10, 10), (20, 5)]
+        calls.clear()
+        resources = Resource.search_in_hdx(
+            "format:csv", page_size=10, max_workers=3, offset=3, limit=20
+        )
+        assert [x["id"] for x in resources] == [x["id"] for x in resourcedicts[3:23]]
+        assert sorted(calls) == [(3, 10), (13, 10)]
+        calls.clear()
+        iterator = Resource.iter_search_in_hdx("format:csv", page_size=10)
+        assert next(iterator)["id"] == "00"
+        assert calls == [(0, 10)]
+        calls.clear()
+        max_rows = 7
+        resources = Resource.search_in_hdx("format:csv", page_size=10)
+        assert [x["id"] for x in resources] == [x["id"] for x in resourcedicts]
+        assert calls == [(0, 10), (7, 7), (14, 7), (21, 4)]
+        calls.clear()
+        resources = Resource.search_in_hdx("format:csv", page_size=10, max_workers=3)
+        assert [x["id"] for x in resources] == [x["id"] for x in resourcedicts]
+        assert sorted(calls) == [(0, 10), (7, 7), (14, 7), (21, 4)]
+        max_rows = None
+        fail_offset = 0
+        assert Resource.search_in_hdx("format:csv", page_size=10) == []
+        fail_offset = 10
+        with pytest.raises(HDXError):
+            Resource.search_in_hdx("format:csv", page_size=10)
+        with pytest.raises(HDXError):
+            Resource.search_in_hdx("format:csv", page_size=10, max_workers=3)
+
     def test_download(self, configuration, read):
         resource = Resource.read_from_hdx("74b74ae1-df0c-4716-829f-4f939a046811")
         url, path = resource.download()
@@ -958,6 +1069,126 @@ class TestResource:
         with pytest.raises(DownloadError):
             resource2.download()
 
+    def test_download_if_changed(self, configuration, monkeypatch):
+        content = b"a,b\n1,2\n3,4\n"
+        requests = []
+
+        class MockStreamResponse:
+            def __init__(self, status_code, headers, body=b""):
+                self.status_code = status_code
+                self.headers = headers
+                self.body = body
+
+            def raise_for_status(self):
+                if self.status_code >= 400:
+                    raise ValueError(self.status_code)
+
+            def iter_content(self, chunk_size):
+                for i in range(0, len(self.body), chunk_size):
+                    yield self.body[i : i + chunk_size]
+
+            def close(self):
+                pass
+
+        class MockSession:
+            @staticmethod
+            def get(url, stream, timeout, headers):
+                requests.append(dict(headers))
+                etag = '"v1"'
+                if headers.get("If-None-Match") == etag:
+                    return MockStreamResponse(304, {})
+                validators = {"ETag": etag}
+                if "Range" in headers and headers.get("If-Range") == etag:
+                    start = int(headers["Range"][6:-1])
+                    validators["Content-Range"] = (
+                        f"bytes {start}-{len(content) - 1}/{len(content)}"
+                    )
+                    return MockStreamResponse(206, validators, content[start:])
+                return MockStreamResponse(200, validators, content)
+
+            @staticmethod
+            def close():
+                pass
+
+        monkeypatch.setattr(
+            Configuration.read(), "get_download_session", lambda: MockSession()
+        )
+        resource = Resource(
+            {"name": "test", "format": "csv", "url": "http://test.org/test.csv"}
+        )
+        with temp_dir("test_download_if_changed") as folder:
+            url, path, transferred = resource.download_if_changed(folder)
+            assert url == "http://test.org/test.csv"
+            assert path == folder / "test.csv"
+            assert transferred is True
+            assert path.read_bytes() == content
+            assert requests.pop() == {}
+            _, path, transferred = resource.download_if_changed(folder)
+            assert transferred is False
+            assert requests.pop() == {"If-None-Match": '"v1"'}
+            path.unlink()
+            part_path = folder / "test.csv.part"
+            part_path.write_bytes(content[:5])
+            (folder / "test.csv.part.headers").write_text('{"etag": "\\"v1\\""}')
+            _, path, transferred = resource.download_if_changed(folder)
+            assert transferred is True
+            assert requests.pop() == {"Range": "bytes=5-", "If-Range": '"v1"'}
+            assert path.read_bytes() == content
+            assert not part_path.exists()
+            resource["hash"] = get_size_and_hash(path, "csv")[1]
+            _, _, transferred = resource.download_if_changed(folder)
+            assert transferred is False
+            assert requests == []
+
+    def test_download_resources(self, configuration, fixturesfolder):
+        filepath = fixturesfolder / "test_data.csv"
+        size, hash = get_size_and_hash(filepath, "csv")
+        resources = [
+            Resource(
+                {
+                    "name": name,
+                    "format": "csv",
+                    "url": str(filepath),
+                    "size": size,
+                    "hash": hash,
+                }
+            )
+            for name in ("res1", "res2")
+        ]
+        with temp_dir("test_download_resources") as folder:
+            cache_folder = folder / "cache"
+            results = Resource.download_resources(
+                resources, folder, cache_folder, max_workers=2
+            )
+            assert [(url, path.name) for url, path in results] == [
+                (str(filepath), "res1.csv"),
+                (str(filepath), "res2.csv"),
+            ]
+            assert get_size_and_hash(results[1][1], "csv") == (size, hash)
+            assert [x.name for x in cache_folder.iterdir()] == [f"{hash}.csv"]
+            dataset = Dataset({"name": "test"})
+            resources[0]["url"] = str(folder / "missing.csv")
+            dataset.add_update_resources(resources, ignore_datasetid=True)
+            results = dataset.download_resources(folder, cache_folder)
+            assert [path.name for _, path in results] == ["res11.csv", "res21.csv"]
+            assert get_size_and_hash(results[0][1], "csv") == (size, hash)
+            resource = Resource(
+                {
+                    "name": "res3",
+                    "format": "csv",
+                    "url": str(filepath),
+                    "size": size,
+                    "hash": "1234",
+                }
+            )
+            with pytest.raises(HDXError):
+                Resource.download_resources([resource], folder, cache_folder)
+            results = Resource.download_resources(
+                [resource], folder, cache_folder, verify=False
+            )
+            assert results[0][1].name == "res31.csv"
+            assert len(list(cache_folder.iterdir())) == 1
+
     def test_datastore(self, configuration, post_datastore, topline_yaml, topline_json):
         resource_ids = Resource.get_all_resource_ids_in_datastore()
         assert resource_ids == [
@@ -977,6 +1208,217 @@ class TestResource:
         TestResource.datastore = None
         assert resource2.has_datastore() is False
 
+    def test_get_all_resource_ids_in_datastore_paging(self, configuration):
+        tables = [{"name": f"id{i}"} for i in range(5)]
+        fail_offset = None
+        offsets = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                datadict = json.loads(data.decode("utf-8"))
+                assert datadict["resource_id"] == "_table_metadata"
+                offset = datadict["offset"]
+                offsets.append(offset)
+                if offset == fail_offset:
+                    return MockResponse(
+                        404,
+                        '{"success": false, "error": {"message": "Not found", "__type": "Not Found Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=datastore_search"}',
+                    )
+                result = {
+                    "resource_id": "_table_metadata",
+                    "records": tables[offset : offset + datadict["limit"]],
+                    "total": len(tables),
+                }
+                return MockResponse(
+                    200,
+                    json.dumps({"success": True, "result": result}),
+                )
+
+        Configuration.read().remoteckan().session = MockSession()
+        resource_ids = Resource.get_all_resource_ids_in_datastore(page_size=2)
+        assert resource_ids == [x["name"] for x in tables]
+        assert offsets == [0, 2, 4]
+        fail_offset = 0
+        assert Resource.get_all_resource_ids_in_datastore(page_size=2) == []
+        fail_offset = 2
+        with pytest.raises(HDXError):
+            Resource.get_all_resource_ids_in_datastore(page_size=2)
+
+    def test_iter_datastore_records(self, configuration):
+        records = [{"_id": i, "code": f"C{i}", "value": i * 10} for i in range(1, 6)]
+        records_per_page = None
+        requests = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                datadict = json.loads(data.decode("utf-8"))
+                if "search" not in url or datadict["resource_id"] != "abc":
+                    return MockResponse(
+                        404,
+                        '{"success": false, "error": {"message": "Not found", "__type": "Not Found Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=datastore_search"}',
+                    )
+                requests.append(datadict)
+                offset = datadict["offset"]
+                limit = datadict["limit"]
+                if records_per_page:
+                    limit = min(limit, records_per_page)
+                page = records[offset : offset + limit]
+                if "fields" in datadict:
+                    page = [
+                        {field: record[field] for field in datadict["fields"]}
+                        for record in page
+                    ]
+                result = {
+                    "resource_id": "abc",
+                    "records": page,
+                    "limit": datadict["limit"],
+                    "total": len(records),
+                }
+                return MockResponse(
+                    200,
+                    json.dumps({"success": True, "result": result}),
+                )
+
+        Configuration.read().remoteckan().session = MockSession()
+        resource = Resource({"id": "abc"})
+        assert list(resource.iter_datastore_records(page_size=2)) == records
+        assert [(x["offset"], x["limit"], x["sort"]) for x in requests] == [
+            (0, 2, "_id"),
+            (2, 2, "_id"),
+            (4, 2, "_id"),
+        ]
+        requests.clear()
+        batches = list(
+            resource.iter_datastore_records(
+                fields=["code"], page_size=5, batch_format="list"
+            )
+        )
+        assert batches == [[{"code": f"C{i}"} for i in range(1, 6)]]
+        assert len(requests) == 1
+        with pytest.raises(HDXError):
+            list(resource.iter_datastore_records(batch_format="xxx"))
+        requests.clear()
+        records_per_page = 2
+        assert list(resource.iter_datastore_records(page_size=3)) == records
+        assert [x["offset"] for x in requests] == [0, 2, 4]
+        records_per_page = None
+        with pytest.raises(HDXError):
+            list(Resource({"id": "unknown"}).iter_datastore_records())
+        pytest.importorskip("pyarrow")
+        batches = list(
+            resource.iter_datastore_records(page_size=3, batch_format="arrow")
+        )
+        assert [batch.num_rows for batch in batches] == [3, 2]
+        assert batches[1].column("code").to_pylist() == ["C4", "C5"]
+
+    def test_datastore_upsert(self, configuration, fixturesfolder, monkeypatch):
+        calls = []
+        failures = []
+        delays = []
+        monkeypatch.setattr("hdx.data.resource.sleep", delays.append)
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                datadict = json.loads(data.decode("utf-8"))
+                if datadict["resource_id"] != "abc":
+                    return MockResponse(
+                        404,
+                        '{"success": false, "error": {"message": "Not found", "__type": "Not Found Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=datastore_upsert"}',
+                    )
+                if "upsert" in url and failures:
+                    failures.pop()
+                    return MockResponse(
+                        500,
+                        '{"success": false, "error": {"message": "Server error", "__type": "Internal Server Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=datastore_upsert"}',
+                    )
+                calls.append((url.rsplit("/", 1)[-1], datadict))
+                return MockResponse(
+                    200,
+                    '{"success": true, "result": {"resource_id": "abc"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=datastore_upsert"}',
+                )
+
+        Configuration.read().remoteckan().session = MockSession()
+        resource = Resource({"id": "abc"})
+        rows = [
+            ["code", "value", "date", "name"],
+            ["01", "1", "2020-01-01", "A"],
+            ["02", "2.5", "2020-01-02", "B"],
+            ["03", "", "2020-01-03", "C"],
+        ]
+        failures.append(True)
+        assert (
+            resource.datastore_upsert_from_iterable(
+                rows, primary_key="code", batch_size=2
+            )
+            == 3
+        )
+        assert calls[0] == (
+            "datastore_create",
+            {
+                "resource_id": "abc",
+                "force": True,
+                "fields": [
+                    {"id": "code", "type": "text"},
+                    {"id": "value", "type": "numeric"},
+                    {"id": "date", "type": "timestamp"},
+                    {"id": "name", "type": "text"},
+                ],
+                "primary_key": "code",
+            },
+        )
+        assert [(action, x["method"], x["records"]) for action, x in calls[1:]] == [
+            (
+                "datastore_upsert",
+                "upsert",
+                [
+                    {"code": "01", "value": "1", "date": "2020-01-01", "name": "A"},
+                    {"code": "02", "value": "2.5", "date": "2020-01-02", "name": "B"},
+                ],
+            ),
+            (
+                "datastore_upsert",
+                "upsert",
+                [{"code": "03", "value": None, "date": "2020-01-03", "name": "C"}],
+            ),
+        ]
+        calls.clear()
+        rows = ({"id": i, "value": i * 2} for i in range(10))
+        assert (
+            resource.datastore_upsert_from_iterable(
+                rows, create=False, batch_size=3, max_workers=2
+            )
+            == 10
+        )
+        assert all(x["method"] == "insert" for _, x in calls)
+        records = sorted(
+            (record for _, x in calls for record in x["records"]),
+            key=lambda x: x["id"],
+        )
+        assert records == [{"id": i, "value": i * 2} for i in range(10)]
+        assert delays == [1]
+        delays.clear()
+        failures.extend([True, True, True])
+        with pytest.raises(HDXError):
+            resource.datastore_upsert_from_iterable(
+                [{"id": 1}], create=False, retries=2, retry_delay=0.5
+            )
+        assert delays == [0.5, 1]
+        calls.clear()
+        with Download(user_agent="test") as downloader:
+            assert (
+                resource.datastore_upsert_from_file(
+                    downloader,
+                    fixturesfolder / "test_data.csv",
+                    schema=[{"id": "GWNO", "type": "int"}],
+                )
+                == 4
+            )
+        assert calls[0][1]["fields"] == [{"id": "GWNO", "type": "int"}]
+        assert calls[1][1]["records"][0]["GWNO"] == "615"
+
     def test_resource_views(self, configuration, post_resourceview):
         resource = Resource({"id": "25982d1c-f45a-45e1-b14e-87d367413045"})
         with pytest.raises(HDXError):
@@ -1,3 +1,4 @@
+import json
 from os.path import join
 from pathlib import Path
 
@@ -5,6 +6,7 @@ import pytest
 from hdx.location.country import Country
 from hdx.utilities.loader import load_json
 
+from .. import MockResponse
 from hdx.api.configuration import Configuration
 from hdx.api.locations import Locations
 from hdx.data.dataset import Dataset
@@ -338,3 +340,69 @@ class TestUpdateDatasetResourcesLogic:
         }
         assert new_resource_order == [("test1", "csv"), ("test2", "xlsx")]
         assert statuses == {"test1": 2, "test2": 2}
+
+    def test_upsert_resources(self, fixture_path, configuration, dataset_json):
+        dataset = Dataset.load_from_json(dataset_json)
+        posts = []
+
+        class MockSession:
+            @staticmethod
+            def post(url, data, headers, files, allow_redirects, auth=None):
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8")
+                else:
+                    data = {key.decode("utf-8"): value for key, value in data.items()}
+                posts.append((url, data, list(files)))
+                result = json.dumps({"package": load_json(dataset_json)})
+                return MockResponse(
+                    200,
+                    f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=package_revise"}}',
+                )
+
+        Configuration.read().remoteckan().session = MockSession()
+        resource = Resource(
+            {
+                "name": "SDG 4 Global and Thematic data",
+                "description": "Updated description",
+                "format": "csv",
+            }
+        )
+        resource.set_file_to_upload(fixture_path / "sdg_data_zwe.csv")
+        new_resource = {
+            "name": "Other Policy Relevant Indicators data",
+            "description": "New resource",
+            "format": "csv",
+            "url": "https://test.com/opri_data_zwe.csv",
+        }
+        statuses = dataset.upsert_resources(
+            [resource, new_resource],
+            updated_by_script="test script",
+        )
+        assert statuses == {
+            "SDG 4 Global and Thematic data": 2,
+            "Other Policy Relevant Indicators data": 0,
+        }
+        assert len(posts) == 1
+        url, data, files = posts[0]
+        assert "package_revise" in url
+        assert json.loads(data["match"]) == {"id": dataset["id"]}
+        assert files == ["update__resources__3__upload"]
+        update = json.loads(data["update"])
+        assert update["updated_by_script"].startswith("test script (")
+        resources = update["resources"]
+        assert len(resources) == 10
+        for i, resource in enumerate(resources):
+            if i not in (3, 9):
+                assert resource == {}
+        assert resources[3]["description"] == "Updated description"
+        assert resources[3]["url"] == "updated_by_file_upload_step"
+        assert resources[3]["url_type"] == "upload"
+        assert resources[9] == {
+            "description": "New resource",
+            "format": "csv",
+            "name": "Other Policy Relevant Indicators data",
+            "resource_type": "api",
+            "url": "https://test.com/opri_data_zwe.csv",
+            "url_type": "api",
+        }
+        assert dataset.number_of_resources() == 9
@@ -90,15 +90,18 @@ def user_mockshow(url, datadict):
     )
 
 
-def mocklist(url):
+def mocklist(url, datadict):
     if "list" not in url:
         return MockResponse(
             404,
             '{"success": false, "error": {"message": "TEST ERROR: Not all", "__type": "TEST ERROR: Not All Error"}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=user_list"}',
         )
+    offset = datadict.get("offset", 0)
+    limit = datadict.get("limit", len(user_list))
+    result = json.dumps(user_list[offset : offset + limit])
     return MockResponse(
         200,
-        f'{{"success": true, "result": {json.dumps(user_list)}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=user_list"}}',
+        f'{{"success": true, "result": {result}, "help": "http://test-data.humdata.org/api/3/action/help_show?name=user_list"}}',
     )
 
 
@@ -281,8 +284,8 @@ class TestUser:
         class MockSession:
             @staticmethod
             def post(url, data, headers, files, allow_redirects, auth=None):
-                json.loads(data.decode("utf-8"))
-                return mocklist(url)
+                datadict = json.loads(data.decode("utf-8"))
+                return mocklist(url, datadict)
 
         Configuration.read().remoteckan().session = MockSession()
 
@@ -653,6 +656,14 @@ Content-Transfer-Encoding: 7bit
                 rcpt_options=TestUser.rcpt_options,
             )
 
+    def test_iter_all_users(self, configuration, post_list):
+        users = User.iter_all_users(page_size=1)
+        assert [user["name"] for user in users] == [x["name"] for x in user_list]
+        users = list(User.iter_all_users(page_size=1, offset=1))
+        assert len(users) == 1
+        assert isinstance(users[0], User)
+        assert users[0]["name"] == user_list[1]["name"]
+
     def test_get_organizations(self, configuration, post_listorgs):
         user = User.read_from_hdx("9f3e9973-7dbe-4c65-8820-f48578e3ffea")
         organizations = user.get_organization_dicts()